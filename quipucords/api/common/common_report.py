@@ -1,10 +1,12 @@
 """Util for common report operations."""
 
+import gzip
 import io
 import json
 import logging
 import os
 import tarfile
+import tempfile
 import time
 
 from rest_framework.renderers import JSONRenderer
@@ -13,6 +15,10 @@ from quipucords.environment import server_version
 
 logger = logging.getLogger(__name__)
 
+# files of a streamed tar.gz are kept in memory up to this size, then on disk
+TAR_SPOOL_MAX_SIZE = 1024 * 1024
+# size in bytes of the blocks compressed between two chunks sent to the client
+TAR_CHUNK_SIZE = 64 * 1024
 
 REPORT_TYPE_DETAILS = "details"
 REPORT_TYPE_DEPLOYMENT = "deployments"
@@ -116,6 +122,84 @@ def create_tar_buffer(files_data):
     return tar_buffer
 
 
+class ChunkSink:
+    """File-like object keeping what is written until it is drained."""
+
+    def __init__(self):
+        """Initialize an empty sink."""
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        """Keep written data."""
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        """Return the number of bytes written, drained ones included."""
+        return self.position
+
+    def flush(self):
+        """Do nothing, the data is kept until drained."""
+
+    def close(self):
+        """Mark the sink closed, the data is kept until drained."""
+        self.closed = True
+
+    def drain(self):
+        """Return and forget the data written so far."""
+        chunks, self.chunks = self.chunks, []
+        return chunks
+
+
+def stream_tar_gz(files):
+    """Generate a tar.gz archive chunk by chunk.
+
+    Each file is generated only once the previous one is written to the archive,
+    and is spooled to a temporary file since its size must precede its content.
+
+    :param files: iterable of (file name, iterable of bytes) tuples
+    :returns: iterator of bytes
+    """
+    sink = ChunkSink()
+    archive_size = 0
+    with gzip.GzipFile(fileobj=sink, mode="wb") as gzip_file:
+        for file_name, file_chunks in files:
+            with tempfile.SpooledTemporaryFile(max_size=TAR_SPOOL_MAX_SIZE) as spool:
+                for chunk in file_chunks:
+                    spool.write(chunk)
+                info = tarfile.TarInfo(name=file_name)
+                info.size = spool.tell()
+                header = info.tobuf(
+                    tarfile.DEFAULT_FORMAT, tarfile.ENCODING, "surrogateescape"
+                )
+                gzip_file.write(header)
+                spool.seek(0)
+                while block := spool.read(TAR_CHUNK_SIZE):
+                    gzip_file.write(block)
+                    yield from sink.drain()
+            padding = -info.size % tarfile.BLOCKSIZE
+            gzip_file.write(tarfile.NUL * padding)
+            archive_size += len(header) + info.size + padding
+            yield from sink.drain()
+        # end of archive marker, padded to a whole record like tarfile does
+        archive_size += 2 * tarfile.BLOCKSIZE
+        end_size = 2 * tarfile.BLOCKSIZE + (-archive_size % tarfile.RECORDSIZE)
+        gzip_file.write(tarfile.NUL * end_size)
+    yield from sink.drain()
+
+
+class EchoBuffer:
+    """File-like object returning what is written, for csv writers to yield lines."""
+
+    def write(self, value):
+        """Return the value instead of writing it."""
+        return value
+
+
 class CSVHelper:
     """Helper for CSV serialization of list/dict values."""
 
@@ -170,24 +254,24 @@ class CSVHelper:
         result = result[:-1] + "}"
         return result
 
+    @staticmethod
+    def product_columns(fact):
+        """Return the presence of each product of a fact, by product column."""
+        columns = {}
+        for prod in fact.get("products") or []:
+            prod_name = prod.get("name")
+            if prod_name:
+                columns[prod_name.lower()] = prod.get("presence", "unknown")
+        return columns
+
     @staticmethod
     def generate_headers(fact_list, exclude=None):
         """Generate column headers from fact list."""
         headers = set()
         for fact in fact_list:
-            fact_addon = {}
-            for fact_key in fact.keys():
-                if fact_key == "products":
-                    prods = fact.get(fact_key, [])
-                    if prods:
-                        for prod in prods:
-                            prod_name = prod.get("name")
-                            if prod_name:
-                                prod_name = prod_name.lower()
-                                headers.add(prod_name)
-                                fact_addon[prod_name] = prod.get("presence", "unknown")
-                else:
-                    headers.add(fact_key)
+            fact_addon = CSVHelper.product_columns(fact)
+            headers.update(fact_key for fact_key in fact if fact_key != "products")
+            headers.update(fact_addon)
             fact.update(fact_addon)
 
         if exclude and isinstance(exclude, set):
@@ -307,9 +307,8 @@ class ReportEntity:
         be the same and pk has the advantage of being an indexed column.
         """
         deployment_report = (
-            DeploymentsReport.objects.annotate(
-                last_discovered=F("details_report__scanjob__end_time")
-            )
+            DeploymentsReport.objects.defer(*DeploymentsReport.CACHED_FIELDS)
+            .annotate(last_discovered=F("details_report__scanjob__end_time"))
             .filter(pk=report_id)
             .get()
         )
@@ -0,0 +1,39 @@
+"""Model fields shared by the api models."""
+
+import gzip
+
+from django.conf import settings
+from django.db import models
+
+
+class CompressedTextField(models.BinaryField):
+    """Text stored gzip compressed, for large cached reports.
+
+    Values are compressed when saved and decompressed when loaded, so the field is
+    used like a TextField. Being a blob, it should be deferred by queries that only
+    need the other fields of its model.
+    """
+
+    def get_prep_value(self, value):
+        """Compress the text before it is saved."""
+        if isinstance(value, str):
+            value = gzip.compress(
+                value.encode(), compresslevel=settings.QPC_CACHED_REPORTS_COMPRESSION
+            )
+        return super().get_prep_value(value)
+
+    def from_db_value(self, value, expression, connection):
+        """Decompress the text loaded from the database."""
+        if value is None:
+            return value
+        return gzip.decompress(value).decode()
+
+    def to_python(self, value):
+        """Keep text as is, which BinaryField would decode as base64."""
+        if isinstance(value, str):
+            return value
+        return super().to_python(value)
+
+    def value_to_string(self, obj):
+        """Serialize the text itself rather than its compressed bytes."""
+        return self.value_from_object(obj)
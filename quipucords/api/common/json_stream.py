@@ -0,0 +1,56 @@
+"""Incremental JSON encoding for streamed reports."""
+
+import json
+from collections.abc import Iterable, Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+# size in characters of the chunks sent to the client
+CHUNK_SIZE = 64 * 1024
+
+
+def stream_json_object(
+    fields: dict | str, array_name: str, elements: Iterable[str | Iterable[str]]
+) -> Iterator[str]:
+    """Encode a JSON object ending with an array, one element at a time.
+
+    :param fields: the other keys of the object, as a dict or as JSON
+    :param array_name: key of the array
+    :param elements: JSON encoded elements of the array. An element can also be an
+        iterable of JSON chunks, like the ones returned by this function.
+    :returns: iterator of JSON chunks
+    """
+    if not isinstance(fields, str):
+        fields = json.dumps(fields, cls=DjangoJSONEncoder)
+    opening = fields.rstrip()[:-1].rstrip()
+    separator = "" if opening.endswith("{") else ","
+    yield f"{opening}{separator}{json.dumps(array_name)}:["
+    for index, element in enumerate(elements):
+        if index:
+            yield ","
+        if isinstance(element, str):
+            yield element
+        else:
+            yield from element
+    yield "]}"
+
+
+def buffer_chunks(chunks: Iterable[str], size=CHUNK_SIZE) -> Iterator[bytes]:
+    """Join small chunks together so each write to the client is worth it."""
+    buffer = []
+    buffered_size = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        buffered_size += len(chunk)
+        if buffered_size >= size:
+            yield "".join(buffer).encode()
+            buffer = []
+            buffered_size = 0
+    if buffer:
+        yield "".join(buffer).encode()
+
+
+def json_streaming_response(chunks: Iterable[str]) -> StreamingHttpResponse:
+    """Return a response streaming JSON chunks to the client."""
+    return StreamingHttpResponse(buffer_chunks(chunks), content_type="application/json")
@@ -1,6 +1,6 @@
 """Common pagination class."""
 
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 
 
 class StandardResultsSetPagination(PageNumberPagination):
@@ -9,3 +9,33 @@ class StandardResultsSetPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 1000
+
+
+class CursorResultsSetPagination(CursorPagination):
+    """Create keyset pagination class ordered on the primary key.
+
+    Unlike StandardResultsSetPagination, this doesn't count the results nor
+    use OFFSET scans, so walking deep pages of large result sets is cheap.
+    An empty cursor query parameter requests the first page.
+    """
+
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+    ordering = "id"
+
+    def decode_cursor(self, request):
+        """Decode the cursor, treating an empty cursor as the first page."""
+        if not request.query_params.get(self.cursor_query_param):
+            return None
+        return super().decode_cursor(request)
+
+
+def get_results_paginator(request):
+    """Return a paginator instance for the given request.
+
+    Cursor pagination is opt-in through the "cursor" query parameter.
+    """
+    if CursorResultsSetPagination.cursor_query_param in request.query_params:
+        return CursorResultsSetPagination()
+    return StandardResultsSetPagination()
@@ -0,0 +1,100 @@
+"""Storage of report artifacts precomputed once a report is fingerprinted.
+
+Artifacts are gzip compressed files, grouped by the platform id of the report they
+were generated from, so an artifact is never served for another report.
+"""
+
+import gzip
+import os
+import shutil
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+
+from django.conf import settings
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+
+# size in bytes of the chunks read from artifacts
+READ_CHUNK_SIZE = 64 * 1024
+INSIGHTS_ARTIFACT = "insights.tar.gz"
+
+
+def report_artifact_name(report_type, file_ext, mask_report=False):
+    """Return the name of a report artifact, like deployments-masked.csv."""
+    masked = "-masked" if mask_report else ""
+    return f"{report_type}{masked}.{file_ext}"
+
+
+def _artifacts_directory(report) -> Path:
+    return settings.QPC_REPORT_ARTIFACTS_DIRECTORY / str(report.report_platform_id)
+
+
+def _artifact_path(report, name) -> Path:
+    """Return the path of an artifact, already compressed ones keeping their name."""
+    directory = _artifacts_directory(report)
+    if name.endswith(".gz"):
+        return directory / name
+    return directory / f"{name}.gz"
+
+
+def write_report_artifact(report, name, chunks: Iterable[bytes]):
+    """Write an artifact atomically so concurrent readers never see it partially.
+
+    :param report: the DetailsReport or DeploymentsReport the artifact belongs to
+    :param name: name of the artifact, as returned by report_artifact_name
+    :param chunks: content of the artifact, compressed if its name ends with .gz
+    """
+    path = _artifact_path(report, name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with NamedTemporaryFile(dir=path.parent, delete=False) as temp_file:
+        if path.name == name:
+            for chunk in chunks:
+                temp_file.write(chunk)
+        else:
+            with gzip.GzipFile(fileobj=temp_file, mode="wb") as gzip_file:
+                for chunk in chunks:
+                    gzip_file.write(chunk)
+    os.replace(temp_file.name, path)
+
+
+def delete_report_artifacts(report):
+    """Delete the artifacts of a report, which must be done when it is deleted.
+
+    :param report: the DetailsReport or DeploymentsReport the artifacts belong to
+    """
+    shutil.rmtree(_artifacts_directory(report), ignore_errors=True)
+
+
+def find_report_artifact(report, name) -> Path | None:
+    """Return the path of an artifact, or None if it wasn't precomputed."""
+    if not settings.QPC_ENABLE_REPORT_ARTIFACTS:
+        return None
+    path = _artifact_path(report, name)
+    if not path.exists():
+        return None
+    return path
+
+
+def read_report_artifact(path: Path) -> Iterator[bytes]:
+    """Read the uncompressed content of an artifact, chunk by chunk."""
+    with gzip.open(path, "rb") as artifact:
+        while chunk := artifact.read(READ_CHUNK_SIZE):
+            yield chunk
+
+
+def report_artifact_response(request, path: Path, content_type):
+    """Return a response serving an artifact, compressed if the client accepts it."""
+    if path.name.endswith(".tar.gz"):
+        return FileResponse(path.open("rb"), content_type=content_type)
+    if "gzip" in request.headers.get("Accept-Encoding", ""):
+        response = FileResponse(
+            path.open("rb"), content_type=content_type, filename=path.stem
+        )
+        response["Content-Encoding"] = "gzip"
+    else:
+        response = StreamingHttpResponse(
+            read_report_artifact(path), content_type=content_type
+        )
+    patch_vary_headers(response, ("Accept-Encoding",))
+    return response
@@ -1,5 +1,6 @@
 """Util for common operations."""
 
+import json
 import logging
 import os
 
@@ -212,28 +213,47 @@ def expand_scanjob_with_times(scanjob, connect_only=False):  # noqa: PLR0912, C9
     return job_json
 
 
-def mask_data_general(report, mac_and_ip_facts, name_related_facts):
-    """Mask the data that is given and return it.
+class ValueMasker:
+    """Mask the sensitive facts of systems, one system at a time.
 
-    :param report: <dict> the report to mask
-    :param mac_and_ip_facts: <list> a list of mac/ip related facts
-    :param name_related_facts: <list> a list of name related facts
-
-    :returns: <dict> the report with sensitive info masked.
+    The mask of each value is memoized, so values repeated across the systems of a
+    report (like the names of hypervisors) are only masked once. A masker is meant
+    to mask a single report, while it is serialized or streamed.
     """
-    for system in report:
-        for address_list in mac_and_ip_facts:
-            new_addrs = []
+
+    def __init__(self, mac_and_ip_facts, name_related_facts):
+        """Initialize the masker.
+
+        :param mac_and_ip_facts: <list> a list of mac/ip related facts
+        :param name_related_facts: <list> a list of name related facts
+        """
+        self.mac_and_ip_facts = mac_and_ip_facts
+        self.name_related_facts = name_related_facts
+        self.mask_table = {}
+
+    def mask(self, value):
+        """Mask a value, reusing its mask if it was already masked."""
+        try:
+            return self.mask_table[value]
+        except KeyError:
+            masked_value = self.mask_table[value] = mask_value(value)
+            return masked_value
+
+    def mask_system(self, system):
+        """Mask the sensitive facts of a system in place and return it."""
+        for address_list in self.mac_and_ip_facts:
             addrs_to_mask = system.get(address_list)
             if addrs_to_mask:
-                for addr in addrs_to_mask:
-                    new_addrs.append(mask_value(addr))
-                system[address_list] = new_addrs
-        for name in name_related_facts:
+                system[address_list] = [self.mask(addr) for addr in addrs_to_mask]
+        for name in self.name_related_facts:
             name_to_change = system.get(name)
             if name_to_change:
-                system[name] = mask_value(name_to_change)
-    return report
+                system[name] = self.mask(name_to_change)
+        return system
+
+    def mask_system_json(self, system_json):
+        """Mask the sensitive facts of a JSON encoded system."""
+        return json.dumps(self.mask_system(json.loads(system_json)))
 
 
 def mask_value(value):
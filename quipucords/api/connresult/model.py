@@ -56,3 +56,9 @@ class SystemConnectionResult(models.Model):
         """Metadata for model."""
 
         verbose_name_plural = _(messages.PLURAL_SYS_CONN_RESULTS_MSG)
+        indexes = [
+            models.Index(
+                fields=["task_connection_result", "status"],
+                name="sysconnresult_status_idx",
+            ),
+        ]
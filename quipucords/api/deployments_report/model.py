@@ -5,6 +5,7 @@ import uuid
 from django.db import models
 
 from api.common.common_report import REPORT_TYPE_CHOICES, REPORT_TYPE_DEPLOYMENT
+from api.common.fields import CompressedTextField
 from fingerprinter.constants import (
     ENTITLEMENTS_KEY,
     META_DATA_KEY,
@@ -36,9 +37,26 @@ class DeploymentsReport(models.Model):
     )
     report_id = models.IntegerField(null=True)
     cached_fingerprints = models.JSONField(null=True)
-    cached_masked_fingerprints = models.JSONField(null=True)
-    cached_csv = models.TextField(null=True)
-    cached_masked_csv = models.TextField(null=True)
+    cached_csv = CompressedTextField(null=True)
+    cached_masked_csv = CompressedTextField(null=True)
+
+    # large fields, to defer when only the status or metadata of a report is needed
+    CACHED_FIELDS = (
+        "cached_fingerprints",
+        "cached_csv",
+        "cached_masked_csv",
+    )
+
+    class Meta:
+        """Metadata for model."""
+
+        indexes = [
+            models.Index(
+                fields=["report_id"],
+                name="deploymentsreport_report_idx",
+                condition=models.Q(report_id__isnull=False),
+            ),
+        ]
 
 
 class SystemFingerprint(models.Model):
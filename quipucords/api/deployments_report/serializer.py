@@ -160,7 +160,6 @@ class DeploymentReportSerializer(NotEmptySerializer):
     details_report = PrimaryKeyRelatedField(queryset=DetailsReport.objects.all())
     report_id = IntegerField(read_only=True)
     cached_fingerprints = JSONField(read_only=True)
-    cached_masked_fingerprints = JSONField(read_only=True)
     cached_csv = CharField(read_only=True)
     cached_masked_csv = CharField(read_only=True)
 
@@ -1,13 +1,14 @@
 """Util for deployments report."""
 
 import csv
+import json
 import logging
 from copy import deepcopy
-from io import StringIO
 
-from api.common.common_report import CSVHelper, sanitize_row
-from api.common.util import validate_query_param_bool
+from api.common.common_report import CSVHelper, EchoBuffer, sanitize_row
+from api.common.util import ValueMasker, validate_query_param_bool
 from api.models import DeploymentsReport, SystemFingerprint
+from compat.db import iter_json_array
 from constants import DataSources
 
 logger = logging.getLogger(__name__)
@@ -15,6 +16,9 @@ logger = logging.getLogger(__name__)
 DETECTION_KEY_PREFIX = "detection"
 SOURCES_KEY = "sources"
 
+MAC_AND_IP_FACTS = ["ip_addresses", "mac_addresses"]
+NAME_RELATED_FACTS = ["name", "vm_dns_name", "virtual_host_name"]
+
 
 def _get_detection_keys():
     return (
@@ -40,66 +44,95 @@ def compute_source_info(sources):
     return result
 
 
-def create_deployments_csv(  # noqa: PLR0912, PLR0915, C901
-    deployments_report_dict, request
-):
+def create_deployments_csv(deployments_report_dict, request):
     """Create deployments report csv."""
     deployments_report_dict = deepcopy(deployments_report_dict)
     mask_report = request.query_params.get("mask", False)
-    source_headers = {SOURCES_KEY, *_get_detection_keys()}
     report_id = deployments_report_dict.get("report_id")
     if report_id is None:
         return None
 
-    deployment_report = DeploymentsReport.objects.filter(report_id=report_id).first()
+    cached_field = "cached_csv"
+    if validate_query_param_bool(mask_report):
+        cached_field = "cached_masked_csv"
+    deployment_report = (
+        DeploymentsReport.objects.only(
+            "report_type",
+            "report_version",
+            "report_platform_id",
+            "report_id",
+            cached_field,
+        )
+        .filter(report_id=report_id)
+        .first()
+    )
     if deployment_report is None:
         return None
 
-    # Check for a cached copy of csv
-    cached_csv = deployment_report.cached_csv
-    if validate_query_param_bool(mask_report):
-        cached_csv = deployment_report.cached_masked_csv
+    # Check for a cached copy of csv, the only cached field loaded
+    cached_csv = getattr(deployment_report, cached_field)
     if cached_csv:
         logger.info("Using cached csv results for deployment report %d", report_id)
         return cached_csv
     logger.info("No cached csv results for deployment report %d", report_id)
 
-    csv_helper = CSVHelper()
-    deployment_report_buffer = StringIO()
-    csv_writer = csv.writer(deployment_report_buffer, delimiter=",")
-
-    csv_writer.writerow(
-        ["Report ID", "Report Type", "Report Version", "Report Platform ID"]
-    )
-    csv_writer.writerow(
-        [
-            report_id,
-            deployment_report.report_type,
-            deployment_report.report_version,
-            deployment_report.report_platform_id,
-        ]
-    )
-    csv_writer.writerow([])
-    csv_writer.writerow([])
-
     systems_list = deployments_report_dict.get("system_fingerprints")
     if not systems_list:
         return None
 
-    csv_writer.writerow(["System Fingerprints:"])
+    logger.info("Caching csv results for deployment report %d", report_id)
+    cached_csv = "".join(iter_deployments_csv(deployment_report, lambda: systems_list))
+    setattr(deployment_report, cached_field, cached_csv)
+    deployment_report.save(update_fields=[cached_field])
+    return cached_csv
+
 
+def _with_model_fields(systems):
+    """Add every fingerprint field to the first system, so each gets a column."""
+    systems = iter(systems)
+    system = next(systems, None)
+    if system is None:
+        return
     valid_fact_attributes = {
         field.name for field in SystemFingerprint._meta.get_fields()
     }
-
-    # Add fields to just one fingerprint
-    system = systems_list[0]
     for attr in valid_fact_attributes:
         if not system.get(attr, None):
             system[attr] = None
+    yield system
+    yield from systems
+
+
+def iter_deployments_csv(deployment_report, get_fingerprints):  # noqa: C901
+    """Generate the lines of a deployments report csv.
+
+    :param deployment_report: the DeploymentsReport
+    :param get_fingerprints: function returning an iterable of the fingerprints.
+        It is called twice, for headers then rows.
+    :returns: iterator of csv lines
+    """
+    source_headers = {SOURCES_KEY, *_get_detection_keys()}
+    csv_helper = CSVHelper()
+    csv_writer = csv.writer(EchoBuffer(), delimiter=",")
+
+    yield csv_writer.writerow(
+        ["Report ID", "Report Type", "Report Version", "Report Platform ID"]
+    )
+    yield csv_writer.writerow(
+        [
+            deployment_report.report_id,
+            deployment_report.report_type,
+            deployment_report.report_version,
+            deployment_report.report_platform_id,
+        ]
+    )
+    yield csv_writer.writerow([])
+    yield csv_writer.writerow([])
+
+    yield csv_writer.writerow(["System Fingerprints:"])
 
     headers = csv_helper.generate_headers(
-        systems_list,
+        _with_model_fields(get_fingerprints()),
         exclude={
             "id",
             "report_id",
@@ -114,8 +147,9 @@ def create_deployments_csv(  # noqa: PLR0912, PLR0915, C901
         headers = sorted(list(set(headers)))
 
     # Add source headers
-    csv_writer.writerow(headers)
-    for system in systems_list:
+    yield csv_writer.writerow(headers)
+    for system in _with_model_fields(get_fingerprints()):
+        system.update(csv_helper.product_columns(system))
         row = []
         system_sources = system.get(SOURCES_KEY)
         if system_sources is not None:
@@ -135,14 +169,48 @@ def create_deployments_csv(  # noqa: PLR0912, PLR0915, C901
             else:
                 fact_value = system.get(header)
             row.append(csv_helper.serialize_value(header, fact_value))
-        csv_writer.writerow(sanitize_row(row))
+        yield csv_writer.writerow(sanitize_row(row))
 
-    csv_writer.writerow([])
-    logger.info("Caching csv results for deployment report %d", report_id)
-    cached_csv = deployment_report_buffer.getvalue()
-    if validate_query_param_bool(mask_report):
-        deployment_report.cached_masked_csv = cached_csv
-    else:
-        deployment_report.cached_csv = cached_csv
-    deployment_report.save()
-    return cached_csv
+    yield csv_writer.writerow([])
+
+
+def stream_deployments_csv(deployment_report, mask_report):
+    """Stream a deployments report as csv, reading fingerprints from the database.
+
+    Unless the csv is cached, the fingerprints are read twice: once to find the
+    csv headers and once to write the rows.
+
+    :param deployment_report: the DeploymentsReport, with or without its cached
+        fields loaded
+    :param mask_report: <boolean> whether sensitive facts should be masked
+    :returns: iterator of csv chunks
+    """
+    cached_field = "cached_masked_csv" if mask_report else "cached_csv"
+    cached_csv = (
+        DeploymentsReport.objects.filter(pk=deployment_report.pk)
+        .values_list(cached_field, flat=True)
+        .first()
+    )
+    if cached_csv:
+        logger.info(
+            "Using cached csv results for deployment report %d",
+            deployment_report.report_id,
+        )
+        yield cached_csv
+        return
+
+    masker = deployments_masker()
+
+    def get_fingerprints():
+        fingerprints = iter_json_array(deployment_report, "cached_fingerprints")
+        fingerprints = map(json.loads, fingerprints)
+        if mask_report:
+            fingerprints = map(masker.mask_system, fingerprints)
+        return fingerprints
+
+    yield from iter_deployments_csv(deployment_report, get_fingerprints)
+
+
+def deployments_masker():
+    """Return a masker of the sensitive facts of system fingerprints."""
+    return ValueMasker(MAC_AND_IP_FACTS, NAME_RELATED_FACTS)
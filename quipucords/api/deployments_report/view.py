@@ -17,11 +17,19 @@ from rest_framework.response import Response
 from rest_framework.serializers import ValidationError
 
 from api import messages
+from api.common.json_stream import json_streaming_response, stream_json_object
+from api.common.report_artifacts import (
+    find_report_artifact,
+    report_artifact_name,
+    report_artifact_response,
+)
 from api.common.report_json_gzip_renderer import ReportJsonGzipRenderer
 from api.common.util import is_int, validate_query_param_bool
 from api.deployments_report.csv_renderer import DeploymentCSVRenderer
-from api.models import DeploymentsReport
+from api.deployments_report.util import deployments_masker
+from api.models import DeploymentsReport, DetailsReport
 from api.user.authentication import QuipucordsExpiringTokenAuthentication
+from compat.db import iter_json_array
 
 logger = logging.getLogger(__name__)
 
@@ -41,24 +49,67 @@ def deployments(request, report_id=None):
         error = {"report_id": [_(messages.COMMON_ID_INV)]}
         raise ValidationError(error)
     mask_report = request.query_params.get("mask", False)
-    report = get_object_or_404(DeploymentsReport.objects.all(), report_id=report_id)
+    queryset = DeploymentsReport.objects.all()
+    stream_json = type(request.accepted_renderer) is JSONRenderer
+    if stream_json:
+        queryset = queryset.defer(*DeploymentsReport.CACHED_FIELDS)
+    report = get_object_or_404(queryset, report_id=report_id)
     if report.status != DeploymentsReport.STATUS_COMPLETE:
+        details_report = DetailsReport.objects.only("id").get(deployment_report=report)
         return Response(
             {
-                "detail": f"Deployment report {report.details_report.id}"
+                "detail": f"Deployment report {details_report.id}"
                 " could not be created. See server logs."
             },
             status=status.HTTP_424_FAILED_DEPENDENCY,
         )
-    deployments_report = build_cached_json_report(report, mask_report)
-    if deployments_report:
-        return Response(deployments_report)
-    error = {
-        "detail": f"Deployments report {report.id} could not be masked."
-        f" Report version {report.report_version}."
-        " Rerun the scan to generate a masked deployments report."
+    if artifact := _find_artifact(request, report, mask_report):
+        return report_artifact_response(
+            request, artifact, request.accepted_renderer.media_type
+        )
+    if stream_json:
+        return json_streaming_response(stream_cached_json_report(report, mask_report))
+    return Response(build_cached_json_report(report, mask_report))
+
+
+def _find_artifact(request, report, mask_report):
+    """Return the precomputed artifact for the accepted renderer, if any."""
+    file_ext = request.accepted_renderer.format
+    if file_ext not in ("json", "csv"):
+        return None
+    name = report_artifact_name(
+        "deployments", file_ext, validate_query_param_bool(mask_report)
+    )
+    return find_report_artifact(report, name)
+
+
+def _report_fields(report):
+    """Return the fields of a deployments report other than its fingerprints."""
+    return {
+        "report_id": report.id,
+        "status": report.status,
+        "report_type": report.report_type,
+        "report_version": report.report_version,
+        "report_platform_id": str(report.report_platform_id),
     }
-    return Response(error, status=status.HTTP_428_PRECONDITION_REQUIRED)
+
+
+def stream_cached_json_report(report, mask_report):
+    """Stream a deployments report as JSON, reading fingerprints from the database.
+
+    :param report: the DeploymentsReport, with or without its cached fields loaded
+    :param mask_report: <boolean> bool associated with whether
+        or not we should mask the report.
+    :returns: iterator of JSON chunks
+    """
+    system_fingerprints = iter_json_array(report, "cached_fingerprints")
+    if validate_query_param_bool(mask_report):
+        system_fingerprints = map(
+            deployments_masker().mask_system_json, system_fingerprints
+        )
+    return stream_json_object(
+        _report_fields(report), "system_fingerprints", system_fingerprints
+    )
 
 
 def build_cached_json_report(report, mask_report):
@@ -70,18 +121,10 @@ def build_cached_json_report(report, mask_report):
     :returns: json report data
     :raises: Raises validation error group_count on non-existent field.
     """
-    if validate_query_param_bool(mask_report):
-        if report.cached_masked_fingerprints:
-            system_fingerprints = report.cached_masked_fingerprints
-        else:
-            return None
-    else:
-        system_fingerprints = report.cached_fingerprints
-    return {
-        "report_id": report.id,
-        "status": report.status,
-        "report_type": report.report_type,
-        "report_version": report.report_version,
-        "report_platform_id": str(report.report_platform_id),
-        "system_fingerprints": system_fingerprints,
-    }
+    system_fingerprints = report.cached_fingerprints
+    if validate_query_param_bool(mask_report) and system_fingerprints:
+        # fingerprints were just loaded for this report, so mask them in place
+        masker = deployments_masker()
+        for system in system_fingerprints:
+            masker.mask_system(system)
+    return {**_report_fields(report), "system_fingerprints": system_fingerprints}
@@ -0,0 +1,170 @@
+"""Apache Arrow renderer for details reports."""
+
+import io
+import json
+from itertools import islice
+
+import pyarrow
+import pyarrow.ipc
+from rest_framework import renderers
+
+from api.common.common_report import ChunkSink, create_filename, stream_tar_gz
+from api.details_report.util import details_masker, read_source_facts, read_sources
+
+# number of systems written in each Arrow record batch
+RECORD_BATCH_SIZE = 10000
+# columns describing the source of each system, before its fact columns
+SOURCE_COLUMNS = ("server_id", "source_name")
+
+
+def arrow_type(value_types):
+    """Return the Arrow type of a column, or None if it must be JSON encoded.
+
+    :param value_types: set of the types of the values of the column, None aside
+    """
+    if value_types == {bool}:
+        return pyarrow.bool_()
+    if value_types == {int}:
+        return pyarrow.int64()
+    if value_types and value_types <= {int, float}:
+        return pyarrow.float64()
+    if value_types <= {str}:
+        return pyarrow.string()
+    return None
+
+
+def json_encode(value):
+    """Encode a nested fact value as JSON, keeping strings as they are."""
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, sort_keys=True)
+
+
+def source_type_schema(systems):
+    """Return the Arrow schema of the systems of one source type.
+
+    :param systems: iterable of (source, facts) tuples
+    :returns: the schema and the names of its JSON encoded columns, or None if
+        there are no systems
+    """
+    value_types = {name: set() for name in SOURCE_COLUMNS}
+    fact_names = set()
+    has_systems = False
+    for source, facts in systems:
+        has_systems = True
+        for name in SOURCE_COLUMNS:
+            value_types[name].add(type(source[name]))
+        for name, value in facts.items():
+            fact_names.add(name)
+            value_types.setdefault(name, set()).add(type(value))
+    if not has_systems:
+        return None
+
+    fields = []
+    json_columns = set()
+    for name in (*SOURCE_COLUMNS, *sorted(fact_names)):
+        column_type = arrow_type(value_types[name] - {type(None)})
+        if column_type is None:
+            column_type = pyarrow.string()
+            json_columns.add(name)
+        fields.append(pyarrow.field(name, column_type))
+    return pyarrow.schema(fields), json_columns
+
+
+def iter_source_type_table(schema, json_columns, systems):
+    """Write systems in the Arrow IPC file format, one record batch at a time.
+
+    :param schema: the schema of the systems, as returned by source_type_schema
+    :param json_columns: names of the JSON encoded columns
+    :param systems: iterable of (source, facts) tuples
+    :returns: iterator of bytes
+    """
+    sink = ChunkSink()
+    systems = iter(systems)
+    with pyarrow.ipc.new_file(sink, schema) as writer:
+        while batch_systems := list(islice(systems, RECORD_BATCH_SIZE)):
+            batch = []
+            for field in schema:
+                if field.name in SOURCE_COLUMNS:
+                    values = [source[field.name] for source, _ in batch_systems]
+                else:
+                    values = [facts.get(field.name) for _, facts in batch_systems]
+                if field.name in json_columns:
+                    values = [json_encode(value) for value in values]
+                batch.append(pyarrow.array(values, type=field.type))
+            writer.write_batch(pyarrow.record_batch(batch, schema=schema))
+            yield from sink.drain()
+    yield from sink.drain()
+
+
+def stream_arrow_tar_gz(report_id, sources, get_facts):
+    """Generate a tar.gz of Arrow IPC files, one per source type.
+
+    The facts of each source are read twice: once to find the schema of its
+    source type and once to write the record batches.
+
+    :param report_id: id of the details report
+    :param sources: list of sources, their facts aside
+    :param get_facts: function returning an iterable of the facts of a source
+        given its index
+    :returns: iterator of bytes
+    """
+    indexes_by_source_type = {}
+    for index, source in enumerate(sources):
+        indexes_by_source_type.setdefault(source["source_type"], []).append(index)
+
+    def get_systems(indexes):
+        for index in indexes:
+            source = {name: sources[index].get(name) for name in SOURCE_COLUMNS}
+            for facts in get_facts(index):
+                yield source, facts
+
+    files = []
+    for source_type, indexes in sorted(indexes_by_source_type.items()):
+        schema = source_type_schema(get_systems(indexes))
+        if schema is None:
+            continue
+        file_name = create_filename(f"details-{source_type}", "arrow", report_id)
+        files.append((file_name, iter_source_type_table(*schema, get_systems(indexes))))
+    return stream_tar_gz(files)
+
+
+def stream_details_arrow(details_report, mask_report):
+    """Stream a details report as a tar.gz of Arrow IPC files.
+
+    :param details_report: the DetailsReport, with or without its sources loaded
+    :param mask_report: <boolean> whether sensitive facts should be masked
+    :returns: iterator of bytes
+    """
+    masker = details_masker() if mask_report else None
+    return stream_arrow_tar_gz(
+        details_report.report_id,
+        read_sources(details_report),
+        lambda index: read_source_facts(details_report, index, masker),
+    )
+
+
+class DetailsArrowRenderer(renderers.BaseRenderer):
+    """Class to render details reports as tar.gz of Arrow IPC files.
+
+    Each source type gets a file with one row per system and one column per fact.
+    Fact values that aren't booleans, numbers or strings are JSON encoded.
+    The details view streams the files from the database, this renderer is
+    used when the report is already loaded.
+    """
+
+    media_type = "application/vnd.apache.arrow.file+gzip"
+    format = "arrow"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render report as tar.gz of Arrow IPC files."""
+        report_id = data.get("report_id")
+        if report_id is None:
+            return None
+        sources = data.get("sources", [])
+        tar_chunks = stream_arrow_tar_gz(
+            report_id, sources, lambda index: sources[index].get("facts") or []
+        )
+        return io.BytesIO(b"".join(tar_chunks))
@@ -5,6 +5,7 @@ import uuid
 from django.db import models
 
 from api.common.common_report import REPORT_TYPE_CHOICES, REPORT_TYPE_DETAILS
+from api.common.fields import CompressedTextField
 
 
 class DetailsReport(models.Model):
@@ -20,5 +21,22 @@ class DetailsReport(models.Model):
     deployment_report = models.OneToOneField(
         "DeploymentsReport", models.CASCADE, related_name="details_report", null=True
     )
-    cached_csv = models.TextField(null=True)
-    cached_masked_csv = models.TextField(null=True)
+    cached_csv = CompressedTextField(null=True)
+    cached_masked_csv = CompressedTextField(null=True)
+
+    # large fields, to defer when only the status or metadata of a report is needed
+    CACHED_FIELDS = (
+        "cached_csv",
+        "cached_masked_csv",
+    )
+
+    class Meta:
+        """Metadata for model."""
+
+        indexes = [
+            models.Index(
+                fields=["report_id"],
+                name="detailsreport_report_idx",
+                condition=models.Q(report_id__isnull=False),
+            ),
+        ]
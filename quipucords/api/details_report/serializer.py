@@ -23,3 +23,20 @@ class DetailsReportSerializer(NotEmptySerializer):
 
         model = DetailsReport
         exclude = ("id", "deployment_report")
+
+
+class DetailsReportStreamSerializer(DetailsReportSerializer):
+    """DetailsReportSerializer for the fields streamed ahead of the sources."""
+
+    sources = None
+    cached_csv = None
+    cached_masked_csv = None
+
+    class Meta(DetailsReportSerializer.Meta):
+        """Meta class for DetailsReportStreamSerializer."""
+
+        exclude = (
+            *DetailsReportSerializer.Meta.exclude,
+            "sources",
+            *DetailsReport.CACHED_FIELDS,
+        )
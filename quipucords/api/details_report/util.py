@@ -1,16 +1,23 @@
 """Util for validating and persisting source facts."""
 
 import csv
+import json
 import logging
-from io import StringIO
 
 from django.utils.translation import gettext as _
 
 from api import messages
-from api.common.common_report import CSVHelper, create_report_version, sanitize_row
-from api.common.util import mask_data_general, validate_query_param_bool
+from api.common.common_report import (
+    CSVHelper,
+    EchoBuffer,
+    create_report_version,
+    sanitize_row,
+)
+from api.common.json_stream import stream_json_object
+from api.common.util import ValueMasker, validate_query_param_bool
 from api.models import DetailsReport, ScanTask, ServerInformation
-from api.serializers import DetailsReportSerializer
+from api.serializers import DetailsReportSerializer, DetailsReportStreamSerializer
+from compat.db import iter_json_array
 from constants import DataSources
 
 ERRORS_KEY = "errors"
@@ -180,32 +187,73 @@ def create_details_report(report_version, json_details_report):
     return None
 
 
-def create_details_csv(details_report_dict, request):  # noqa: C901
+def create_details_csv(details_report_dict, request):
     """Create details csv."""
     report_id = details_report_dict.get("report_id")
     if report_id is None:
         return None
 
-    details_report = DetailsReport.objects.filter(report_id=report_id).first()
-    if details_report is None:
-        return None
     mask_report = request.query_params.get("mask", False)
-    # Check for a cached copy of csv
-    cached_csv = details_report.cached_csv
+    cached_field = "cached_csv"
     if validate_query_param_bool(mask_report):
-        cached_csv = details_report.cached_masked_csv
+        cached_field = "cached_masked_csv"
+    details_report = (
+        DetailsReport.objects.only(
+            "report_type",
+            "report_version",
+            "report_platform_id",
+            "report_id",
+            cached_field,
+        )
+        .filter(report_id=report_id)
+        .first()
+    )
+    if details_report is None:
+        return None
+    # Check for a cached copy of csv, the only cached field loaded
+    cached_csv = getattr(details_report, cached_field)
     if cached_csv:
         logger.info("Using cached csv results for details report %d", report_id)
         return cached_csv
     logger.info("No cached csv results for details report %d", report_id)
 
-    csv_helper = CSVHelper()
-    details_report_csv_buffer = StringIO()
-    csv_writer = csv.writer(details_report_csv_buffer, delimiter=",")
-
     sources = details_report_dict.get("sources")
+    details_csv = "".join(
+        iter_details_csv(
+            details_report,
+            sources,
+            lambda index: sources[index].get(FACTS_KEY) or [],
+        )
+    )
+    if sources is None:
+        return details_csv
+
+    logger.info("Caching csv results for details report %d", report_id)
+    setattr(details_report, cached_field, details_csv)
+    details_report.save(update_fields=[cached_field])
+
+    return details_csv
 
-    csv_writer.writerow(
+
+def iter_details_csv(details_report, sources, get_facts):
+    """Generate the lines of a details report csv.
+
+    :param details_report: the DetailsReport
+    :param sources: list of sources, their facts aside, or None
+    :param get_facts: function returning an iterable of the facts of a source
+        given its index. It is called twice per source, for headers then rows.
+    :returns: iterator of csv lines
+    """
+    csv_helper = CSVHelper()
+    csv_writer = csv.writer(EchoBuffer(), delimiter=",")
+    report_row = [
+        details_report.report_id,
+        details_report.report_type,
+        details_report.report_version,
+        details_report.report_platform_id,
+    ]
+
+    yield csv_writer.writerow(
         [
             "Report ID",
             "Report Type",
@@ -215,94 +263,157 @@ def create_details_csv(details_report_dict, request):  # noqa: C901
         ]
     )
     if sources is None:
-        csv_writer.writerow(
-            [
-                report_id,
-                details_report.report_type,
-                details_report.report_version,
-                details_report.report_platform_id,
-                0,
-            ]
-        )
-        return details_report_csv_buffer.getvalue()
+        yield csv_writer.writerow([*report_row, 0])
+        return
 
-    csv_writer.writerow(
-        [
-            report_id,
-            details_report.report_type,
-            details_report.report_version,
-            details_report.report_platform_id,
-            len(sources),
-        ]
-    )
-    csv_writer.writerow([])
-    csv_writer.writerow([])
+    yield csv_writer.writerow([*report_row, len(sources)])
+    yield csv_writer.writerow([])
+    yield csv_writer.writerow([])
 
-    for source in sources:
-        csv_writer.writerow(["Source"])
-        csv_writer.writerow(["Server Identifier", "Source Name", "Source Type"])
-        csv_writer.writerow(
+    for index, source in enumerate(sources):
+        yield csv_writer.writerow(["Source"])
+        yield csv_writer.writerow(["Server Identifier", "Source Name", "Source Type"])
+        yield csv_writer.writerow(
             [
                 source.get("server_id"),
                 source.get("source_name"),
                 source.get("source_type"),
             ]
         )
-        csv_writer.writerow(["Facts"])
-        fact_list = source.get("facts")
-        if not fact_list:
+        yield csv_writer.writerow(["Facts"])
+        headers = csv_helper.generate_headers(get_facts(index))
+        if not headers:
             # write a space line and move to next
-            csv_writer.writerow([])
+            yield csv_writer.writerow([])
             continue
-        headers = csv_helper.generate_headers(fact_list)
-        csv_writer.writerow(headers)
+        yield csv_writer.writerow(headers)
 
-        for fact in fact_list:
+        for fact in get_facts(index):
+            fact.update(csv_helper.product_columns(fact))
             row = []
             for header in headers:
                 fact_value = fact.get(header)
                 row.append(csv_helper.serialize_value(header, fact_value))
 
-            csv_writer.writerow(sanitize_row(row))
+            yield csv_writer.writerow(sanitize_row(row))
 
-        csv_writer.writerow([])
-        csv_writer.writerow([])
+        yield csv_writer.writerow([])
+        yield csv_writer.writerow([])
 
-    logger.info("Caching csv results for details report %d", report_id)
-    cached_csv = details_report_csv_buffer.getvalue()
-    if validate_query_param_bool(mask_report):
-        details_report.cached_masked_csv = cached_csv
-    else:
-        details_report.cached_csv = cached_csv
-    details_report.save()
 
-    return cached_csv
+def stream_details_csv(details_report, mask_report):
+    """Stream a details report as csv, reading its facts from the database.
+
+    Unless the csv is cached, the facts of each source are read twice: once to
+    find the csv headers and once to write the rows.
+
+    :param details_report: the DetailsReport, with or without its sources loaded
+    :param mask_report: <boolean> whether sensitive facts should be masked
+    :returns: iterator of csv chunks
+    """
+    cached_field = "cached_masked_csv" if mask_report else "cached_csv"
+    cached_csv = (
+        DetailsReport.objects.filter(pk=details_report.pk)
+        .values_list(cached_field, flat=True)
+        .first()
+    )
+    if cached_csv:
+        logger.info(
+            "Using cached csv results for details report %d", details_report.report_id
+        )
+        yield cached_csv
+        return
+
+    masker = details_masker() if mask_report else None
+    yield from iter_details_csv(
+        details_report,
+        read_sources(details_report),
+        lambda index: read_source_facts(details_report, index, masker),
+    )
+
+
+def read_sources(details_report):
+    """Read the sources of a details report from the database, their facts aside."""
+    return [
+        json.loads(source_json)
+        for source_json in iter_json_array(
+            details_report, "sources", without_key=FACTS_KEY
+        )
+    ]
+
+
+def read_source_facts(details_report, index, masker=None):
+    """Read the facts of a source of a details report from the database.
+
+    :param details_report: the DetailsReport, with or without its sources loaded
+    :param index: index of the source
+    :param masker: ValueMasker masking the sensitive facts, if any
+    :returns: iterator of facts
+    """
+    facts = iter_json_array(details_report, "sources", path=(index, FACTS_KEY))
+    facts = map(json.loads, facts)
+    if masker is not None:
+        facts = map(masker.mask_system, facts)
+    return facts
+
+
+MAC_AND_IP_FACTS = [
+    "ifconfig_ip_addresses",
+    "ip_addresses",
+    "vm.ip_addresses",
+    "ifconfig_mac_addresses",
+    "mac_addresses",
+    "vm.mac_addresses",
+]
+NAME_RELATED_FACTS = [
+    "vm.host_name",
+    "vm.dns_name",
+    "vm.cluster",
+    "vm.name",
+    "uname_hostname",
+]
+
+
+def details_masker():
+    """Return a masker of the sensitive facts of a details report."""
+    return ValueMasker(MAC_AND_IP_FACTS, NAME_RELATED_FACTS)
 
 
 def mask_details_facts(report):
-    """Mask sensitive facts from the details report.
+    """Mask sensitive facts from the details report, in place.
 
     :param: report <dict> The details report to mask
 
     :returns: report <dict> The masked details report.
     """
-    mac_and_ip_facts = [
-        "ifconfig_ip_addresses",
-        "ip_addresses",
-        "vm.ip_addresses",
-        "ifconfig_mac_addresses",
-        "mac_addresses",
-        "vm.mac_addresses",
-    ]
-    name_related_facts = [
-        "vm.host_name",
-        "vm.dns_name",
-        "vm.cluster",
-        "vm.name",
-        "uname_hostname",
-    ]
-    sources = report.get("sources", [])
-    for source in sources:
-        facts = source.get("facts")
-        source["facts"] = mask_data_general(facts, mac_and_ip_facts, name_related_facts)
+    masker = details_masker()
+    for source in report.get("sources", []):
+        for fact in source.get("facts") or []:
+            masker.mask_system(fact)
     return report
+
+
+def stream_details_json(details_report, mask_report):
+    """Stream a details report as JSON, reading its facts from the database.
+
+    :param details_report: the DetailsReport, with or without its sources loaded
+    :param mask_report: <boolean> whether sensitive facts should be masked
+    :returns: iterator of JSON chunks
+    """
+    details_fields = DetailsReportStreamSerializer(details_report).data
+    return stream_json_object(
+        details_fields, SOURCES_KEY, _stream_sources(details_report, mask_report)
+    )
+
+
+def _stream_sources(details_report, mask_report):
+    """Stream each source of a details report, one fact at a time."""
+    sources_fields = list(
+        iter_json_array(details_report, "sources", without_key=FACTS_KEY)
+    )
+    masker = details_masker()
+    for index, source_fields in enumerate(sources_fields):
+        facts = iter_json_array(details_report, "sources", path=(index, FACTS_KEY))
+        if mask_report:
+            facts = map(masker.mask_system_json, facts)
+        yield stream_json_object(source_fields, FACTS_KEY, facts)
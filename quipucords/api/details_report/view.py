@@ -2,6 +2,7 @@
 
 import logging
 
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils.translation import gettext as _
 from rest_framework import mixins, status, viewsets
@@ -19,12 +20,23 @@ from rest_framework.serializers import ValidationError
 
 from api import messages
 from api.common.common_report import create_report_version
+from api.common.json_stream import json_streaming_response
+from api.common.report_artifacts import (
+    find_report_artifact,
+    report_artifact_name,
+    report_artifact_response,
+)
 from api.common.report_json_gzip_renderer import ReportJsonGzipRenderer
 from api.common.util import is_int, validate_query_param_bool
+from api.details_report.arrow_renderer import (
+    DetailsArrowRenderer,
+    stream_details_arrow,
+)
 from api.details_report.csv_renderer import DetailsCSVRenderer
 from api.details_report.util import (
     create_details_report,
     mask_details_facts,
+    stream_details_json,
     validate_details_report_json,
 )
 from api.models import DetailsReport, ScanJob, ScanTask
@@ -42,7 +54,13 @@ perm_classes = (IsAuthenticated,)
 @authentication_classes(auth_classes)
 @permission_classes(perm_classes)
 @renderer_classes(
-    (JSONRenderer, BrowsableAPIRenderer, DetailsCSVRenderer, ReportJsonGzipRenderer)
+    (
+        JSONRenderer,
+        BrowsableAPIRenderer,
+        DetailsCSVRenderer,
+        ReportJsonGzipRenderer,
+        DetailsArrowRenderer,
+    )
 )
 def details(request, report_id=None):
     """Lookup and return a details system report."""
@@ -50,10 +68,30 @@ def details(request, report_id=None):
         if not is_int(report_id):
             error = {"report_id": [_(messages.COMMON_ID_INV)]}
             raise ValidationError(error)
-    detail_data = get_object_or_404(DetailsReport.objects.all(), report_id=report_id)
+    queryset = DetailsReport.objects.defer("sources", *DetailsReport.CACHED_FIELDS)
+    detail_data = get_object_or_404(queryset, report_id=report_id)
+    mask_report = request.query_params.get("mask", False)
+    file_ext = request.accepted_renderer.format
+    if file_ext in ("json", "csv"):
+        name = report_artifact_name(
+            "details", file_ext, validate_query_param_bool(mask_report)
+        )
+        if artifact := find_report_artifact(detail_data, name):
+            return report_artifact_response(
+                request, artifact, request.accepted_renderer.media_type
+            )
+    if type(request.accepted_renderer) is JSONRenderer:
+        return json_streaming_response(
+            stream_details_json(detail_data, validate_query_param_bool(mask_report))
+        )
+    if type(request.accepted_renderer) is DetailsArrowRenderer:
+        return StreamingHttpResponse(
+            stream_details_arrow(detail_data, validate_query_param_bool(mask_report)),
+            content_type=DetailsArrowRenderer.media_type,
+        )
+    detail_data = DetailsReport.objects.get(pk=detail_data.pk)
     serializer = DetailsReportSerializer(detail_data)
     json_details = serializer.data
-    mask_report = request.query_params.get("mask", False)
     if validate_query_param_bool(mask_report):
         json_details = mask_details_facts(json_details)
     http_accept = request.META.get("HTTP_ACCEPT")
@@ -15,6 +15,11 @@ from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
 from rest_framework.response import Response
 
 from api.common.entities import ReportEntity
+from api.common.report_artifacts import (
+    INSIGHTS_ARTIFACT,
+    find_report_artifact,
+    report_artifact_response,
+)
 from api.exceptions import FailedDependencyError
 from api.insights_report.insights_gzip_renderer import InsightsGzipRenderer
 from api.insights_report.serializers import YupanaPayloadSerializer
@@ -34,9 +39,16 @@ perm_classes = (IsAuthenticated,)
 def insights(request, report_id=None):
     """Lookup and return a insights system report."""
     deployment_report = get_object_or_404(
-        DeploymentsReport.objects.only("id", "status"), pk=report_id
+        DeploymentsReport.objects.only("id", "status", "report_platform_id"),
+        pk=report_id,
     )
     _validate_deployment_report_status(deployment_report)
+    if isinstance(request.accepted_renderer, InsightsGzipRenderer) and (
+        artifact := find_report_artifact(deployment_report, INSIGHTS_ARTIFACT)
+    ):
+        return report_artifact_response(
+            request, artifact, InsightsGzipRenderer.media_type
+        )
     report = _get_report(deployment_report)
     serializer = YupanaPayloadSerializer(report)
     return Response(serializer.data)
@@ -58,6 +58,12 @@ class SystemInspectionResult(models.Model):
         """Metadata for model."""
 
         verbose_name_plural = _(messages.PLURAL_SYS_INSPECT_RESULTS_MSG)
+        indexes = [
+            models.Index(
+                fields=["task_inspection_result", "status"],
+                name="sysinspectresult_status_idx",
+            ),
+        ]
 
 
 class RawFactEncoder(JSONEncoder):
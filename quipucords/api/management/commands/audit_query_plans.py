@@ -0,0 +1,136 @@
+"""Audit the query plans of hot scan and report lookups.
+
+Planners prefer sequential scans on small tables, so the audit is only meaningful
+against a database seeded with production-like volumes, e.g. a restored backup or
+the results of a large scan. Tables smaller than --min-rows are not audited.
+"""
+
+import re
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from api.models import (
+    DeploymentsReport,
+    DetailsReport,
+    RawFact,
+    ScanTask,
+    SystemConnectionResult,
+    SystemFingerprint,
+    SystemInspectionResult,
+)
+
+SEQUENTIAL_SCAN_PATTERNS = {
+    "postgresql": re.compile(r"Seq Scan on (?P<table>\w+)"),
+    "sqlite": re.compile(r"\bSCAN (?P<table>\w+)$", re.MULTILINE),
+}
+
+# arbitrary values, the planner doesn't need them to match any row
+SAMPLE_ID = 1
+SAMPLE_STATUS = SystemInspectionResult.SUCCESS
+
+
+def get_audited_queries():
+    """Return a dict mapping a description to each audited queryset."""
+    return {
+        "deployments report by report_id": DeploymentsReport.objects.filter(
+            report_id=SAMPLE_ID
+        ),
+        "details report by report_id": DetailsReport.objects.filter(
+            report_id=SAMPLE_ID
+        ),
+        "scan tasks by job, type and status": ScanTask.objects.filter(
+            job_id=SAMPLE_ID,
+            scan_type=ScanTask.SCAN_TYPE_INSPECT,
+            status=ScanTask.COMPLETED,
+        ),
+        "incomplete scan tasks by job": ScanTask.objects.filter(
+            job_id=SAMPLE_ID, status__in=[ScanTask.PENDING, ScanTask.RUNNING]
+        ).order_by("sequence_number"),
+        "connection results by task and status": SystemConnectionResult.objects.filter(
+            task_connection_result_id=SAMPLE_ID, status=SAMPLE_STATUS
+        ),
+        "inspection results by task and status": SystemInspectionResult.objects.filter(
+            task_inspection_result_id=SAMPLE_ID, status=SAMPLE_STATUS
+        ),
+        "raw facts by inspection result": RawFact.objects.filter(
+            system_inspection_result_id=SAMPLE_ID
+        ),
+        "fingerprints by deployments report": SystemFingerprint.objects.filter(
+            deployment_report_id=SAMPLE_ID
+        ),
+    }
+
+
+def get_table_sizes():
+    """Return a dict mapping each table name to its number of rows.
+
+    Postgres sizes are the row estimates of its statistics, so large tables aren't
+    scanned to be counted. Other databases are only used in development, where
+    counting is cheap.
+    """
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT relname, n_live_tup FROM pg_stat_user_tables"
+                " WHERE schemaname = current_schema()"
+            )
+            return dict(cursor.fetchall())
+    return {
+        model._meta.db_table: model.objects.count()
+        for model in apps.get_app_config("api").get_models()
+    }
+
+
+class Command(BaseCommand):
+    """Explain hot ORM queries and fail on sequential scans of large tables."""
+
+    help = __doc__
+
+    def add_arguments(self, parser):
+        """Add arguments to the command."""
+        parser.add_argument(
+            "--min-rows",
+            type=int,
+            default=1000,
+            help="Only fail on sequential scans of tables with at least this many"
+            " rows. Planners often prefer sequential scans on small tables.",
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command."""
+        try:
+            pattern = SEQUENTIAL_SCAN_PATTERNS[connection.vendor]
+        except KeyError as error:
+            raise CommandError(
+                f"Unsupported database vendor '{connection.vendor}'."
+            ) from error
+
+        table_sizes = get_table_sizes()
+        if max(table_sizes.values(), default=0) < options["min_rows"]:
+            self.stdout.write(
+                f"WARNING no table has {options['min_rows']} rows, so no sequential"
+                " scan can fail the audit. Run it on a seeded database."
+            )
+        failures = []
+        for description, queryset in get_audited_queries().items():
+            plan = queryset.explain()
+            scanned_tables = {
+                match.group("table")
+                for match in pattern.finditer(plan)
+                if table_sizes.get(match.group("table"), 0) >= options["min_rows"]
+            }
+            if scanned_tables:
+                failures.append(description)
+                tables = ", ".join(sorted(scanned_tables))
+                self.stdout.write(f"SEQUENTIAL SCAN {description}: {tables}")
+                self.stdout.write(plan)
+            else:
+                self.stdout.write(f"OK {description}")
+
+        if failures:
+            raise CommandError(
+                f"Sequential scans found on {len(failures)} queries:"
+                f" {', '.join(failures)}."
+            )
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.3 on 2026-10-19 10:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0033_alter_credential_auth_token_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="deploymentsreport",
+            index=models.Index(
+                condition=models.Q(("report_id__isnull", False)),
+                fields=["report_id"],
+                name="deploymentsreport_report_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="detailsreport",
+            index=models.Index(
+                condition=models.Q(("report_id__isnull", False)),
+                fields=["report_id"],
+                name="detailsreport_report_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="scantask",
+            index=models.Index(
+                fields=["job", "scan_type", "status"],
+                name="scantask_job_type_status_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="scantask",
+            index=models.Index(
+                condition=models.Q(("status__in", ["pending", "running"])),
+                fields=["job", "sequence_number"],
+                name="scantask_incomplete_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="systemconnectionresult",
+            index=models.Index(
+                fields=["task_connection_result", "status"],
+                name="sysconnresult_status_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="systeminspectionresult",
+            index=models.Index(
+                fields=["task_inspection_result", "status"],
+                name="sysinspectresult_status_idx",
+            ),
+        ),
+    ]
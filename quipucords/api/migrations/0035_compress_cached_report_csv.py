@@ -0,0 +1,56 @@
+# Generated by Django 4.2.3 on 2026-10-19 14:05
+
+from django.db import migrations
+
+import api.common.fields
+
+
+class Migration(migrations.Migration):
+    """Store the cached csv reports compressed.
+
+    The cached csv reports are dropped rather than converted: they are generated
+    again the next time a report is downloaded.
+    """
+
+    dependencies = [
+        ("api", "0034_add_report_and_scan_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="deploymentsreport",
+            name="cached_csv",
+        ),
+        migrations.RemoveField(
+            model_name="deploymentsreport",
+            name="cached_masked_csv",
+        ),
+        migrations.RemoveField(
+            model_name="detailsreport",
+            name="cached_csv",
+        ),
+        migrations.RemoveField(
+            model_name="detailsreport",
+            name="cached_masked_csv",
+        ),
+        migrations.AddField(
+            model_name="deploymentsreport",
+            name="cached_csv",
+            field=api.common.fields.CompressedTextField(null=True),
+        ),
+        migrations.AddField(
+            model_name="deploymentsreport",
+            name="cached_masked_csv",
+            field=api.common.fields.CompressedTextField(null=True),
+        ),
+        migrations.AddField(
+            model_name="detailsreport",
+            name="cached_csv",
+            field=api.common.fields.CompressedTextField(null=True),
+        ),
+        migrations.AddField(
+            model_name="detailsreport",
+            name="cached_masked_csv",
+            field=api.common.fields.CompressedTextField(null=True),
+        ),
+    ]
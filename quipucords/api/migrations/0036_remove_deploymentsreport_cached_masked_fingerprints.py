@@ -0,0 +1,17 @@
+# Generated by Django 4.2.3 on 2026-10-19 15:10
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0035_compress_cached_report_csv"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="deploymentsreport",
+            name="cached_masked_fingerprints",
+        ),
+    ]
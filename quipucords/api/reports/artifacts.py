@@ -0,0 +1,95 @@
+"""Precompute the downloadable artifacts of a report once it is fingerprinted."""
+
+import logging
+
+from django.conf import settings
+
+from api.common.entities import ReportEntity
+from api.common.json_stream import buffer_chunks
+from api.common.report_artifacts import (
+    INSIGHTS_ARTIFACT,
+    report_artifact_name,
+    write_report_artifact,
+)
+from api.deployments_report.util import stream_deployments_csv
+from api.deployments_report.view import stream_cached_json_report
+from api.details_report.util import stream_details_csv, stream_details_json
+from api.insights_report.insights_gzip_renderer import InsightsGzipRenderer
+from api.insights_report.serializers import YupanaPayloadSerializer
+from api.models import DeploymentsReport, DetailsReport, SystemFingerprint
+
+logger = logging.getLogger(__name__)
+
+
+def precompute_report_artifacts(report_id):
+    """Write the JSON, CSV and insights artifacts of a report, masked or not.
+
+    The insights artifact is skipped if the report has no valid fingerprints.
+    Failures are logged, since views generate reports on the fly when an artifact
+    is missing.
+
+    :param report_id: id of the report
+    :returns: names of the artifacts written
+    """
+    if not settings.QPC_ENABLE_REPORT_ARTIFACTS:
+        return []
+    deployments_report = (
+        DeploymentsReport.objects.defer(*DeploymentsReport.CACHED_FIELDS)
+        .filter(report_id=report_id, status=DeploymentsReport.STATUS_COMPLETE)
+        .first()
+    )
+    if deployments_report is None:
+        return []
+    details_report = DetailsReport.objects.defer(
+        "sources", *DetailsReport.CACHED_FIELDS
+    ).get(deployment_report=deployments_report)
+    written = []
+    try:
+        for mask_report in (False, True):
+            artifacts = [
+                (
+                    details_report,
+                    "details",
+                    "json",
+                    stream_details_json(details_report, mask_report),
+                ),
+                (
+                    deployments_report,
+                    "deployments",
+                    "json",
+                    stream_cached_json_report(deployments_report, mask_report),
+                ),
+                (
+                    details_report,
+                    "details",
+                    "csv",
+                    stream_details_csv(details_report, mask_report),
+                ),
+                (
+                    deployments_report,
+                    "deployments",
+                    "csv",
+                    stream_deployments_csv(deployments_report, mask_report),
+                ),
+            ]
+            for report, report_type, file_ext, chunks in artifacts:
+                name = report_artifact_name(report_type, file_ext, mask_report)
+                write_report_artifact(report, name, buffer_chunks(chunks))
+                written.append(name)
+
+        try:
+            report_entity = ReportEntity.from_report_id(deployments_report.id)
+        except SystemFingerprint.DoesNotExist:
+            logger.info("No insights artifact for report %d: no valid hosts", report_id)
+        else:
+            insights_data = YupanaPayloadSerializer(report_entity).data
+            tar_buffer = InsightsGzipRenderer().render(insights_data)
+            write_report_artifact(
+                deployments_report, INSIGHTS_ARTIFACT, [tar_buffer.getvalue()]
+            )
+            written.append(INSIGHTS_ARTIFACT)
+    except Exception:
+        logger.exception("Failed to precompute the artifacts of report %d", report_id)
+        return written
+    logger.info("Precomputed artifacts of report %d: %s", report_id, written)
+    return written
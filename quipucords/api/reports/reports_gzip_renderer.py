@@ -1,18 +1,51 @@
 """tar.gz renderer for reports."""
 
 import hashlib
+import io
 import logging
 
 from rest_framework import renderers
 
-from api import messages
-from api.common.common_report import create_filename, create_tar_buffer, encode_content
+from api.common.common_report import create_filename, encode_content, stream_tar_gz
 from api.deployments_report.util import create_deployments_csv
 from api.details_report.util import create_details_csv
 
 logger = logging.getLogger(__name__)
 
 
+def stream_reports_tar_gz(report_id, files):
+    """Stream the reports as tar.gz, with a SHA256SUM file written last.
+
+    The hash of each file is computed while the file is generated.
+
+    :param report_id: id of the reports
+    :param files: iterable of (file name, file extension, iterable of bytes) tuples
+    :returns: iterator of bytes
+    """
+    hashes = {}
+
+    def hash_file(file_name, chunks):
+        sha256 = hashlib.sha256()
+        for chunk in chunks:
+            sha256.update(chunk)
+            yield chunk
+        hashes[file_name] = sha256.hexdigest()
+
+    def generate_sha256sum():
+        sha256sum_content = "".join(
+            f"{sha256}  {file_name}\n" for file_name, sha256 in hashes.items()
+        )
+        yield encode_content(sha256sum_content, "plaintext")
+
+    def generate_files():
+        for file_name, file_ext, chunks in files:
+            full_file_name = create_filename(file_name, file_ext, report_id)
+            yield full_file_name, hash_file(full_file_name.rsplit("/", 1)[1], chunks)
+        yield create_filename("SHA256SUM", None, report_id), generate_sha256sum()
+
+    return stream_tar_gz(generate_files())
+
+
 class ReportsGzipRenderer(renderers.BaseRenderer):
     """Class to render all reports as tar.gz."""
 
@@ -39,31 +72,11 @@ class ReportsGzipRenderer(renderers.BaseRenderer):
         if any(value is None for value in [details_csv, deployments_csv]):
             return None
 
-        # create the file names
-        details_json_name = create_filename("details", "json", report_id)
-        deployments_json_name = create_filename("deployments", "json", report_id)
-        details_csv_name = create_filename("details", "csv", report_id)
-        deployments_csv_name = create_filename("deployments", "csv", report_id)
-        sha256sum_name = create_filename("SHA256SUM", None, report_id)
-
         # map the file names to the file data
-        files_data = {
-            details_json_name: encode_content(details_json, "json"),
-            deployments_json_name: encode_content(deployments_json, "json"),
-            details_csv_name: encode_content(details_csv, "csv"),
-            deployments_csv_name: encode_content(deployments_csv, "csv"),
-        }
-
-        # generate hashes
-        sha256sum_content = ""
-        for full_file_name, content in files_data.items():
-            file_name = full_file_name.rsplit("/", 1)[1]
-            sha256 = hashlib.sha256(content).hexdigest()
-            sha256sum_content += f"{sha256}  {file_name}\n"
-        files_data[sha256sum_name] = encode_content(sha256sum_content, "plaintext")
-
-        tar_buffer = create_tar_buffer(files_data)
-        if tar_buffer is None:
-            logger.error(messages.REPORTS_TAR_ERROR)
-            return None
-        return tar_buffer
+        files = [
+            ("details", "json", [encode_content(details_json, "json")]),
+            ("deployments", "json", [encode_content(deployments_json, "json")]),
+            ("details", "csv", [encode_content(details_csv, "csv")]),
+            ("deployments", "csv", [encode_content(deployments_csv, "csv")]),
+        ]
+        return io.BytesIO(b"".join(stream_reports_tar_gz(report_id, files)))
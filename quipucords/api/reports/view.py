@@ -2,6 +2,7 @@
 
 import logging
 
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils.translation import gettext as _
 from rest_framework import status
@@ -17,12 +18,21 @@ from rest_framework.response import Response
 from rest_framework.serializers import ValidationError
 
 from api import messages
+from api.common.json_stream import buffer_chunks
+from api.common.report_artifacts import (
+    find_report_artifact,
+    read_report_artifact,
+    report_artifact_name,
+)
 from api.common.util import is_int, validate_query_param_bool
-from api.deployments_report.view import build_cached_json_report
-from api.details_report.util import mask_details_facts
+from api.deployments_report.util import stream_deployments_csv
+from api.deployments_report.view import stream_cached_json_report
+from api.details_report.util import stream_details_csv, stream_details_json
 from api.models import DeploymentsReport, DetailsReport
-from api.reports.reports_gzip_renderer import ReportsGzipRenderer
-from api.serializers import DetailsReportSerializer
+from api.reports.reports_gzip_renderer import (
+    ReportsGzipRenderer,
+    stream_reports_tar_gz,
+)
 from api.user.authentication import QuipucordsExpiringTokenAuthentication
 
 logger = logging.getLogger(__name__)
@@ -37,27 +47,24 @@ perm_classes = (IsAuthenticated,)
 @renderer_classes((ReportsGzipRenderer,))
 def reports(request, report_id=None):
     """Lookup and return reports."""
-    reports_dict = {}
     mask_report = request.query_params.get("mask", False)
     if report_id is not None:
         if not is_int(report_id):
             error = {"report_id": [_(messages.COMMON_ID_INV)]}
             raise ValidationError(error)
-    reports_dict["report_id"] = report_id
+    mask_report = validate_query_param_bool(mask_report)
     # details
-    details_data = get_object_or_404(DetailsReport.objects.all(), report_id=report_id)
-    serializer = DetailsReportSerializer(details_data)
-    json_details = serializer.data
-    if validate_query_param_bool(mask_report):
-        json_details = mask_details_facts(json_details)
-    json_details.pop("cached_csv", None)
-    reports_dict["details_json"] = json_details
+    details_data = get_object_or_404(
+        DetailsReport.objects.defer("sources", *DetailsReport.CACHED_FIELDS),
+        report_id=report_id,
+    )
     # deployments
     deployments_data = get_object_or_404(
-        DeploymentsReport.objects.all(), report_id=report_id
+        DeploymentsReport.objects.defer(*DeploymentsReport.CACHED_FIELDS),
+        report_id=report_id,
     )
     if deployments_data.status != DeploymentsReport.STATUS_COMPLETE:
-        deployments_id = deployments_data.details_report.id
+        deployments_id = details_data.id
         return Response(
             {
                 "detail": f"Deployment report {deployments_id} could not be created."
@@ -65,12 +72,43 @@ def reports(request, report_id=None):
             },
             status=status.HTTP_424_FAILED_DEPENDENCY,
         )
-    deployments_report = build_cached_json_report(deployments_data, mask_report)
-    if deployments_report:
-        reports_dict["deployments_json"] = deployments_report
-        return Response(reports_dict)
-    error = {
-        "detail": f"Deployments report {report_id} could not be masked."
-        " Rerun the scan to generate a masked deployments report."
-    }
-    return Response(error, status=status.HTTP_428_PRECONDITION_REQUIRED)
+    deployments_json = stream_cached_json_report(deployments_data, mask_report)
+    # each file is only generated when the client is ready for it
+    files = [
+        _report_file(
+            details_data,
+            "details",
+            "json",
+            mask_report,
+            stream_details_json(details_data, mask_report),
+        ),
+        _report_file(
+            deployments_data, "deployments", "json", mask_report, deployments_json
+        ),
+        _report_file(
+            details_data,
+            "details",
+            "csv",
+            mask_report,
+            stream_details_csv(details_data, mask_report),
+        ),
+        _report_file(
+            deployments_data,
+            "deployments",
+            "csv",
+            mask_report,
+            stream_deployments_csv(deployments_data, mask_report),
+        ),
+    ]
+    return StreamingHttpResponse(
+        stream_reports_tar_gz(report_id, files),
+        content_type=ReportsGzipRenderer.media_type,
+    )
+
+
+def _report_file(report, report_type, file_ext, mask_report, chunks):
+    """Return a file of the reports archive, read from its artifact if precomputed."""
+    name = report_artifact_name(report_type, file_ext, mask_report)
+    if artifact := find_report_artifact(report, name):
+        return report_type, file_ext, read_report_artifact(artifact)
+    return report_type, file_ext, buffer_chunks(chunks)
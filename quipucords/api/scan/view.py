@@ -23,6 +23,7 @@ from rest_framework.viewsets import ModelViewSet
 
 from api import messages
 from api.common.pagination import StandardResultsSetPagination
+from api.common.report_artifacts import delete_report_artifacts
 from api.common.util import expand_scanjob_with_times, is_int
 from api.filters import ListFilter
 from api.models import Scan, ScanJob, ScanTask, Source
@@ -223,7 +224,7 @@ class ScanViewSet(ModelViewSet):
         return Response(json_scan)
 
     @transaction.atomic
-    def destroy(self, request, pk):  # noqa: C901
+    def destroy(self, request, pk):  # noqa: C901, PLR0912
         """Delete a scan, its jobs, and the results."""
         try:
             scan = Scan.objects.get(pk=pk)
@@ -269,6 +270,17 @@ class ScanViewSet(ModelViewSet):
                                 system.delete()
                             task_inspection_result.delete()
 
+                    if job.details_report is not None:
+                        logger.info(
+                            "Deleting report artifacts associated with job %s",
+                            job.id,
+                        )
+                        delete_report_artifacts(job.details_report)
+                        if job.details_report.deployment_report is not None:
+                            delete_report_artifacts(
+                                job.details_report.deployment_report
+                            )
+
                     if job.tasks is not None:
                         logger.info(
                             "Deleting scan tasks associated with job %s", job.id
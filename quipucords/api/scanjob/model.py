@@ -11,6 +11,7 @@ from django.utils.translation import gettext as _
 
 from api import messages
 from api.connresult.model import JobConnectionResult, TaskConnectionResult
+from api.deployments_report.model import SystemFingerprint
 from api.details_report.model import DetailsReport
 from api.inspectresult.model import JobInspectionResult, TaskInspectionResult
 from api.scan.model import (
@@ -197,14 +198,11 @@ class ScanJob(models.Model):
                 inspect_systems_unreachable + connection_systems_unreachable
             )
         self.refresh_from_db()
-        if self.report_id and self.details_report:
-            self.details_report.refresh_from_db()
-
-            if self.details_report.deployment_report:
-
-                system_fingerprint_count = (
-                    self.details_report.deployment_report.system_fingerprints.count()
-                )
+        if self.report_id and self.details_report_id:
+            # counted without loading the (large) details and deployments reports
+            system_fingerprint_count = SystemFingerprint.objects.filter(
+                deployment_report__details_report=self.details_report_id
+            ).count()
 
         return (
             systems_count,
@@ -15,7 +15,7 @@ from rest_framework.response import Response
 from rest_framework.serializers import ValidationError
 
 from api import messages
-from api.common.pagination import StandardResultsSetPagination
+from api.common.pagination import get_results_paginator
 from api.common.util import is_int
 from api.models import Credential, RawFact, ScanJob, ScanTask, Source
 from api.scanjob.serializer import expand_scanjob
@@ -180,7 +180,7 @@ class ScanJobViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
         if source_id_filter:
             ordered_query_set = ordered_query_set.filter(source__id=source_id_filter)
 
-        paginator = StandardResultsSetPagination()
+        paginator = get_results_paginator(request)
         page = paginator.paginate_queryset(ordered_query_set, request)
 
         if page is not None:
@@ -211,7 +211,7 @@ class ScanJobViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
                     system_result_queryset | task_result.systems.all()
                 )
         # create ordered queryset and assign the paginator
-        paginator = StandardResultsSetPagination()
+        paginator = get_results_paginator(request)
         ordered_query_set = system_result_queryset.order_by(ordering_filter)
         if status_filter:
             ordered_query_set = ordered_query_set.filter(status=status_filter)
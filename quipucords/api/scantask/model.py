@@ -12,6 +12,7 @@ from django.utils.translation import gettext as _
 
 from api import messages
 from api.connresult.model import TaskConnectionResult
+from api.deployments_report.model import SystemFingerprint
 from api.details_report.model import DetailsReport
 from api.inspectresult.model import TaskInspectionResult
 from api.scantask.queryset import ScanTaskQuerySet
@@ -107,6 +108,18 @@ class ScanTask(models.Model):
         verbose_name_plural = _(messages.PLURAL_SCAN_TASKS_MSG)
         ordering = ("sequence_number",)
         unique_together = ["job", "scan_type", "source"]
+        indexes = [
+            models.Index(
+                fields=["job", "scan_type", "status"],
+                name="scantask_job_type_status_idx",
+            ),
+            # incomplete tasks are looked up every time a job (re)starts
+            models.Index(
+                fields=["job", "sequence_number"],
+                name="scantask_incomplete_idx",
+                condition=models.Q(status__in=["pending", "running"]),
+            ),
+        ]
 
     # all task types
     def log_current_status(self, show_status_message=False, log_level=logging.INFO):
@@ -143,14 +156,10 @@ class ScanTask(models.Model):
     def _log_fingerprint_stats(self, prefix):
         """Log stats for fingerprinter."""
         system_fingerprint_count = 0
-        if self.details_report:
-            self.details_report.refresh_from_db()
-
-            if self.details_report.deployment_report:
-
-                system_fingerprint_count = (
-                    self.details_report.deployment_report.system_fingerprints.count()
-                )
+        if self.details_report_id:
+            system_fingerprint_count = SystemFingerprint.objects.filter(
+                deployment_report__details_report=self.details_report_id
+            ).count()
         message = f"{prefix} Stats: system_fingerprint_count={system_fingerprint_count}"
         self.log_message(message)
 
@@ -271,6 +280,7 @@ class ScanTask(models.Model):
         increment_sys_failed=False,
         increment_sys_unreachable=False,
         prefix="PROCESSING",
+        amount=1,
     ):
         """Increment scan task stats.
 
@@ -281,16 +291,17 @@ class ScanTask(models.Model):
         :param increment_sys_scanned: True if should be incremented.
         :param increment_sys_failed: True if should be incremented.
         :param increment_sys_unreachable: True if should be incremented.
+        :param amount: How much to increment, for stats of batches of systems.
         """
         update_kwargs = {}
         if increment_sys_count:
-            update_kwargs["systems_count"] = F("systems_count") + 1
+            update_kwargs["systems_count"] = F("systems_count") + amount
         if increment_sys_scanned:
-            update_kwargs["systems_scanned"] = F("systems_scanned") + 1
+            update_kwargs["systems_scanned"] = F("systems_scanned") + amount
         if increment_sys_failed:
-            update_kwargs["systems_failed"] = F("systems_failed") + 1
+            update_kwargs["systems_failed"] = F("systems_failed") + amount
         if increment_sys_unreachable:
-            update_kwargs["systems_unreachable"] = F("systems_unreachable") + 1
+            update_kwargs["systems_unreachable"] = F("systems_unreachable") + amount
 
         if update_kwargs:
             ScanTask.objects.filter(id=self.id).update(**update_kwargs)
@@ -12,7 +12,10 @@ from api.deployments_report.serializer import (
     DeploymentReportSerializer,
     SystemFingerprintSerializer,
 )
-from api.details_report.serializer import DetailsReportSerializer
+from api.details_report.serializer import (
+    DetailsReportSerializer,
+    DetailsReportStreamSerializer,
+)
 from api.inspectresult.serializer import (
     JobInspectionResultSerializer,
     RawFactSerializer,
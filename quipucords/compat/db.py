@@ -61,3 +61,60 @@ class StringAgg:
                 f"StringAgg not implemented for {connection.vendor=}"
             )
         return string_agg_cls(expressions, delimiter, **extra)
+
+
+def iter_json_array(instance, field_name, path=(), without_key=None, chunk_size=100):
+    """Iterate over the elements of a JSON array stored in a model instance field.
+
+    Elements are read from the database in chunks with a server-side cursor where
+    supported, so the whole field never needs to be loaded in memory.
+
+    :param instance: model instance holding the JSON field
+    :param field_name: name of the JSON field
+    :param path: keys and indexes leading to the array inside the field
+    :param without_key: key removed from each element (which must be an object)
+    :param chunk_size: number of elements fetched from the database at once
+    :returns: iterator of JSON encoded elements
+    """
+    model = type(instance)
+    table = connection.ops.quote_name(model._meta.db_table)
+    column = connection.ops.quote_name(model._meta.get_field(field_name).column)
+    pk_column = connection.ops.quote_name(model._meta.pk.column)
+    if connection.vendor == "postgresql":
+        element = "elements.value"
+        params = []
+        if without_key is not None:
+            element = f"({element} - %s)"
+            params.append(without_key)
+        sql = (
+            f"SELECT {element}::text FROM {table} CROSS JOIN LATERAL"
+            f" jsonb_array_elements({table}.{column} #> %s::text[])"
+            " WITH ORDINALITY AS elements(value, position)"
+            f" WHERE {table}.{pk_column} = %s ORDER BY elements.position"
+        )
+        params.extend([[str(key) for key in path], instance.pk])
+    elif connection.vendor == "sqlite":
+        element = "elements.value"
+        params = []
+        if without_key is not None:
+            element = f"json_remove({element}, %s)"
+            params.append(f'$."{without_key}"')
+        sql = (
+            f"SELECT json_quote({element}) FROM {table},"
+            f" json_each({table}.{column}, %s) AS elements"
+            f" WHERE {table}.{pk_column} = %s ORDER BY elements.key"
+        )
+        json_path = "$" + "".join(
+            f"[{key}]" if isinstance(key, int) else f'."{key}"' for key in path
+        )
+        params.extend([json_path, instance.pk])
+    else:
+        raise NotImplementedError(
+            f"iter_json_array not implemented for {connection.vendor=}"
+        )
+
+    with connection.chunked_cursor() as cursor:
+        cursor.execute(sql, params)
+        while rows := cursor.fetchmany(chunk_size):
+            for (row,) in rows:
+                yield row
@@ -1,11 +1,187 @@
 """quipucords/requests compat/utility adapters."""
 
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from http import HTTPStatus
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from threading import Lock
 from urllib.parse import urljoin
 
 import requests
 from django.conf import settings
+from requests.structures import CaseInsensitiveDict
 from urllib3 import Retry
 
+# headers a cached response is revalidated with, by the header they are taken from
+CONDITIONAL_HEADERS = {"ETag": "If-None-Match", "Last-Modified": "If-Modified-Since"}
+# Cache-Control directives of responses that must not be stored on disk; the cache
+# is private to a source and credential, so responses marked private are stored
+UNCACHEABLE_DIRECTIVES = {"no-store"}
+
+
+@dataclass
+class CachedResponse:
+    """A response stored in a ResponseCache."""
+
+    url: str
+    status_code: int
+    headers: dict
+    encoding: str | None
+    content: bytes
+
+    def conditional_headers(self) -> dict:
+        """Return the headers asking the server whether this response changed."""
+        return {
+            conditional_header: self.headers[header]
+            for header, conditional_header in CONDITIONAL_HEADERS.items()
+            if header in self.headers
+        }
+
+
+class ResponseCache:
+    """
+    On-disk cache of responses revalidated with conditional requests.
+
+    Responses with an ETag or Last-Modified header are stored under a directory of
+    their own for each namespace (e.g. a source and its credential), so responses
+    are never shared between sources or users. Responses marked no-store by their
+    Cache-Control header are never stored. Entries past max_age seconds are
+    ignored, and evict removes them along with the least recently used entries of
+    all namespaces until the whole cache fits in max_size bytes.
+
+    Only requests sent through Session can use the cache, which leaves out the
+    OpenShift scanner: its kubernetes client sends requests with its own urllib3
+    pool manager.
+    """
+
+    def __init__(self, namespace, directory=None, max_size=None, max_age=None):
+        """
+        Initialize the class.
+
+        :param namespace: string identifying whose responses are cached
+        :param directory: root directory of the cache. Defaults to
+            settings.QPC_HTTP_CACHE_DIRECTORY
+        :param max_size: maximum size in bytes of the whole cache. Defaults to
+            settings.QPC_HTTP_CACHE_MAX_SIZE
+        :param max_age: seconds after which a response is no longer used. Defaults
+            to settings.QPC_HTTP_CACHE_MAX_AGE
+        """
+        self.root = Path(directory or settings.QPC_HTTP_CACHE_DIRECTORY)
+        self.directory = self.root / self._hash(namespace)
+        self.max_size = max_size or settings.QPC_HTTP_CACHE_MAX_SIZE
+        self.max_age = max_age or settings.QPC_HTTP_CACHE_MAX_AGE
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self._lock = Lock()
+
+    @staticmethod
+    def _hash(value: str) -> str:
+        return hashlib.sha256(value.encode()).hexdigest()
+
+    def _paths(self, url) -> tuple[Path, Path]:
+        """Return the paths of the metadata and content files of a url."""
+        key = self._hash(url)
+        return self.directory / f"{key}.json", self.directory / f"{key}.body"
+
+    def get(self, url) -> CachedResponse | None:
+        """Return the cached response of a url, if there's one still fresh."""
+        metadata_path, content_path = self._paths(url)
+        try:
+            if time.time() - metadata_path.stat().st_mtime > self.max_age:
+                return None
+            metadata = json.loads(metadata_path.read_text())
+            content = content_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        if metadata["url"] != url or len(content) != metadata["length"]:
+            return None
+        return CachedResponse(
+            url=url,
+            status_code=metadata["status_code"],
+            headers=CaseInsensitiveDict(metadata["headers"]),
+            encoding=metadata["encoding"],
+            content=content,
+        )
+
+    def set(self, url, response: requests.Response):
+        """Store a response, if the server sent headers to revalidate it with."""
+        if not any(header in response.headers for header in CONDITIONAL_HEADERS):
+            return
+        cache_control = response.headers.get("Cache-Control", "")
+        directives = {
+            directive.split("=")[0].strip().lower()
+            for directive in cache_control.split(",")
+        }
+        if directives & UNCACHEABLE_DIRECTIVES:
+            return
+        metadata_path, content_path = self._paths(url)
+        metadata = {
+            "url": url,
+            "status_code": response.status_code,
+            "headers": dict(response.headers),
+            "encoding": response.encoding,
+            "length": len(response.content),
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # metadata is written last: a partially written entry is never used
+        self._write(content_path, response.content)
+        self._write(metadata_path, json.dumps(metadata).encode())
+
+    def _write(self, path: Path, data: bytes):
+        """Write a file atomically so concurrent readers never see it partially."""
+        with NamedTemporaryFile(dir=path.parent, delete=False) as temp_file:
+            temp_file.write(data)
+        os.replace(temp_file.name, path)
+
+    def record_hit(self, cached_response: CachedResponse):
+        """Count a response served from the cache and the bytes it saved."""
+        metadata_path, _ = self._paths(cached_response.url)
+        # touching the metadata keeps recently used entries from eviction
+        metadata_path.touch()
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += len(cached_response.content)
+
+    def record_miss(self):
+        """Count a response downloaded in full."""
+        with self._lock:
+            self.misses += 1
+
+    def evict(self):
+        """Remove stale entries, then the least recently used ones past max_size."""
+        entries = []
+        for metadata_path in self.root.glob("*/*.json"):
+            content_path = metadata_path.with_suffix(".body")
+            try:
+                stat = metadata_path.stat()
+                size = stat.st_size + content_path.stat().st_size
+            except OSError:
+                metadata_path.unlink(missing_ok=True)
+                content_path.unlink(missing_ok=True)
+                continue
+            entries.append((stat.st_mtime, size, metadata_path, content_path))
+
+        entries.sort(reverse=True)
+        oldest_allowed = time.time() - self.max_age
+        total_size = 0
+        for modified, size, metadata_path, content_path in entries:
+            total_size += size
+            if modified < oldest_allowed or total_size > self.max_size:
+                metadata_path.unlink(missing_ok=True)
+                content_path.unlink(missing_ok=True)
+
+    def summary(self) -> str:
+        """Return a human readable summary of the cache usage."""
+        return (
+            f"HTTP response cache: {self.hits} hits, {self.misses} misses,"
+            f" {self.bytes_saved} bytes saved."
+        )
+
 
 class Session(requests.Session):
     """
@@ -26,6 +202,9 @@ class Session(requests.Session):
         max_retries=None,
         backoff_factor=None,
         retry_on_status_code_list=None,
+        raise_on_status=True,
+        pool_maxsize=None,
+        cache: ResponseCache = None,
     ):
         """
         Initialize the class.
@@ -37,6 +216,11 @@ class Session(requests.Session):
         :param backoff_factor: backoff factor for automatic retries
         :param retry_on_status_code_list: list of status codes eligible for automatic
             retry. Defaults to DEFAULT_STATUS_CODE_LIST_FOR_RETRY`
+        :param raise_on_status: raise RetryError when retries on status codes are
+            exhausted; if False, the last response is returned instead
+        :param pool_maxsize: maximum number of connections kept alive per host
+        :param cache: ResponseCache revalidating GET responses instead of downloading
+            them again when they didn't change
 
         [1]: https://requests.readthedocs.io/en/latest/user/authentication/#authentication
         """  # noqa: E501
@@ -44,6 +228,10 @@ class Session(requests.Session):
         self.verify = verify
         self.base_url = base_url
         self.auth = auth
+        self.cache = cache
+        adapter_kwargs = {}
+        if pool_maxsize:
+            adapter_kwargs["pool_maxsize"] = pool_maxsize
         if max_retries is None:
             max_retries = settings.QPC_HTTP_RETRY_MAX_NUMBER
         if max_retries > 0:
@@ -51,18 +239,19 @@ class Session(requests.Session):
             retry_on_status_code_list = (
                 retry_on_status_code_list or self.DEFAULT_STATUS_CODE_LIST_FOR_RETRY
             )
-            adapter = requests.adapters.HTTPAdapter(
-                max_retries=Retry(
-                    max_retries,
-                    status_forcelist=retry_on_status_code_list,
-                    backoff_factor=backoff_factor,
-                )
+            adapter_kwargs["max_retries"] = Retry(
+                max_retries,
+                status_forcelist=retry_on_status_code_list,
+                backoff_factor=backoff_factor,
+                raise_on_status=raise_on_status,
             )
+        if adapter_kwargs:
+            adapter = requests.adapters.HTTPAdapter(**adapter_kwargs)
             self.mount("http://", adapter)
             self.mount("https://", adapter)
 
     def request(
-        self, method, url, *, raise_for_status=False, **kwargs
+        self, method, url, *, raise_for_status=False, cache=None, **kwargs
     ) -> requests.Response:
         """
         Prepare and send a request.
@@ -72,11 +261,54 @@ class Session(requests.Session):
         :param method: The HTTP method to use
         :param url: The URL to send the request to. This can be relative to the base URL
         :param raise_for_status: (optional) call Response method "raise_for_status".
+        :param cache: (optional) ResponseCache used instead of the session's one,
+            for sessions shared by several sources or users.
         :param **kwargs: same keyword arguments used on parent class request method.
         :returns: `requests.Response`
         """
         request_url = urljoin(self.base_url, url)
-        response = super().request(method, request_url, **kwargs)
+        cache = cache or self.cache
+        if cache and method.upper() == "GET" and not kwargs.get("stream"):
+            response = self._cached_request(cache, method, request_url, **kwargs)
+        else:
+            response = super().request(method, request_url, **kwargs)
         if raise_for_status:
             response.raise_for_status()
         return response
+
+    def _cached_request(
+        self, cache: ResponseCache, method, url, **kwargs
+    ) -> requests.Response:
+        """Send a request, revalidating the cached response of its url if any."""
+        prepared_request = requests.PreparedRequest()
+        prepared_request.prepare_url(url, kwargs.get("params"))
+        cache_url = prepared_request.url
+        cached_response = cache.get(cache_url)
+        if cached_response:
+            kwargs["headers"] = {
+                **cached_response.conditional_headers(),
+                **(kwargs.get("headers") or {}),
+            }
+        response = super().request(method, url, **kwargs)
+        if cached_response and response.status_code == requests.codes.not_modified:
+            cache.record_hit(cached_response)
+            return self._restore_response(cached_response, response)
+        cache.record_miss()
+        if response.status_code == requests.codes.ok:
+            cache.set(cache_url, response)
+        return response
+
+    def _restore_response(
+        self, cached_response: CachedResponse, not_modified: requests.Response
+    ) -> requests.Response:
+        """Turn a 304 Not Modified response into the cached response."""
+        headers = CaseInsensitiveDict(cached_response.headers)
+        for header in CONDITIONAL_HEADERS:
+            if header in not_modified.headers:
+                headers[header] = not_modified.headers[header]
+        not_modified.status_code = cached_response.status_code
+        not_modified.reason = HTTPStatus(cached_response.status_code).phrase
+        not_modified.headers = headers
+        not_modified.encoding = cached_response.encoding
+        not_modified._content = cached_response.content
+        return not_modified
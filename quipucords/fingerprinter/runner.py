@@ -15,7 +15,6 @@ from api.common.util import (
     is_boolean,
     is_float,
     is_int,
-    mask_data_general,
 )
 from api.models import DeploymentsReport, Product, ScanTask, SystemFingerprint
 from api.serializers import SystemFingerprintSerializer
@@ -75,9 +74,6 @@ RAW_DATE_KEYS = dict(
     ]
 )
 
-MAC_AND_IP_FACTS = ["ip_addresses", "mac_addresses"]
-NAME_RELATED_FACTS = ["name", "vm_dns_name", "virtual_host_name"]
-
 # Fingerprint keys
 COMBINED_KEY = "combined_fingerprints"
 
@@ -247,10 +243,8 @@ class FingerprintTaskRunner(ScanTaskRunner):
             self.scan_task.log_message(status_message, log_level=logging.ERROR)
             deployment_report.status = DeploymentsReport.STATUS_FAILED
             status = ScanTask.FAILED
+        # masked reports are derived from these fingerprints when downloaded
         deployment_report.cached_fingerprints = final_fingerprint_list
-        deployment_report.cached_masked_fingerprints = mask_data_general(
-            deepcopy(final_fingerprint_list), MAC_AND_IP_FACTS, NAME_RELATED_FACTS
-        )
         deployment_report.save()
         self.scan_task.log_message(
             f"RESULTS (report id={deployment_report.report_id}) -  "
@@ -79,8 +79,30 @@ NETWORK_CONNECT_JOB_TIMEOUT = env.int("NETWORK_CONNECT_JOB_TIMEOUT", 600)  # 10
 QPC_CONNECT_TASK_TIMEOUT = env.int("QPC_CONNECT_TASK_TIMEOUT", 30)
 QPC_INSPECT_TASK_TIMEOUT = env.int("QPC_INSPECT_TASK_TIMEOUT", 600)
 
+# data volume shared by the server and the celery worker
+QPC_DATA_DIRECTORY = Path(env.str("QPC_DATA_DIRECTORY", str(BASE_DIR)))
+
 QPC_HTTP_RETRY_MAX_NUMBER = env.int("QPC_HTTP_RETRY_MAX_NUMBER", 5)
 QPC_HTTP_RETRY_BACKOFF = env.float("QPC_HTTP_RETRY_BACKOFF", 0.1)
+QPC_HTTP_CACHE_DIRECTORY = Path(
+    env.str("QPC_HTTP_CACHE_DIRECTORY", str(QPC_DATA_DIRECTORY / "http_cache"))
+)
+QPC_HTTP_CACHE_MAX_SIZE = env.int("QPC_HTTP_CACHE_MAX_SIZE", 512 * 1024 * 1024)
+QPC_HTTP_CACHE_MAX_AGE = env.int("QPC_HTTP_CACHE_MAX_AGE", 7 * 24 * 60 * 60)
+QPC_REPORT_ARTIFACTS_DIRECTORY = Path(
+    env.str(
+        "QPC_REPORT_ARTIFACTS_DIRECTORY", str(QPC_DATA_DIRECTORY / "report_artifacts")
+    )
+)
+# gzip level (1-9) of the csv reports cached in the database
+QPC_CACHED_REPORTS_COMPRESSION = env.int("QPC_CACHED_REPORTS_COMPRESSION", 6)
+
+QPC_VCENTER_MAX_OBJECTS_PER_PAGE = env.int("QPC_VCENTER_MAX_OBJECTS_PER_PAGE", 1000)
+QPC_VCENTER_SAVE_BATCH_SIZE = env.int("QPC_VCENTER_SAVE_BATCH_SIZE", 200)
+QPC_VCENTER_MAX_CONCURRENT_DATACENTERS = env.int(
+    "QPC_VCENTER_MAX_CONCURRENT_DATACENTERS", 4
+)
+QPC_OPENSHIFT_LIST_LIMIT = env.int("QPC_OPENSHIFT_LIST_LIMIT", 500)
 
 ANSIBLE_LOG_LEVEL = env.int("ANSIBLE_LOG_LEVEL", 3)
 
@@ -407,6 +429,20 @@ QPC_DISABLE_MULTIPROCESSING_SCAN_JOB_RUNNER = env.bool(
     "QPC_DISABLE_MULTIPROCESSING_SCAN_JOB_RUNNER", False
 )
 QPC_ENABLE_CELERY_SCAN_MANAGER = env.bool("QPC_ENABLE_CELERY_SCAN_MANAGER", False)
+QPC_MAX_CONCURRENT_SCAN_JOBS = env.int("QPC_MAX_CONCURRENT_SCAN_JOBS", 1)
+QPC_MAX_CONCURRENT_VCENTER_SOURCES = env.int("QPC_MAX_CONCURRENT_VCENTER_SOURCES", 1)
+QPC_ENABLE_SATELLITE_THREADED_INSPECTOR = env.bool(
+    "QPC_ENABLE_SATELLITE_THREADED_INSPECTOR", False
+)
+QPC_ENABLE_SATELLITE_BULK_HOST_FIELDS = env.bool(
+    "QPC_ENABLE_SATELLITE_BULK_HOST_FIELDS", False
+)
+QPC_ENABLE_VCENTER_COMBINED_SCAN = env.bool("QPC_ENABLE_VCENTER_COMBINED_SCAN", False)
+QPC_ENABLE_ANSIBLE_INCREMENTAL_JOBS = env.bool(
+    "QPC_ENABLE_ANSIBLE_INCREMENTAL_JOBS", False
+)
+QPC_ENABLE_HTTP_RESPONSE_CACHE = env.bool("QPC_ENABLE_HTTP_RESPONSE_CACHE", False)
+QPC_ENABLE_REPORT_ARTIFACTS = env.bool("QPC_ENABLE_REPORT_ARTIFACTS", False)
 
 # Old hidden/buried configurations that should be removed or renamed
 MAX_TIMEOUT_ORDERLY_SHUTDOWN = env.int("MAX_TIMEOUT_ORDERLY_SHUTDOWN", 30)
@@ -1,5 +1,6 @@
 """ansible controller api adapter."""
 
+from collections import deque
 from concurrent import futures
 from copy import deepcopy
 from logging import getLogger
@@ -7,7 +8,7 @@ from math import ceil
 
 from requests.auth import HTTPBasicAuth
 
-from compat.requests import Session
+from compat.requests import ResponseCache, Session
 
 logger = getLogger(__name__)
 
@@ -17,7 +18,15 @@ class AnsibleControllerApi(Session):
 
     @classmethod
     def from_connection_info(  # noqa: PLR0913
-        cls, *, host, protocol, port, username, password, ssl_verify: bool = True
+        cls,
+        *,
+        host,
+        protocol,
+        port,
+        username,
+        password,
+        ssl_verify: bool = True,
+        cache: ResponseCache = None,
     ):
         """
         Initialize AnsibleController session.
@@ -28,13 +37,20 @@ class AnsibleControllerApi(Session):
         :param username: The username to use for connecting to the server.
         :param password: The password to use for connecting to the server.
         :param ssl_verify: Whether to verify the SSL certificate.
+        :param cache: ResponseCache for the responses of the server.
         """
         base_uri = f"{protocol}://{host}:{port}"
         auth = HTTPBasicAuth(username=username, password=password)
-        return cls(base_url=base_uri, verify=ssl_verify, auth=auth)
+        return cls(base_url=base_uri, verify=ssl_verify, auth=auth, cache=cache)
 
-    def get_paginated_results(self, url, max_concurrency=1, **kwargs):
-        """Get a generator with results from a paginated endpoint."""
+    def get_paginated_results(self, url, max_concurrency=1, ordered=False, **kwargs):
+        """Get a generator with results from a paginated endpoint.
+
+        :param url: url of the paginated endpoint
+        :param max_concurrency: maximum number of pages requested at the same time,
+            which is also the number of pages held ahead of the consumer
+        :param ordered: yield results in page order instead of as pages arrive
+        """
         # paginated responses on ansible controller api always are always like this
         # { "count": 99, "next": null, "previous": null, "results": [ ... ] }
         kwargs.setdefault("raise_for_status", True)
@@ -43,7 +59,9 @@ class AnsibleControllerApi(Session):
         yield from first_page["results"]
         if first_page["next"]:
             page_kwargs = self._get_page_params(kwargs, first_page)
-            yield from self._get_pages_in_parallel(url, max_concurrency, page_kwargs)
+            yield from self._get_pages_in_parallel(
+                url, max_concurrency, page_kwargs, ordered
+            )
 
     def _get_page_params(self, kwargs, first_page):
         page_size = len(first_page["results"])
@@ -58,11 +76,33 @@ class AnsibleControllerApi(Session):
         kwargs["params"].update(**params)
         return kwargs
 
-    def _get_pages_in_parallel(self, url, max_concurrency, page_kwargs):
+    def _get_pages_in_parallel(self, url, max_concurrency, page_kwargs, ordered=False):
+        """Get pages through a sliding window of up to max_concurrency requests.
+
+        A page is only requested when the consumer is done with a page of the
+        window, so at most max_concurrency pages are held in memory besides the
+        one being consumed.
+        """
+        page_kwargs = iter(page_kwargs)
+        window = deque()
         with futures.ThreadPoolExecutor(max_workers=max_concurrency) as executor:
-            future_to_page = {
-                executor.submit(self.get, url, **kwargs) for kwargs in page_kwargs
-            }
-            for future_page in futures.as_completed(future_to_page):
-                data = future_page.result()
-                yield from data.json()["results"]
+            try:
+                while True:
+                    while (
+                        len(window) < max_concurrency
+                        and (kwargs := next(page_kwargs, None)) is not None
+                    ):
+                        window.append(executor.submit(self.get, url, **kwargs))
+                    if not window:
+                        break
+                    if ordered:
+                        future_page = window.popleft()
+                    else:
+                        futures.wait(window, return_when=futures.FIRST_COMPLETED)
+                        future_page = next(page for page in window if page.done())
+                        window.remove(future_page)
+                    data = future_page.result()
+                    yield from data.json()["results"]
+            finally:
+                for future_page in window:
+                    future_page.cancel()
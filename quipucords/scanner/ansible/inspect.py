@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+from concurrent import futures
 from logging import getLogger
+from typing import Iterable
 
 from django.conf import settings
 from django.db import transaction
@@ -32,6 +34,8 @@ class InspectTaskRunner(AnsibleTaskRunner):
         "name",
         "status",
     ]
+    # statuses of jobs that may still run on more hosts
+    UNFINISHED_JOB_STATUSES = {"new", "pending", "waiting", "running"}
     REQUEST_KWARGS = {
         "raise_for_status": True,
         "timeout": settings.QPC_INSPECT_TASK_TIMEOUT,
@@ -103,26 +107,108 @@ class InspectTaskRunner(AnsibleTaskRunner):
         data["system_name"] = data.get("active_node") or self.system_name
         return data
 
-    def get_jobs(self) -> list[dict]:
+    def get_jobs(self) -> dict:
         """
         Retrieve all job ids and unique hosts.
 
-        :param client: AnsibleControllerApi to use for API calls
-        :returns: a dictionary with job ids and unique hosts.
+        With QPC_ENABLE_ANSIBLE_INCREMENTAL_JOBS, only jobs newer than the ones of the
+        last successful inspection of this source are retrieved, and added to its
+        job ids and unique hosts. Jobs that were unfinished then are retrieved
+        again, since they may have run on more hosts since.
+
+        :returns: a dictionary with job ids, the ids of unfinished jobs and unique
+            hosts.
         """
+        job_ids = []
+        unfinished_job_ids = []
+        unique_hosts = set()
+        request_kwargs = dict(self.REQUEST_KWARGS)
+        if settings.QPC_ENABLE_ANSIBLE_INCREMENTAL_JOBS and (
+            previous_jobs := self.get_previous_jobs()
+        ):
+            previous_unfinished_job_ids = previous_jobs.get("unfinished_job_ids", [])
+            job_ids = [
+                job_id
+                for job_id in previous_jobs["job_ids"]
+                if job_id not in previous_unfinished_job_ids
+            ]
+            unique_hosts = set(previous_jobs["unique_hosts"])
+            if previous_unfinished_job_ids:
+                request_kwargs["params"] = {
+                    "id__gt": min(previous_unfinished_job_ids) - 1
+                }
+            elif job_ids:
+                request_kwargs["params"] = {"id__gt": max(job_ids)}
+            logger.info(
+                "Retrieving ansible jobs newer than the %d finished jobs already"
+                " inspected.",
+                len(job_ids),
+            )
+        finished_job_ids = set(job_ids)
+
         jobs_generator = self.client.get_paginated_results(
             "/api/v2/jobs/",
             max_concurrency=self.max_concurrency,
-            **self.REQUEST_KWARGS,
+            **request_kwargs,
         )
-        job_ids = []
+
+        def _new_job_ids():
+            for job in jobs_generator:
+                if job["id"] in finished_job_ids:
+                    continue
+                job_ids.append(job["id"])
+                if job.get("status") in self.UNFINISHED_JOB_STATUSES:
+                    unfinished_job_ids.append(job["id"])
+                yield job["id"]
+
+        unique_hosts |= self.get_hosts_from_jobs_events(_new_job_ids())
+        return {
+            "job_ids": sorted(job_ids),
+            "unfinished_job_ids": unfinished_job_ids,
+            "unique_hosts": unique_hosts,
+        }
+
+    def get_previous_jobs(self) -> dict | None:
+        """Get the jobs fact of the last successful inspection of this source."""
+        return (
+            RawFact.objects.filter(
+                name="jobs",
+                system_inspection_result__source=self.scan_task.source,
+                system_inspection_result__status=SystemInspectionResult.SUCCESS,
+                system_inspection_result__task_inspection_result__scantask__status=(
+                    ScanTask.COMPLETED
+                ),
+            )
+            .exclude(
+                system_inspection_result__task_inspection_result=(
+                    self.scan_task.inspection_result
+                )
+            )
+            .order_by("-id")
+            .values_list("value", flat=True)
+            .first()
+        )
+
+    def get_hosts_from_jobs_events(self, job_ids: Iterable[int]) -> set:
+        """Get unique hosts found in the events of many jobs.
+
+        Events of up to max_concurrency jobs are retrieved at the same time, and
+        job ids are consumed as requests complete so they can be streamed.
+        """
         unique_hosts = set()
-        # ignoring pagination
-        for job in jobs_generator:
-            job_id = job["id"]
-            job_ids.append(job_id)
-            unique_hosts |= self.get_hosts_from_job_events(job_id)
-        return {"job_ids": job_ids, "unique_hosts": unique_hosts}
+        with futures.ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            pending = set()
+            for job_id in job_ids:
+                if len(pending) >= self.max_concurrency:
+                    done, pending = futures.wait(
+                        pending, return_when=futures.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        unique_hosts |= future.result()
+                pending.add(executor.submit(self.get_hosts_from_job_events, job_id))
+            for future in futures.as_completed(pending):
+                unique_hosts |= future.result()
+        return unique_hosts
 
     def get_hosts_from_job_events(self, job_id) -> set:
         """Get unique hosts found in job events."""
@@ -3,8 +3,11 @@
 from abc import ABCMeta
 from functools import cached_property
 
+from django.conf import settings
+
 from api.models import ScanJob, ScanTask
 from api.vault import decrypt_data_as_unicode
+from compat.requests import ResponseCache
 from scanner.ansible.api import AnsibleControllerApi
 from scanner.runner import ScanTaskRunner
 
@@ -17,6 +20,15 @@ class AnsibleTaskRunner(ScanTaskRunner, metaclass=ABCMeta):
         super().__init__(scan_job, scan_task)
         self.client = self.get_client(self.scan_task)
 
+    def run(self, manager_interrupt=None):
+        """Run the task, then report how the response cache was used."""
+        try:
+            return super().run(manager_interrupt)
+        finally:
+            if self.client.cache:
+                self.log(self.client.cache.summary())
+                self.client.cache.evict()
+
     @cached_property
     def system_name(self):
         """Returns the system name of the scan."""
@@ -53,8 +65,17 @@ class AnsibleTaskRunner(ScanTaskRunner, metaclass=ABCMeta):
             "protocol": "https" if ssl_enabled else "http",
             "ssl_verify": ssl_verify,
             "username": credential.username,
+            "cache": cls._get_response_cache(scan_task),
         }
 
+    @classmethod
+    def _get_response_cache(cls, scan_task: ScanTask):
+        """Get the ResponseCache of the source and credential, if enabled."""
+        if not settings.QPC_ENABLE_HTTP_RESPONSE_CACHE:
+            return None
+        credential = scan_task.source.single_credential
+        return ResponseCache(f"{scan_task.source.id}:{credential.id}")
+
     @classmethod
     def get_client(cls, scan_task: ScanTask) -> AnsibleControllerApi:
         """
@@ -4,11 +4,15 @@ from __future__ import annotations
 
 import logging
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
 from multiprocessing import Process, Value
 
 import celery
 from celery.result import AsyncResult
 from django.conf import settings
+from django.db import connections
+from more_itertools import chunked
 
 from api.common.common_report import create_report_version
 from api.details_report.util import (
@@ -17,12 +21,16 @@ from api.details_report.util import (
     validate_details_report_json,
 )
 from api.models import ScanJob, ScanTask
+from api.reports.artifacts import precompute_report_artifacts
+from constants import DataSources
 from fingerprinter.runner import FingerprintTaskRunner
 from scanner.get_scanner import get_scanner
 from scanner.runner import ScanTaskRunner
 
 logger = logging.getLogger(__name__)
 
+FINALIZE_SCAN_TASK_NAME = "finalize"
+
 
 def get_task_runner_class(scan_task: ScanTask):
     """Get the appropriate ScanTaskRunner class for the ScanTask."""
@@ -62,6 +70,56 @@ def get_task_runners_for_job(
     return task_runners, fingerprint_task_runner
 
 
+def group_task_runners(
+    task_runners: list[ScanTaskRunner],
+) -> list[list[ScanTaskRunner]]:
+    """Group the task runners that may run at the same time.
+
+    Consecutive vCenter task runners of the same scan type are grouped by up to
+    QPC_MAX_CONCURRENT_VCENTER_SOURCES. Any other task runner is alone in its group.
+    """
+    max_sources = max(settings.QPC_MAX_CONCURRENT_VCENTER_SOURCES, 1)
+
+    def group_key(runner: ScanTaskRunner):
+        if (
+            max_sources > 1
+            and runner.scan_task.source.source_type == DataSources.VCENTER
+        ):
+            return runner.scan_task.scan_type
+        return id(runner)
+
+    return [
+        runner_group
+        for _, runners in groupby(task_runners, group_key)
+        for runner_group in chunked(runners, max_sources)
+    ]
+
+
+class TaskInterrupt:
+    """manager_interrupt of one of several task runners running at the same time.
+
+    Task runners acknowledge an interrupt by setting its value. The acknowledgement
+    is kept to this object so the other task runners still get interrupted.
+    """
+
+    def __init__(self, manager_interrupt: Value):
+        """Wrap the manager_interrupt shared by the task runners."""
+        self.manager_interrupt = manager_interrupt
+        self._value = None
+
+    @property
+    def value(self) -> int:
+        """Get the interrupt value, unless this task runner acknowledged it."""
+        if self._value is not None:
+            return self._value
+        return self.manager_interrupt.value
+
+    @value.setter
+    def value(self, value: int):
+        """Set the interrupt value of this task runner only."""
+        self._value = value
+
+
 def create_details_report_for_scan_job(scan_job: ScanJob):
     """Create and save a DetailsReport if the ScanJob's ScanTasks have valid Sources.
 
@@ -133,6 +191,9 @@ def run_task_runner(runner: ScanTaskRunner, *run_args):
         runner.scan_task.status_complete(status_message)
     elif task_status == ScanTask.FAILED:
         runner.scan_task.status_fail(status_message)
+    elif task_status == ScanTask.RUNNING and runner.celery_continuation:
+        # The runner's celery_continuation will set the final status.
+        pass
     else:
         error_message = (
             f"ScanTask {runner.scan_task.sequence_number:d} failed."
@@ -199,17 +260,17 @@ class CeleryBasedScanJobRunner:
         )
 
         # Get and group relevant IDs and types for Celery tasks to fetch later.
-        incomplete_scan_tasks = self.scan_job.tasks.filter(
-            status__in=[ScanTask.RUNNING, ScanTask.PENDING],
-            scan_type__in=[ScanTask.SCAN_TYPE_CONNECT, ScanTask.SCAN_TYPE_INSPECT],
-        ).order_by("source_id", "sequence_number")
         celery_signatures_by_source = defaultdict(list)
-        for scan_task in incomplete_scan_tasks:
+        for scan_task in self.get_incomplete_scan_tasks().exclude(
+            scan_type=ScanTask.SCAN_TYPE_FINGERPRINT
+        ):
             source_id = scan_task.source_id
             scan_task_id = scan_task.id
             source_type = scan_task.source.source_type
             scan_type = scan_task.scan_type
-            signature = celery_run_task_runner.si(scan_task_id, source_type, scan_type)
+            signature = celery_run_task_runner.si(
+                scan_task_id, source_type, scan_type
+            ).set(task_id=self.get_celery_task_id(scan_task_id))
             celery_signatures_by_source[source_id].append(signature)
 
         # Start a chain with a group that contains n chains, one chain for each Source.
@@ -222,17 +283,49 @@ class CeleryBasedScanJobRunner:
         # Optionally add a link to the chain for fingerprinting.
         # By convention, there should always be 0 or 1 fingerprint ScanTask per ScanJob,
         # and if a fingerprint ScanTask does not exist, it does not need to run.
-        if scan_task := ScanTask.objects.filter(
-            job__id=self.scan_job.id,
-            scan_type=ScanTask.SCAN_TYPE_FINGERPRINT,
-            status__in=[ScanTask.RUNNING, ScanTask.PENDING],
-        ).first():
-            task_chain |= fingerprint.si(scan_task.id)
+        if (
+            scan_task := self.get_incomplete_scan_tasks()
+            .filter(scan_type=ScanTask.SCAN_TYPE_FINGERPRINT)
+            .first()
+        ):
+            task_chain |= fingerprint.si(scan_task.id).set(
+                task_id=self.get_celery_task_id(scan_task.id)
+            )
 
         # Add a final post-processing task to the chain.
-        task_chain |= finalize_scan.si(self.scan_job.id)
+        task_chain |= finalize_scan.si(self.scan_job.id).set(
+            task_id=self.get_celery_task_id(FINALIZE_SCAN_TASK_NAME)
+        )
         return task_chain.apply_async()
 
+    def get_incomplete_scan_tasks(self):
+        """Get the ScanTasks that are left to run, in the order they should run."""
+        return self.scan_job.tasks.filter(
+            status__in=[ScanTask.RUNNING, ScanTask.PENDING]
+        ).order_by("source_id", "sequence_number")
+
+    def get_celery_task_id(self, name: int | str) -> str:
+        """Get a predictable Celery task ID for this run of the ScanJob.
+
+        The scan job's start time changes every time it is restarted, so task IDs of
+        a previous run, which Celery workers remember after being revoked, are never
+        reused.
+
+        :param name: the ScanTask id, or the name of the job-wide task
+        """
+        run_id = self.scan_job.start_time.strftime("%Y%m%d%H%M%S%f")
+        return f"scanjob-{self.scan_job.id}-{run_id}-{name}"
+
+    def get_celery_task_ids(self) -> list[str]:
+        """Get the Celery task IDs that have yet to complete for this ScanJob."""
+        if not self.scan_job.start_time:
+            return []
+        scan_task_ids = self.get_incomplete_scan_tasks().values_list("id", flat=True)
+        return [
+            self.get_celery_task_id(name)
+            for name in [*scan_task_ids, FINALIZE_SCAN_TASK_NAME]
+        ]
+
 
 class ProcessBasedScanJobRunner(Process):
     """Execute a group of scan tasks in a separate process."""
@@ -244,6 +337,15 @@ class ProcessBasedScanJobRunner(Process):
         self.identifier = scan_job.id
         self.manager_interrupt = Value("i", ScanJob.JOB_RUN)
 
+    def start(self):
+        """Start the job process without sharing the parent's database connections.
+
+        Several job processes may run at the same time, and each one must open its
+        own database connections instead of reusing the forked ones.
+        """
+        connections.close_all()
+        super().start()
+
     def run(self):
         """Trigger process execution."""
         agnostic_runner = SyncScanJobRunner(self.scan_job, self.manager_interrupt)
@@ -317,17 +419,19 @@ class SyncScanJobRunner:
         task_runners, fingerprint_task_runner = get_task_runners_for_job(self.scan_job)
 
         failed_tasks = []
-        for runner in task_runners:
+        for runner_group in group_task_runners(task_runners):
             if interrupt_status := self.check_manager_interrupt():
                 return interrupt_status
-            task_status = run_task_runner(runner, self.manager_interrupt)
+            task_statuses = self.run_task_runners(runner_group)
 
-            if task_status == ScanTask.FAILED:
-                # Task did not complete successfully
-                failed_tasks.append(runner.scan_task)
-            elif task_status != ScanTask.COMPLETED:
-                # something went wrong or cancel/pause
-                return task_status
+            for runner, task_status in zip(runner_group, task_statuses):
+                if task_status == ScanTask.FAILED:
+                    # Task did not complete successfully
+                    failed_tasks.append(runner.scan_task)
+            for task_status in task_statuses:
+                if task_status not in [ScanTask.COMPLETED, ScanTask.FAILED]:
+                    # something went wrong or cancel/pause
+                    return task_status
 
         if self.scan_job.scan_type != ScanTask.SCAN_TYPE_CONNECT:
             if not (details_report := fingerprint_task_runner.scan_task.details_report):
@@ -376,6 +480,7 @@ class SyncScanJobRunner:
                 self.scan_job.log_message(
                     f"Report {self.scan_job.report_id:d} created."
                 )
+                precompute_report_artifacts(self.scan_job.report_id)
 
         if failed_tasks:
             failed_task_ids = ", ".join(
@@ -388,6 +493,29 @@ class SyncScanJobRunner:
         self.scan_job.status_complete()
         return ScanTask.COMPLETED
 
+    def run_task_runners(self, task_runners: list[ScanTaskRunner]) -> list[str]:
+        """Run a group of task runners at the same time.
+
+        :returns: list of the task status of each task runner
+        """
+        if len(task_runners) == 1:
+            return [run_task_runner(task_runners[0], self.manager_interrupt)]
+
+        def _run_task_runner(runner: ScanTaskRunner) -> str:
+            try:
+                return run_task_runner(runner, TaskInterrupt(self.manager_interrupt))
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=len(task_runners)) as executor:
+            task_statuses = list(executor.map(_run_task_runner, task_runners))
+        if self.manager_interrupt.value in [
+            ScanJob.JOB_TERMINATE_CANCEL,
+            ScanJob.JOB_TERMINATE_PAUSE,
+        ]:
+            self.manager_interrupt.value = ScanJob.JOB_TERMINATE_ACK
+        return task_statuses
+
     def _log_details_report_error(self, runner_instance, details_report):
         runner_instance.scan_task.log_message(
             (
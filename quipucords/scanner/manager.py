@@ -3,13 +3,15 @@
 from __future__ import annotations
 
 import logging
-from threading import Thread, Timer
+from collections import Counter
+from threading import RLock, Thread, Timer
 from time import sleep
 
 from django.conf import settings
 from django.db.models import Q
 
 from api.models import ScanJob, ScanTask
+from quipucords import celery_app
 from scanner.job import (
     CeleryBasedScanJobRunner,
     ProcessBasedScanJobRunner,
@@ -20,19 +22,36 @@ logger = logging.getLogger(__name__)
 
 
 class CeleryScanManager:
-    """Drop-in replacement for Manager that uses Celery tasks instead of Processes."""
+    """Drop-in replacement for Manager that uses Celery tasks instead of Processes.
 
-    def __init__(self):
-        """Log a warning about this scan manager being incomplete."""
-        logger.warning("%s is not yet fully functional.", __class__.__name__)
+    Scan jobs don't wait in a queue here; their tasks are sent to Celery right away,
+    and any number of Celery workers may run them. Pausing or canceling a scan job
+    revokes its tasks that didn't start yet, and the running ones stop when they see
+    the new scan job status in the database. Restarting a paused scan job sends its
+    incomplete tasks to Celery again.
+    """
+
+    log_prefix = "CELERY SCAN JOB MANAGER"
 
     def is_alive(self):
         """Return true to make the common manager interface happy."""
         return True
 
-    def kill(self, *args, **kwargs):
-        """Raise an exception because Celery-based killing is not yet implemented."""
-        raise NotImplementedError
+    def kill(self, scan_job: ScanJob, command: str):
+        """Revoke the Celery tasks of a scan job that is about to be interrupted.
+
+        :param scan_job: the ScanJob to pause or cancel
+        :param command: the interrupt command, only used for logging
+        :returns: bool True if any Celery task was revoked
+        """
+        task_ids = CeleryBasedScanJobRunner(scan_job).get_celery_task_ids()
+        if not task_ids:
+            return False
+        scan_job.log_message(
+            f"{self.log_prefix}: Revoking {len(task_ids)} tasks to {command} job."
+        )
+        celery_app.control.revoke(task_ids)
+        return True
 
     def start(self):
         """Return true to make the common manager interface happy."""
@@ -70,7 +89,15 @@ class DisabledManager:
 
 
 class Manager(Thread):
-    """Manager of scan job queue."""
+    """Manager of scan job queue.
+
+    Up to settings.QPC_MAX_CONCURRENT_SCAN_JOBS scan jobs run at the same time. Queued
+    jobs are prioritized by how many other jobs from the same scan are running or
+    queued before them, so one scan with many jobs can't starve the others.
+
+    The run loop shares the queue and the job runners with the request threads that
+    put and kill scan jobs, so they are only accessed while holding the lock.
+    """
 
     run_queue_sleep_time = 5
     log_prefix = "SCAN JOB MANAGER"
@@ -78,10 +105,13 @@ class Manager(Thread):
     def __init__(self):
         """Initialize the manager."""
         Thread.__init__(self)
+        self.max_concurrent_jobs = max(settings.QPC_MAX_CONCURRENT_SCAN_JOBS, 1)
+        self.lock = RLock()
+        # ScanJobRunners in the order they were queued
         self.scan_queue = []  # type: list[ScanJobRunner]
-        self.current_job_runner = None  # type: ScanJobRunner | None
-        self.terminated_job_runner = None  # type: ScanJobRunner | None
-        self.termination_elapsed_time = 0
+        self.current_job_runners = {}  # type: dict[int, ScanJobRunner]
+        self.terminated_job_runners = {}  # type: dict[int, ScanJobRunner]
+        self.termination_elapsed_time = {}  # type: dict[int, int]
         self.running = True
         logger.info("%s: Scan manager instance created.", self.log_prefix)
 
@@ -92,48 +122,84 @@ class Manager(Thread):
         if self.running:
             heartbeat.start()
 
+    @property
+    def queued_job_runners(self) -> list[ScanJobRunner]:
+        """Return queued ScanJobRunners in the order they will run.
+
+        Priorities are computed from the current job runners, since they change as
+        jobs start and end.
+        """
+        with self.lock:
+            scan_job_counts = Counter(
+                runner.scan_job.scan_id for runner in self.active_job_runners
+            )
+            priorities = []
+            for queued_order, runner in enumerate(self.scan_queue):
+                scan_id = runner.scan_job.scan_id
+                priorities.append((scan_job_counts[scan_id], queued_order))
+                scan_job_counts[scan_id] += 1
+            return [self.scan_queue[index] for _, index in sorted(priorities)]
+
+    @property
+    def active_job_runners(self) -> list[ScanJobRunner]:
+        """Return ScanJobRunners that are running or still being terminated."""
+        with self.lock:
+            return list(self.current_job_runners.values()) + list(
+                self.terminated_job_runners.values()
+            )
+
     def log_info(self):
         """Log the status of the scan manager."""
-        if self.current_job_runner:
-            current_scan_job = self.current_job_runner.identifier
-            scan_job_message = f"Currently running scan job {current_scan_job}"
+        with self.lock:
+            current_job_ids = list(self.current_job_runners)
+            terminated_job_ids = list(self.terminated_job_runners)
+            scan_queue_ids = [runner.scan_job.id for runner in self.queued_job_runners]
+
+        if current_job_ids:
+            scan_job_message = f"Currently running scan jobs {current_job_ids}"
         else:
             scan_job_message = "No scan job currently running"
-
-        scan_queue_ids = [scan_runner.scan_job.id for scan_runner in self.scan_queue]
-        scan_queue_ids.reverse()
+        if terminated_job_ids:
+            scan_job_message += f", terminating scan jobs {terminated_job_ids}"
 
         logger.info(
-            "%s: %s.  Scan queue length is %s. Queued jobs: %s",
+            "%s: %s.  Using %s of %s slots. Scan queue length is %s. Queued jobs: %s",
             self.log_prefix,
             scan_job_message,
-            len(self.scan_queue),
+            len(current_job_ids) + len(terminated_job_ids),
+            self.max_concurrent_jobs,
+            len(scan_queue_ids),
             scan_queue_ids,
         )
 
+    def has_free_slot(self) -> bool:
+        """Check if another scan job can start running."""
+        return len(self.active_job_runners) < self.max_concurrent_jobs
+
     def work(self):
-        """Start to execute scans in the queue."""
-        if len(self.scan_queue) > 0:
-            self.current_job_runner = self.scan_queue.pop()
-            if self.current_job_runner.scan_job.status in [
-                ScanTask.PENDING,
-                ScanTask.RUNNING,
-            ]:
-                logger.info(
-                    "%s: Loading scan job %s.",
-                    self.log_prefix,
-                    self.current_job_runner.scan_job.id,
-                )
-                self.current_job_runner.start()
-                self.log_info()
-            else:
-                error = (
-                    f"{self.log_prefix}: Could not start job."
-                    f" Job was not in {ScanTask.PENDING} state."
-                )
-                self.current_job_runner.scan_job.log_message(
-                    error, log_level=logging.ERROR
-                )
+        """Start to execute scans in the queue while there are free slots."""
+        with self.lock:
+            while self.scan_queue and self.has_free_slot():
+                job_runner = self.queued_job_runners[0]
+                self.scan_queue.remove(job_runner)
+                if job_runner.scan_job.status in [
+                    ScanTask.PENDING,
+                    ScanTask.RUNNING,
+                ]:
+                    logger.info(
+                        "%s: Loading scan job %s.",
+                        self.log_prefix,
+                        job_runner.scan_job.id,
+                    )
+                    self.current_job_runners[job_runner.identifier] = job_runner
+                    job_runner.start()
+                    self.log_info()
+                else:
+                    error = (
+                        f"{self.log_prefix}: Could not start job."
+                        f" Job was not in {ScanTask.PENDING} state."
+                    )
+                    job_runner.scan_job.log_message(error, log_level=logging.ERROR)
 
     def put(self, scanner: ScanJobRunner):
         """Add a ScanJobRunner to scan queue.
@@ -144,8 +210,9 @@ class Manager(Thread):
             "Non-multiprocessing ScanJobRunner can't be used alongside thread "
             "based ScanManager."
         )
-        self.scan_queue.insert(0, scanner)
-        self.log_info()
+        with self.lock:
+            self.scan_queue.append(scanner)
+            self.log_info()
 
     def kill(self, job: ScanJob, command: str):
         """Kill a ScanJob or remove it from the running queue.
@@ -154,53 +221,50 @@ class Manager(Thread):
         :param command: string "cancel" or "pause".
         :returns: True if killed, False otherwise.
         """
-        killed = False
-        job_id = job.id
-        if (
-            self.current_job_runner is not None
-            and self.current_job_runner.identifier == job_id
-            and self.current_job_runner.is_alive()
-        ):
-
-            # record which job is terminated
-            self.terminated_job_runner = self.current_job_runner
-            self.current_job_runner = None
-
-            job.log_message(
-                f"{self.log_prefix}: Send interrupt" " to allow job orderly shutdown"
-            )
-            if command == "cancel":
-                self.terminated_job_runner.manager_interrupt.value = (
-                    ScanJob.JOB_TERMINATE_CANCEL
+        with self.lock:
+            killed = False
+            job_id = job.id
+            job_runner = self.current_job_runners.get(job_id)
+            if job_runner is not None and job_runner.is_alive():
+                # record which job is terminated
+                self.terminated_job_runners[job_id] = self.current_job_runners.pop(
+                    job_id
                 )
-            if command == "pause":
-                self.terminated_job_runner.manager_interrupt.value = (
-                    ScanJob.JOB_TERMINATE_PAUSE
-                )
-            self.termination_elapsed_time = 0
-        else:
-            logger.info("%s: Checking scan queue for job to remove.", self.log_prefix)
-            removed = False
-            for queued_job in self.scan_queue:
-                if queued_job.identifier == job_id:
-                    self.scan_queue.remove(queued_job)
-                    removed = True
-                    self.log_info()
-                    break
-            if removed:
-                killed = True
-                logger.info(
-                    "%s: Job %d has been removed from the scan queue.",
-                    self.log_prefix,
-                    job_id,
+
+                job.log_message(
+                    f"{self.log_prefix}: Send interrupt"
+                    " to allow job orderly shutdown"
                 )
+                if command == "cancel":
+                    job_runner.manager_interrupt.value = ScanJob.JOB_TERMINATE_CANCEL
+                if command == "pause":
+                    job_runner.manager_interrupt.value = ScanJob.JOB_TERMINATE_PAUSE
+                self.termination_elapsed_time[job_id] = 0
             else:
                 logger.info(
-                    "%s: Job %d was not found in the scan queue.",
-                    self.log_prefix,
-                    job_id,
+                    "%s: Checking scan queue for job to remove.", self.log_prefix
                 )
-            return killed
+                removed = False
+                for queued_runner in self.scan_queue:
+                    if queued_runner.identifier == job_id:
+                        self.scan_queue.remove(queued_runner)
+                        removed = True
+                        self.log_info()
+                        break
+                if removed:
+                    killed = True
+                    logger.info(
+                        "%s: Job %d has been removed from the scan queue.",
+                        self.log_prefix,
+                        job_id,
+                    )
+                else:
+                    logger.info(
+                        "%s: Job %d was not found in the scan queue.",
+                        self.log_prefix,
+                        job_id,
+                    )
+                return killed
 
     def restart_incomplete_scansjobs(self):
         """Look for incomplete scans and restart."""
@@ -229,80 +293,81 @@ class Manager(Thread):
         if restarted_scan_count == 0:
             logger.info("%s: No running or pending scan jobs to start", self.log_prefix)
 
-    def run(self):  # noqa: PLR0912, C901
-        """Trigger thread execution."""
-        self.restart_incomplete_scansjobs()
-        logger.info("%s: Started run loop.", self.log_prefix)
-        self.start_log_timer()
-        while self.running:
-            queue_len = len(self.scan_queue)
-            if self.terminated_job_runner is not None:
-                # Occurs when current job was terminated
-                killed = not self.terminated_job_runner.is_alive()
-                interrupt = self.terminated_job_runner.manager_interrupt
+    def check_terminated_job_runners(self):
+        """Release slots of terminated jobs, forcing termination after a timeout."""
+        with self.lock:
+            for job_id, job_runner in list(self.terminated_job_runners.items()):
+                killed = not job_runner.is_alive()
+                interrupt = job_runner.manager_interrupt
                 if killed:
-                    # Set this to None so another job can run.
-                    self.terminated_job_runner.scan_job.log_message(
+                    # Release the slot so another job can run.
+                    job_runner.scan_job.log_message(
                         f"{self.log_prefix}: Process successfully terminated."
                     )
-                    self.terminated_job_runner = None
+                    del self.terminated_job_runners[job_id]
+                    del self.termination_elapsed_time[job_id]
                 elif interrupt.value == ScanJob.JOB_TERMINATE_ACK:
-                    self.terminated_job_runner.log_message(
+                    job_runner.scan_job.log_message(
                         f"{self.log_prefix}: Scan job acknowledged"
                         " request to terminate but still processing."
                     )
                 else:
-                    self.terminated_job_runner.scan_job.log_message(
+                    job_runner.scan_job.log_message(
                         f"{self.log_prefix}: Scan job has not acknowledged"
                         " request to terminate after"
-                        f" {self.termination_elapsed_time:d}s."
+                        f" {self.termination_elapsed_time[job_id]:d}s."
                     )
 
                     # After a time period terminate (will not work in gunicorn)
-                    self.termination_elapsed_time += self.run_queue_sleep_time
+                    self.termination_elapsed_time[job_id] += self.run_queue_sleep_time
                     if (
-                        self.termination_elapsed_time
+                        self.termination_elapsed_time[job_id]
                         == settings.MAX_TIMEOUT_ORDERLY_SHUTDOWN
                     ):
-                        self.terminated_job_runner.scan_job.log_message(
+                        job_runner.scan_job.log_message(
                             "FORCEFUL TERMINATION OF JOB PROCESS"
                         )
-                        self.terminated_job_runner.terminate()
-            elif self.current_job_runner is not None:
-                # Occurs when current jobs ends and at least 1 in queue
-                killed = not self.current_job_runner.is_alive()
-                if killed:
-                    terminated_job = ScanJob.objects.filter(
-                        id=self.current_job_runner.scan_job.id
-                    ).first()
-                    if terminated_job:
-                        if terminated_job.status in [
-                            ScanTask.PENDING,
-                            ScanTask.CREATED,
-                            ScanTask.RUNNING,
-                        ]:
-                            terminated_job.log_message(
-                                f"{self.log_prefix}:"
-                                " scan job has unexpectedly failed."
-                            )
-                            terminated_job.status_fail(
-                                "Scan manager failed job due to unexpected error."
-                            )
-                        else:
-                            terminated_job.log_message(
-                                f"{self.log_prefix}: scan job has completed."
-                            )
+                        job_runner.terminate()
+
+    def check_current_job_runners(self):
+        """Release slots of running jobs that have ended."""
+        with self.lock:
+            for job_id, job_runner in list(self.current_job_runners.items()):
+                if job_runner.is_alive():
+                    continue
+                terminated_job = ScanJob.objects.filter(id=job_id).first()
+                if terminated_job:
+                    if terminated_job.status in [
+                        ScanTask.PENDING,
+                        ScanTask.CREATED,
+                        ScanTask.RUNNING,
+                    ]:
+                        terminated_job.log_message(
+                            f"{self.log_prefix}: scan job has unexpectedly failed."
+                        )
+                        terminated_job.status_fail(
+                            "Scan manager failed job due to unexpected error."
+                        )
                     else:
-                        self.current_job_runner.scan_job.log_message(
-                            "Scan manager detected deletion of scan job "
-                            "model before final updates applied."
+                        terminated_job.log_message(
+                            f"{self.log_prefix}: scan job has completed."
                         )
-                    self.current_job_runner = None
-                    if queue_len > 0:
-                        self.work()
-            elif queue_len > 0 and self.current_job_runner is None:
-                # Occurs when no current job, but new one added
-                self.work()
+                else:
+                    job_runner.scan_job.log_message(
+                        "Scan manager detected deletion of scan job "
+                        "model before final updates applied."
+                    )
+                del self.current_job_runners[job_id]
+
+    def run(self):
+        """Trigger thread execution."""
+        self.restart_incomplete_scansjobs()
+        logger.info("%s: Started run loop.", self.log_prefix)
+        self.start_log_timer()
+        while self.running:
+            self.check_terminated_job_runners()
+            self.check_current_job_runners()
+            self.work()
             sleep(self.run_queue_sleep_time)
 
 
@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
-from functools import cached_property, wraps
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, partial, wraps
 from logging import getLogger
-from typing import List
+from time import monotonic
+from typing import Callable, Iterator, List
 
+from django.conf import settings
 from kubernetes.client import ApiClient, ApiException, CoreV1Api
 from kubernetes.client import Configuration as KubeConfig
 from openshift.dynamic import DynamicClient
@@ -20,11 +24,15 @@ from scanner.openshift.entities import (
     OCPError,
     OCPNode,
     OCPPod,
-    OCPWorkload,
+    OCPWorkloads,
+    get_app_name,
 )
 
 logger = getLogger(__name__)
 
+# independent API calls of one scan sent at the same time
+MAX_CONCURRENT_RETRIEVALS = 4
+
 
 def catch_k8s_exception(func):
     """Capture Kubernetes exception and reraise as OCPError."""
@@ -67,6 +75,8 @@ class OpenShiftApi:
         self._api_client = ApiClient(configuration=self._configuration)
         # discoverer cache is used to cache resources for dynamic client
         self._discoverer_cache_file = None
+        # resources are discovered one at a time, even for concurrent retrievals
+        self._discovery_lock = threading.Lock()
 
     @cached_property
     def _dynamic_client(self):
@@ -141,7 +151,7 @@ class OpenShiftApi:
     def retrieve_nodes(self, **kwargs) -> List[OCPNode]:
         """Retrieve nodes under OCP host."""
         node_list = []
-        for node in self._list_nodes(**kwargs).items:
+        for node in self._paginate(self._list_nodes, **kwargs):
             ocp_node = self._init_ocp_nodes(node)
             node_list.append(ocp_node)
         return node_list
@@ -155,42 +165,64 @@ class OpenShiftApi:
 
     def retrieve_pods(self, **kwargs) -> List[OCPPod]:
         """Retrieve OCP Pods."""
-        pods_raw = self._list_pods(**kwargs)
-        pods_list = []
-        for pod in pods_raw.items:
-            ocp_pod = OCPPod.from_api_object(pod)
-            pods_list.append(ocp_pod)
-        return pods_list
-
-    def retrieve_workloads(self, **kwargs) -> List[OCPWorkload]:
-        """Retrieve OCPWorkloads."""
-        pod_list = self.retrieve_pods(**kwargs)
-        _app_names = set()
-        workload_list = []
-        for pod in pod_list:
-            pod_id = (pod.namespace, pod.app_name)
-            if pod_id in _app_names:
-                continue
-            _app_names.add(pod_id)
-            data = pod.dict()
-            data["name"] = pod.app_name
-            workload_list.append(OCPWorkload(**data))
-        return workload_list
+        return list(self.iter_pods(**kwargs))
+
+    def iter_pods(self, **kwargs) -> Iterator[OCPPod]:
+        """Iterate over OCP Pods, retrieving them one page at a time."""
+        for pod in self._paginate(self._list_pods, **kwargs):
+            yield OCPPod.from_api_object(pod)
+
+    def retrieve_workloads(self, **kwargs) -> OCPWorkloads:
+        """Retrieve OCPWorkloads.
+
+        Pods are deduplicated as they are retrieved, so only one pod per workload is
+        kept in memory, and go straight into the compact OCPWorkloads columns
+        without becoming OCPPod entities first.
+        """
+
+        def _iter_workloads():
+            _app_names = set()
+            for pod in self._paginate(self._list_pods, **kwargs):
+                data = OCPPod.api_object_data(pod)
+                data["name"] = get_app_name(data["name"], data["labels"])
+                pod_id = (data["namespace"], data["name"])
+                if pod_id in _app_names:
+                    continue
+                _app_names.add(pod_id)
+                yield data
+
+        return OCPWorkloads.from_workloads(_iter_workloads())
 
     def retrieve_operators(self, **kwargs) -> List[ClusterOperator | LifecycleOperator]:
         """Retrieve cluster and "olm" operators."""
+        resource_lists = {}
+        for name, (resource_list, _) in self.retrieve_concurrently(
+            {
+                "cluster_operators": partial(
+                    self._list_all, self._list_cluster_operators
+                ),
+                "subscriptions": partial(self._list_all, self._list_subscriptions),
+                "cluster_service_versions": partial(
+                    self._list_all, self._list_cluster_service_versions
+                ),
+            },
+            **kwargs,
+        ).items():
+            if isinstance(resource_list, OCPError):
+                raise resource_list
+            resource_lists[name] = resource_list
+
         cluster_operators = [
             ClusterOperator.from_raw_object(operator)
-            for operator in self._list_cluster_operators(**kwargs).items
+            for operator in resource_lists["cluster_operators"]
         ]
         olm_operators = [
             LifecycleOperator.from_raw_object(operator)
-            for operator in self._list_subscriptions(**kwargs).items
+            for operator in resource_lists["subscriptions"]
         ]
         # Use CSV api to enhance olm operators with extra metadata
         csv_map = {
-            csv.metadata.name: csv
-            for csv in self._list_cluster_service_versions(**kwargs).items
+            csv.metadata.name: csv for csv in resource_lists["cluster_service_versions"]
         }
         for operator in olm_operators:
             csv = csv_map[operator.cluster_service_version]
@@ -198,43 +230,96 @@ class OpenShiftApi:
 
         return cluster_operators + olm_operators
 
+    def retrieve_concurrently(
+        self, retrieve_methods: dict[str, Callable], **kwargs
+    ) -> dict[str, tuple]:
+        """Call independent retrieve methods at the same time.
+
+        :param retrieve_methods: dict of retrieve methods by name
+        :param kwargs: keyword arguments passed to every retrieve method, like the
+            "timeout_seconds" of each of their API calls
+        :returns: dict of (result, elapsed seconds) by name. The result of a method
+            that failed with an OCPError is that error, so other methods aren't
+            affected by it.
+        """
+
+        def _timed_call(retrieve_method):
+            start = monotonic()
+            try:
+                result = retrieve_method(**kwargs)
+            except OCPError as error:
+                result = error
+            return result, monotonic() - start
+
+        max_workers = min(len(retrieve_methods), MAX_CONCURRENT_RETRIEVALS)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                name: executor.submit(_timed_call, retrieve_method)
+                for name, retrieve_method in retrieve_methods.items()
+            }
+        return {name: future.result() for name, future in futures.items()}
+
+    def _list_all(self, list_method, **kwargs) -> list:
+        """Retrieve all the items of a list call."""
+        return list(self._paginate(list_method, **kwargs))
+
+    def _paginate(self, list_method, **kwargs) -> Iterator:
+        """Iterate over the items of a list call, one page at a time.
+
+        Pages hold up to QPC_OPENSHIFT_LIST_LIMIT items and are chained with the
+        "continue" token of the previous page, so a list never has to be held in
+        memory as a whole.
+        """
+        kwargs.setdefault("limit", settings.QPC_OPENSHIFT_LIST_LIMIT)
+        while True:
+            resource_list = list_method(**kwargs)
+            yield from resource_list.items
+            continue_token = resource_list.metadata["continue"]
+            if not continue_token:
+                break
+            kwargs["_continue"] = continue_token
+
+    def _get_resource_api(self, **kwargs):
+        with self._discovery_lock:
+            return self._dynamic_client.resources.get(**kwargs)
+
     @cached_property
     def _core_api(self):
         return CoreV1Api(api_client=self._api_client)
 
     @cached_property
     def _node_api(self):
-        return self._dynamic_client.resources.get(api_version="v1", kind="Node")
+        return self._get_resource_api(api_version="v1", kind="Node")
 
     @cached_property
     def _namespace_api(self):
-        return self._dynamic_client.resources.get(api_version="v1", kind="Namespace")
+        return self._get_resource_api(api_version="v1", kind="Namespace")
 
     @cached_property
     def _cluster_api(self):
-        return self._dynamic_client.resources.get(
+        return self._get_resource_api(
             api_version="config.openshift.io/v1", kind="ClusterVersion"
         )
 
     @cached_property
     def _pod_api(self):
-        return self._dynamic_client.resources.get(api_version="v1", kind="Pod")
+        return self._get_resource_api(api_version="v1", kind="Pod")
 
     @cached_property
     def _cluster_operator_api(self):
-        return self._dynamic_client.resources.get(
+        return self._get_resource_api(
             api_version="config.openshift.io/v1", kind="ClusterOperator"
         )
 
     @cached_property
     def _subscription_api(self):
-        return self._dynamic_client.resources.get(
+        return self._get_resource_api(
             api_version="operators.coreos.com/v1alpha1", kind="Subscription"
         )
 
     @cached_property
     def _cluster_service_version_api(self):
-        return self._dynamic_client.resources.get(
+        return self._get_resource_api(
             api_version="operators.coreos.com/v1alpha1", kind="ClusterServiceVersion"
         )
 
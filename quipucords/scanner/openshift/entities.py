@@ -5,7 +5,7 @@ from __future__ import annotations
 import datetime
 import json
 import re
-from typing import Dict, List
+from typing import Dict, Iterable, List
 
 from pydantic import Field, validator
 
@@ -112,6 +112,98 @@ class OCPWorkload(OCPBaseEntity):
     _kind = "workload"
 
 
+class OCPWorkloads(OCPBaseEntity):
+    """
+    Compact, columnar collection of OCPWorkloads.
+
+    Each workload is an index in the names column. Namespaces, images and label sets
+    repeat a lot across the workloads of a cluster, so each distinct value is stored
+    once and workloads refer to it by its index.
+
+    This is only how workloads are kept in memory while pods are retrieved; the
+    "workloads" fact is still stored as a list of OCPWorkload.
+    """
+
+    names: List[str] = Field(default_factory=list)
+    namespace_indexes: List[int] = Field(default_factory=list)
+    label_set_indexes: List[int] = Field(default_factory=list)
+    container_image_indexes: List[List[int]] = Field(default_factory=list)
+    init_container_image_indexes: List[List[int]] = Field(default_factory=list)
+    namespaces: List[str] = Field(default_factory=list)
+    label_sets: List[Dict[str, str]] = Field(default_factory=list)
+    images: List[str] = Field(default_factory=list)
+    _kind = "workloads"
+
+    @classmethod
+    def from_workloads(cls, workloads: Iterable[dict]) -> OCPWorkloads:
+        """Init OCPWorkloads from dicts with the fields of OCPWorkload."""
+        columns = {"namespaces": {}, "label_sets": {}, "images": {}}
+
+        def _index(column, value, key=None):
+            return columns[column].setdefault(
+                value if key is None else key, (len(columns[column]), value)
+            )[0]
+
+        def _image_indexes(images):
+            return [_index("images", image) for image in images]
+
+        compact_workloads = cls()
+        for workload in workloads:
+            labels = workload.get("labels") or {}
+            compact_workloads.names.append(workload["name"])
+            compact_workloads.namespace_indexes.append(
+                _index("namespaces", workload.get("namespace"))
+            )
+            compact_workloads.label_set_indexes.append(
+                _index("label_sets", labels, key=tuple(sorted(labels.items())))
+            )
+            compact_workloads.container_image_indexes.append(
+                _image_indexes(workload.get("container_images", []))
+            )
+            compact_workloads.init_container_image_indexes.append(
+                _image_indexes(workload.get("init_container_images", []))
+            )
+        for column, values in columns.items():
+            setattr(compact_workloads, column, [value for _, value in values.values()])
+        return compact_workloads
+
+    def workloads(self) -> List[OCPWorkload]:
+        """Expand the compact columns back into OCPWorkloads."""
+        return [
+            OCPWorkload(
+                name=name,
+                namespace=self.namespaces[namespace_index],
+                labels=self.label_sets[label_set_index],
+                container_images=[self.images[index] for index in image_indexes],
+                init_container_images=[
+                    self.images[index] for index in init_image_indexes
+                ],
+            )
+            for (
+                name,
+                namespace_index,
+                label_set_index,
+                image_indexes,
+                init_image_indexes,
+            ) in zip(
+                self.names,
+                self.namespace_indexes,
+                self.label_set_indexes,
+                self.container_image_indexes,
+                self.init_container_image_indexes,
+            )
+        ]
+
+    def __len__(self):
+        """Return the number of workloads."""
+        return len(self.names)
+
+
+def get_app_name(name: str, labels: dict) -> str:
+    """Return the app name of a pod from its "app" label or its name."""
+    return labels.get("app") or name.rsplit("-", 1)[0]
+
+
 class OCPPod(OCPWorkload):
     """Entity representing OpenShift Pods."""
 
@@ -120,26 +212,30 @@ class OCPPod(OCPWorkload):
     @property
     def app_name(self):
         """Return app name."""
-        # if not available as a label,
-        return self.labels.get("app") or self.name.rsplit("-", 1)[0]
+        return get_app_name(self.name, self.labels)
 
     @classmethod
     def from_api_object(cls, api_object):
         """Init OCPPod from object returned from ocp/k8s api."""
+        return cls(**cls.api_object_data(api_object))
+
+    @staticmethod
+    def api_object_data(api_object) -> dict:
+        """Extract the OCPPod fields of an object returned from ocp/k8s api."""
 
         def _get_container_images(container_list):
             container_list = container_list or []
             return list({c["image"] for c in container_list if c.get("image")})
 
-        return cls(
-            name=api_object.metadata.name,
-            namespace=api_object.metadata.namespace,
-            labels=api_object.metadata.labels,
-            container_images=_get_container_images(api_object.spec["containers"]),
-            init_container_images=_get_container_images(
+        return {
+            "name": api_object.metadata.name,
+            "namespace": api_object.metadata.namespace,
+            "labels": dict(api_object.metadata.labels or {}),
+            "container_images": _get_container_images(api_object.spec["containers"]),
+            "init_container_images": _get_container_images(
                 api_object.spec["initContainers"]
             ),
-        )
+        }
 
 
 @raises(ValueError)
@@ -6,7 +6,13 @@ from django.db import transaction
 from api.models import RawFact, ScanTask, SystemInspectionResult
 from scanner.exceptions import ScanFailureError
 from scanner.openshift.api import OpenShiftApi
-from scanner.openshift.entities import OCPBaseEntity, OCPCluster, OCPError, OCPNode
+from scanner.openshift.entities import (
+    OCPBaseEntity,
+    OCPCluster,
+    OCPError,
+    OCPNode,
+    OCPWorkloads,
+)
 from scanner.openshift.runner import OpenShiftTaskRunner
 
 
@@ -24,13 +30,12 @@ class InspectTaskRunner(OpenShiftTaskRunner):
         self._check_prerequisites()
         ocp_client = self.get_ocp_client(self.scan_task)
 
-        self.log("Retrieving essential cluster facts.")
-        cluster = ocp_client.retrieve_cluster()
+        self.log("Retrieving cluster, node and extra cluster facts.")
+        resources = self._retrieve_resources(ocp_client)
+        self.check_for_interrupt(manager_interrupt)
+        cluster = resources.pop("cluster")
+        nodes_list = resources.pop("nodes")
 
-        self.log("Retrieving node facts.")
-        nodes_list = ocp_client.retrieve_nodes(
-            timeout_seconds=settings.QPC_INSPECT_TASK_TIMEOUT,
-        )
         # cluster is considered a "system", hence the +1
         self._init_stats(len(nodes_list) + 1)
         for node in nodes_list:
@@ -39,10 +44,15 @@ class InspectTaskRunner(OpenShiftTaskRunner):
             node.cluster_uuid = cluster.uuid
             self._save_node(node)
 
-        self.log("Retrieving extra cluster facts.")
-        extra_cluster_facts = self._extra_cluster_facts(
-            manager_interrupt, ocp_client, cluster
-        )
+        extra_cluster_facts = {}
+        for fact_name, fact_value in resources.items():
+            if isinstance(fact_value, OCPError):
+                cluster.errors[fact_name] = fact_value
+            elif isinstance(fact_value, OCPWorkloads):
+                # workloads are only compact in memory, reports keep one per entity
+                extra_cluster_facts[fact_name] = fact_value.workloads()
+            else:
+                extra_cluster_facts[fact_name] = fact_value
         self._save_cluster(cluster, extra_cluster_facts)
 
         self.log(f"Collected facts for {self.scan_task.systems_scanned} systems.")
@@ -57,29 +67,32 @@ class InspectTaskRunner(OpenShiftTaskRunner):
             return self.SUCCESS_MESSAGE, ScanTask.COMPLETED
         return self.FAILURE_MESSAGE, ScanTask.FAILED
 
-    def _extra_cluster_facts(
-        self, manager_interrupt, ocp_client: OpenShiftApi, cluster
-    ):
-        """Retrieve extra cluster facts."""
-        collect_ocp_workloads_enabled = settings.QPC_FEATURE_FLAGS.is_feature_active(
-            "OCP_WORKLOADS"
-        )
-        fact2method = (
-            ("workloads", ocp_client.retrieve_workloads),
-            ("operators", ocp_client.retrieve_operators),
-        )
-        extra_facts = {}
-        for fact_name, api_method in fact2method:
-            self.check_for_interrupt(manager_interrupt)
-            try:
-                if fact_name == "workloads" and not collect_ocp_workloads_enabled:
-                    continue
-                extra_facts[fact_name] = api_method(
-                    timeout_seconds=settings.QPC_INSPECT_TASK_TIMEOUT
-                )
-            except OCPError as err:
-                cluster.errors[fact_name] = err
-        return extra_facts
+    def _retrieve_resources(self, ocp_client: OpenShiftApi):
+        """Retrieve the cluster, its nodes and extra cluster facts concurrently.
+
+        :returns: dict of resources by fact name. Extra cluster facts that couldn't
+            be retrieved are the OCPError explaining why.
+        """
+        retrieve_methods = {
+            "cluster": ocp_client.retrieve_cluster,
+            "nodes": ocp_client.retrieve_nodes,
+        }
+        if settings.QPC_FEATURE_FLAGS.is_feature_active("OCP_WORKLOADS"):
+            retrieve_methods["workloads"] = ocp_client.retrieve_workloads
+        retrieve_methods["operators"] = ocp_client.retrieve_operators
+
+        resources = {}
+        for fact_name, (result, elapsed) in ocp_client.retrieve_concurrently(
+            retrieve_methods, timeout_seconds=settings.QPC_INSPECT_TASK_TIMEOUT
+        ).items():
+            if isinstance(result, OCPError):
+                self.log(f"Failed retrieving {fact_name} facts after {elapsed:.2f}s.")
+                if fact_name in ["cluster", "nodes"]:
+                    raise result
+            else:
+                self.log(f"Retrieved {fact_name} facts in {elapsed:.2f}s.")
+            resources[fact_name] = result
+        return resources
 
     def _check_prerequisites(self):
         connect_scan_task = self.scan_task.prerequisites.first()
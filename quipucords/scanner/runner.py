@@ -2,8 +2,10 @@
 
 from abc import ABCMeta, abstractmethod
 from multiprocessing import Value
+from time import monotonic
 from typing import Tuple
 
+from api.common.report_artifacts import delete_report_artifacts
 from api.models import ScanJob, ScanTask
 from scanner.exceptions import (
     ScanCancelException,
@@ -13,9 +15,57 @@ from scanner.exceptions import (
 )
 
 
+class ScanJobStatusInterrupt:
+    """Drop-in replacement for the manager_interrupt Value that polls the database.
+
+    Celery tasks of one scan job may run in any worker, so they can't share memory
+    with the scan manager. Pausing or canceling a scan job updates its status in the
+    database instead, and this object translates that status to the interrupt values
+    that ScanTaskRunner.check_for_interrupt expects.
+    """
+
+    INTERRUPT_BY_STATUS = {
+        ScanTask.PAUSED: ScanJob.JOB_TERMINATE_PAUSE,
+        ScanTask.CANCELED: ScanJob.JOB_TERMINATE_CANCEL,
+    }
+    # minimum number of seconds between two queries of the scan job status
+    poll_interval = 1
+
+    def __init__(self, scan_job_id: int):
+        """Initialize the interrupt for the given scan job."""
+        self.scan_job_id = scan_job_id
+        self._value = ScanJob.JOB_RUN
+        self._polled_at = None
+
+    @property
+    def value(self) -> int:
+        """Get the interrupt value, polling the scan job status if it is stale."""
+        if self._value == ScanJob.JOB_RUN and (
+            self._polled_at is None
+            or monotonic() - self._polled_at >= self.poll_interval
+        ):
+            self._polled_at = monotonic()
+            status = (
+                ScanJob.objects.filter(id=self.scan_job_id)
+                .values_list("status", flat=True)
+                .first()
+            )
+            self._value = self.INTERRUPT_BY_STATUS.get(status, ScanJob.JOB_RUN)
+        return self._value
+
+    @value.setter
+    def value(self, value: int):
+        """Set the interrupt value, usually to acknowledge an interrupt."""
+        self._value = value
+
+
 class ScanTaskRunner(metaclass=ABCMeta):
     """ScanTaskRunner is a logical breakdown of work."""
 
+    # Celery signature to run in place of the current Celery task when execute_task
+    # returns ScanTask.RUNNING. Its tasks must set the final ScanTask status.
+    celery_continuation = None
+
     @classmethod
     @property
     @abstractmethod
@@ -57,6 +107,7 @@ class ScanTaskRunner(metaclass=ABCMeta):
                         deployment_report.save()
                         details_report.deployment_report = None
                         details_report.save()
+                        delete_report_artifacts(deployment_report)
                         deployment_report.delete()
 
     def run(self, manager_interrupt: Value = None):
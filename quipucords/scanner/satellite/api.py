@@ -1,8 +1,11 @@
 """Satellite API Interface."""
+import itertools
 import logging
 from abc import ABC, abstractmethod
-from collections.abc import Callable, Iterable
-from multiprocessing import Pool, Value
+from collections.abc import Callable, Generator, Iterable
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from math import ceil
+from multiprocessing import Pool, Value, util
 
 import celery
 from django.conf import settings
@@ -18,6 +21,7 @@ from api.models import (
 )
 from api.scanjob.model import ScanJob
 from scanner.exceptions import ScanCancelException, ScanPauseException
+from scanner.runner import ScanJobStatusInterrupt
 from scanner.satellite import utils
 
 logger = logging.getLogger(__name__)
@@ -25,6 +29,11 @@ logger = logging.getLogger(__name__)
 SATELLITE_VERSION_5 = "5"
 SATELLITE_VERSION_6 = "6"
 
+# number of host results recorded in one database transaction
+RESULTS_BATCH_SIZE = 100
+# maximum number of seconds to wait for more host results before recording them
+RESULTS_BATCH_TIMEOUT = 1
+
 
 class SatelliteAuthException(Exception):
     """Exception for Satellite Authentication interaction."""
@@ -42,9 +51,90 @@ class SatellitePauseException(ScanPauseException):
     """Exception for Satellite Pause interrupt."""
 
 
+@celery.shared_task(bind=True, name="complete_host_details_sat")
+def complete_host_details(task_instance: celery.Task, scan_task_id: int):
+    """Complete an inspect ScanTask once all its host details are recorded.
+
+    This is the callback of the chord built by SatelliteInterface, and it takes
+    the place of the celery_run_task_runner task that built the chord.
+
+    :returns: tuple containing success bool, scan task id, and scan task status
+    """
+    scan_task = ScanTask.objects.get(id=scan_task_id)
+    if ScanJobStatusInterrupt(scan_task.job_id).value != ScanJob.JOB_RUN:
+        # Pausing or canceling the scan job already updated this task's status.
+        task_instance.request.chain = None
+        return False, scan_task_id, scan_task.status
+    try:
+        utils.validate_task_stats(scan_task)
+    except SatelliteException as error:
+        scan_task.log_message(
+            "Exception captured during task execution.",
+            exception=error,
+            log_level=logging.ERROR,
+        )
+        scan_task.status_fail(
+            f"Satellite error ({type(error)}) found."
+            f" Scan failed for source {scan_task.source}."
+        )
+        # If this task failed, we do not want subsequent tasks in its chain to run.
+        task_instance.request.chain = None
+        return False, scan_task_id, ScanTask.FAILED
+    scan_task.status_complete()
+    return True, scan_task_id, ScanTask.COMPLETED
+
+
+def request_hosts_details(
+    request_host_details: Callable,
+    host_params: Iterable[tuple],
+    max_concurrency: int,
+) -> Generator[list, None, None]:
+    """Request the details of all hosts, yielding batches of results as they arrive.
+
+    Up to max_concurrency requests run in threads of a pool, a new one starting as
+    soon as any completes. A batch is yielded at least every RESULTS_BATCH_TIMEOUT
+    seconds, even if it is empty, so the caller can check for interrupts. The
+    first request error is raised as soon as it happens, and closing the generator
+    also stops requesting more hosts.
+
+    :param request_host_details: API version-specific function to get host details
+    :param host_params: iterable of host params built by prepare_hosts
+    :param max_concurrency: maximum number of requests in flight
+    """
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        pending = {
+            executor.submit(request_host_details, *params) for params in host_params
+        }
+        try:
+            while pending:
+                done, pending = wait(
+                    pending, timeout=RESULTS_BATCH_TIMEOUT, return_when=FIRST_EXCEPTION
+                )
+                if not done:
+                    yield []
+                for batch in chunked(done, RESULTS_BATCH_SIZE):
+                    yield [future.result() for future in batch]
+        finally:
+            # stop requesting more hosts after an error or an interrupt
+            executor.shutdown(cancel_futures=True)
+
+
+def close_sessions_at_exit(close_sessions: Callable, scan_task_id: int):
+    """Close the sessions of a scan task when the current worker process exits.
+
+    This initializes multiprocessing.Pool workers, which only run their exit
+    finalizers when the pool is closed rather than terminated.
+    """
+    util.Finalize(None, close_sessions, args=(scan_task_id,), exitpriority=0)
+
+
 class SatelliteInterface(ABC):
     """Generic interface for dealing with Satellite."""
 
+    # number of hosts whose params are given to each request_host_details call
+    # outside Celery; above 1, it returns a list with the results of each host
+    HOST_DETAILS_BATCH_SIZE = 1
+
     def __init__(self, scan_job, scan_task):
         """Set context for interface."""
         self.scan_job = scan_job
@@ -60,6 +150,17 @@ class SatelliteInterface(ABC):
             self.connect_scan_task = scan_task.prerequisites.first()
             self.inspect_scan_task = scan_task
         self.source = scan_task.source
+        # Celery chord that completes the inspection when Celery is enabled.
+        self.host_details_signature = None
+
+    @staticmethod
+    def close_host_sessions(scan_task_id: int):
+        """Close the sessions and caches the host details requests of a scan task used.
+
+        It is called in each process that requested host details, once they are
+        all done. API versions that keep neither sessions nor caches for host
+        details don't override it.
+        """
 
     @transaction.atomic
     def record_conn_result(self, name, credential):
@@ -129,67 +230,58 @@ class SatelliteInterface(ABC):
         }
         return request_options
 
-    def _prepare_and_process_hosts(
+    def _prepare_and_process_hosts(  # noqa: PLR0913
         self,
         hosts: Iterable[dict],
         request_host_details: Callable,
         process_results: Callable,
         manager_interrupt: Value = None,
+        record_host_details_chunk: celery.Signature = None,
     ):
         if settings.QPC_ENABLE_CELERY_SCAN_MANAGER:
             self._prepare_and_process_hosts_using_celery(
-                hosts, request_host_details, process_results
+                hosts, record_host_details_chunk
+            )
+        elif settings.QPC_ENABLE_SATELLITE_THREADED_INSPECTOR:
+            self._prepare_and_process_hosts_using_threads(
+                hosts, request_host_details, process_results, manager_interrupt
             )
+            utils.validate_task_stats(self.inspect_scan_task)
         else:
             self._prepare_and_process_hosts_using_multiprocessing(
                 hosts, request_host_details, process_results, manager_interrupt
             )
+            utils.validate_task_stats(self.inspect_scan_task)
 
     def _prepare_and_process_hosts_using_celery(
         self,
         hosts: Iterable[dict],
-        request_host_details: Callable,
-        process_results: Callable,
+        record_host_details_chunk: celery.Signature,
     ):
-        """Prepare and process hosts using Celery tasks.
+        """Prepare a Celery chord that requests and records details for all hosts.
 
-        Calling this function may result in a large number of Celery tasks, 1:1 with the
-        number of hosts known by the Satellite server, and will synchronously block
-        until all those tasks complete. This behavior does not follow Celery best
-        practices and should be revised in the future.
+        Hosts are split in one chunk per allowed concurrent request, and each chunk
+        is handled by a single Celery task that records its own results. Once all
+        chunks are done, the chord callback validates the stats and completes the
+        inspect scan task. Nothing is sent to the workers here; the chord is stored
+        in host_details_signature for the calling task to be replaced with it.
 
         :param hosts: iterable of host dicts
-        :param request_host_details: API version-specific function to get host details,
-            must also be a registered Celery task
-        :param process_results: API version-specific function to process results
+        :param record_host_details_chunk: API version-specific Celery signature that
+            requests and records the details of a chunk of hosts
         """
         all_prepared_hosts = self.prepare_hosts(hosts, ids_only=True)
-        # At the time of implementation, we don't know if it's okay to create many
-        # tasks (one per hosts) in a group like this. If this proves problematic, we
-        # should consider replacing `group` with `chunks` and calculate a reasonable
-        # size to limit parallel load. For example:
-        #     chunk_size = ceil(len(all_prepared_hosts) / self.max_concurrency)
-        #     request_host_details.chunks(all_prepared_hosts, chunk_size)().get()
-        #     results = list(itertools.chain.from_iterable(results))
-        # FIXME We SHOULD NOT use disable_sync_subtasks=False.
-        # Calling `get` blocks the current process, and if you do this from within a
-        # running task, Celery normally raises `RuntimeError(E_WOULDBLOCK)` to
-        # discourage that behavior. Although unlikely in *this* case, calling `get`
-        # from inside a task may lead to deadlocks if there are not available Celery
-        # workers; the blocking task may never complete and return its result to the
-        # blocked task's `get` call. Setting `disable_sync_subtasks=False` bypasses
-        # this internal Celery check, allowing the `get` to execute despite the risk.
-        # See this discussion for more details:
-        # https://github.com/quipucords/quipucords/pull/2364#discussion_r1229832809
-        results = (
-            celery.group(
-                request_host_details.s(*host_params)
-                for host_params in all_prepared_hosts
-            )
-            .apply_async()
-            .get(disable_sync_subtasks=False)
+        if not all_prepared_hosts:
+            utils.validate_task_stats(self.inspect_scan_task)
+            return
+        chunk_size = ceil(len(all_prepared_hosts) / self.max_concurrency)
+        self.host_details_signature = celery.chord(
+            (
+                record_host_details_chunk.clone(args=(self.inspect_scan_task.id, chunk))
+                for chunk in chunked(all_prepared_hosts, chunk_size)
+            ),
+            complete_host_details.si(self.inspect_scan_task.id),
         )
-        process_results(results=results)
 
     def _prepare_and_process_hosts_using_multiprocessing(
         self,
@@ -205,16 +297,74 @@ class SatelliteInterface(ABC):
         :param process_results: API version-specific function to process results
         :param manager_interrupt: shared multiprocessing value with possible interrupt
         """
-        with Pool(processes=self.max_concurrency) as pool:
-            for chunk in chunked(hosts, self.max_concurrency):
+        with Pool(
+            processes=self.max_concurrency,
+            initializer=close_sessions_at_exit,
+            initargs=(self.close_host_sessions, self.inspect_scan_task.id),
+        ) as pool:
+            chunk_size = self.max_concurrency * self.HOST_DETAILS_BATCH_SIZE
+            for chunk in chunked(hosts, chunk_size):
                 if manager_interrupt.value == ScanJob.JOB_TERMINATE_CANCEL:
                     raise SatelliteCancelException()
 
                 if manager_interrupt.value == ScanJob.JOB_TERMINATE_PAUSE:
                     raise SatellitePauseException()
-                host_params = self.prepare_hosts(chunk)
+                host_params = self._batch_host_params(self.prepare_hosts(chunk))
                 results = pool.starmap(request_host_details, host_params)
-                process_results(results=results)
+                process_results(results=self._unbatch_results(results))
+            # let the workers exit on their own so they close their sessions
+            pool.close()
+            pool.join()
+
+    def _prepare_and_process_hosts_using_threads(
+        self,
+        hosts: Iterable[dict],
+        request_host_details: Callable,
+        process_results: Callable,
+        manager_interrupt: Value,
+    ):
+        """Prepare and process hosts using a pool of threads.
+
+        Satellite clients are blocking, so up to max_concurrency host details
+        requests run in threads, while this thread records their results in
+        batches as they arrive.
+
+        :param hosts: iterable of host dicts
+        :param request_host_details: API version-specific function to get host details
+        :param process_results: API version-specific function to process results
+        :param manager_interrupt: shared multiprocessing value with possible interrupt
+        """
+        # keep a connection alive for each thread
+        utils.get_session(self.max_concurrency)
+        batches = request_hosts_details(
+            request_host_details,
+            self._batch_host_params(self.prepare_hosts(hosts)),
+            self.max_concurrency,
+        )
+        try:
+            for batch in batches:
+                if manager_interrupt.value == ScanJob.JOB_TERMINATE_CANCEL:
+                    raise SatelliteCancelException()
+                if manager_interrupt.value == ScanJob.JOB_TERMINATE_PAUSE:
+                    raise SatellitePauseException()
+                if batch:
+                    with transaction.atomic():
+                        process_results(results=self._unbatch_results(batch))
+        finally:
+            batches.close()
+            self.close_host_sessions(self.inspect_scan_task.id)
+
+    def _batch_host_params(self, host_params: Iterable[tuple]) -> Iterable[tuple]:
+        """Group host params by HOST_DETAILS_BATCH_SIZE, if above 1."""
+        if self.HOST_DETAILS_BATCH_SIZE == 1:
+            return host_params
+        return chunked(host_params, self.HOST_DETAILS_BATCH_SIZE)
+
+    def _unbatch_results(self, results: list) -> list:
+        """Flatten the results of batches of hosts, if HOST_DETAILS_BATCH_SIZE > 1."""
+        if self.HOST_DETAILS_BATCH_SIZE == 1:
+            return results
+        return list(itertools.chain.from_iterable(results))
 
     def _prepare_host_logging_options(self):
 
@@ -1,14 +1,16 @@
 """Satellite 5 API handlers."""
 import logging
+import threading
 import xmlrpc.client
 from collections.abc import Iterable
 from functools import partial
 
 import celery
-from more_itertools import unique_everseen
+from more_itertools import chunked, unique_everseen
 
-from api.models import SystemInspectionResult
+from api.models import ScanJob, SystemInspectionResult
 from api.scantask.model import ScanTask
+from scanner.runner import ScanJobStatusInterrupt
 from scanner.satellite import utils
 from scanner.satellite.api import SatelliteException, SatelliteInterface
 from scanner.satellite.utils import raw_facts_template
@@ -50,6 +52,178 @@ VIRTUAL_HOST_NAME = "virtual_host_name"
 HYPERVISOR = "hypervisor"
 
 
+# each host's details take one call per method, keyed by their raw result name
+HOST_DETAILS_METHODS = {
+    "uuid": "get_uuid",
+    "cpu": "get_cpu",
+    "system_details": "get_details",
+    "kernel": "get_running_kernel",
+    "subs": "get_entitlements",
+    "network_devices": "get_network_devices",
+    "registration_date": "get_registration_date",
+}
+# number of hosts whose details are requested in the same multicall
+MULTICALL_BATCH_SIZE = 10
+# fault code of an invalid or expired session key, which logging in again fixes
+INVALID_SESSION_FAULT_CODE = 2950
+
+# session of each worker thread, so each worker logs in only once per scan task
+_thread_sessions = threading.local()
+# sessions logged in by this process, until their scan task is done with them
+_open_sessions = set()
+_open_sessions_lock = threading.Lock()
+
+
+class SatelliteFiveSession:
+    """An authenticated Satellite 5 session reused for many host requests."""
+
+    def __init__(self, scan_task_id, client, user, password):
+        """Initialize the session without logging in yet."""
+        self.scan_task_id = scan_task_id
+        self.client = client
+        self.user = user
+        self.password = password
+        self.key = None
+        self.multicall_supported = True
+
+    def login(self):
+        """Log in and keep the new session key."""
+        self.logout()
+        self.key = self.client.auth.login(self.user, self.password)
+
+    def logout(self):
+        """Log out if logged in, so the server can drop the session."""
+        if self.key is None:
+            return
+        key, self.key = self.key, None
+        try:
+            self.client.auth.logout(key)
+        except (xmlrpc.client.Error, OSError) as error:
+            logger.info("Could not log out of Satellite 5: %s", error)
+
+    def request_hosts_details(self, host_ids):
+        """Request the details of several hosts.
+
+        :param host_ids: The identifiers of the hosts
+        :returns: A list with a dict of details or a Fault for each host
+        """
+        reused_key = self.key is not None
+        if not reused_key:
+            self.login()
+        results = self._request_hosts_details(host_ids)
+        failed = [
+            index for index, result in enumerate(results) if is_session_fault(result)
+        ]
+        if failed and reused_key:
+            # the session key expired, so retry once with a new one
+            self.login()
+            retried = self._request_hosts_details([host_ids[i] for i in failed])
+            for index, result in zip(failed, retried):
+                results[index] = result
+        return results
+
+    def _request_hosts_details(self, host_ids):
+        if self.multicall_supported:
+            try:
+                return self._multicall_hosts_details(host_ids)
+            except xmlrpc.client.Fault as fault:
+                logger.info(
+                    "Satellite 5 multicall unavailable, calling one method at a"
+                    " time: %s",
+                    fault,
+                )
+                self.multicall_supported = False
+        return [self._call_host_details(host_id) for host_id in host_ids]
+
+    def _multicall_hosts_details(self, host_ids):
+        multicall = xmlrpc.client.MultiCall(self.client)
+        for host_id in host_ids:
+            for method in HOST_DETAILS_METHODS.values():
+                getattr(multicall.system, method)(self.key, host_id)
+        responses = multicall()
+        results = []
+        for host_index, _ in enumerate(host_ids):
+            first_response = host_index * len(HOST_DETAILS_METHODS)
+            try:
+                results.append(
+                    {
+                        name: responses[first_response + method_index]
+                        for method_index, name in enumerate(HOST_DETAILS_METHODS)
+                    }
+                )
+            except xmlrpc.client.Fault as fault:
+                results.append(fault)
+        return results
+
+    def _call_host_details(self, host_id):
+        try:
+            return {
+                name: getattr(self.client.system, method)(self.key, host_id)
+                for name, method in HOST_DETAILS_METHODS.items()
+            }
+        except xmlrpc.client.Fault as fault:
+            return fault
+
+
+def is_session_fault(result) -> bool:
+    """Tell whether a result is a fault of a session the server no longer accepts."""
+    return isinstance(result, xmlrpc.client.Fault) and (
+        result.faultCode == INVALID_SESSION_FAULT_CODE
+        or "session" in str(result.faultString).lower()
+    )
+
+
+def get_session(scan_task: ScanTask, request_options=None) -> SatelliteFiveSession:
+    """Return the session of the current worker thread for the given scan task.
+
+    A session left by a previous scan task is logged out and replaced, as is a
+    session already closed by close_sessions.
+    """
+    session = getattr(_thread_sessions, "session", None)
+    with _open_sessions_lock:
+        is_open = session in _open_sessions
+    if not is_open or session.scan_task_id != scan_task.id:
+        if session is not None:
+            _close_session(session)
+        client, user, password = utils.get_sat5_client(scan_task, request_options)
+        session = SatelliteFiveSession(scan_task.id, client, user, password)
+        _thread_sessions.session = session
+        with _open_sessions_lock:
+            _open_sessions.add(session)
+    return session
+
+
+def close_sessions(scan_task_id: int):
+    """Log out and forget the sessions this process opened for a scan task.
+
+    It must be called once the scan task's host details requests are done, as the
+    sessions of other worker threads may be in use until then.
+    """
+    with _open_sessions_lock:
+        sessions = [
+            session
+            for session in _open_sessions
+            if session.scan_task_id == scan_task_id
+        ]
+    for session in sessions:
+        _close_session(session)
+
+
+def close_thread_session():
+    """Log out and forget the session of the current worker thread, if any."""
+    session = getattr(_thread_sessions, "session", None)
+    if session is not None:
+        _close_session(session)
+
+
+def _close_session(session: SatelliteFiveSession):
+    with _open_sessions_lock:
+        _open_sessions.discard(session)
+    if getattr(_thread_sessions, "session", None) is session:
+        _thread_sessions.session = None
+    session.logout()
+
+
 @celery.shared_task(name="request_host_details_sat_five")
 def request_host_details(  # noqa: PLR0913
     host_id,
@@ -86,49 +260,105 @@ def _request_host_details(  # noqa: PLR0913
     """
     if isinstance(scan_task, int):
         scan_task = ScanTask.objects.get(id=scan_task)
-    unique_name = f"{host_name}_{host_id}"
-    results = raw_facts_template()
-    client, user, password = utils.get_sat5_client(scan_task, request_options)
-    try:
-        message = f"REQUESTING HOST DETAILS: {unique_name}%s"
-        scan_task.log_message(message, logging.INFO, logging_options)
+    host_params = (
+        host_id,
+        host_name,
+        last_checkin,
+        scan_task,
+        request_options,
+        logging_options,
+    )
+    return _request_hosts_details(scan_task, [host_params])[0]
+
+
+def request_host_details_batch(*host_params):
+    """Request detailed data about a batch of hosts in a single round trip.
+
+    :param host_params: The params of each host, built by prepare_hosts for the
+        same scan task
+    :returns: A list of raw results, one for each host
+    """
+    scan_task = host_params[0][3]
+    if isinstance(scan_task, int):
+        scan_task = ScanTask.objects.get(id=scan_task)
+    return _request_hosts_details(scan_task, host_params)
+
 
-        key = client.auth.login(user, password)
-        uuid = client.system.get_uuid(key, host_id)
-        cpu = client.system.get_cpu(key, host_id)
-        system_details = client.system.get_details(key, host_id)
-        kernel = client.system.get_running_kernel(key, host_id)
-        subs = client.system.get_entitlements(key, host_id)
-
-        network_devices = client.system.get_network_devices(key, host_id)
-        registration_date = client.system.get_registration_date(key, host_id)
-
-        client.auth.logout(key)
-        system_inspection_result = SystemInspectionResult.SUCCESS
-        results["uuid"] = uuid
-        results["cpu"] = cpu
-        results["system_details"] = system_details
-        results["kernel"] = kernel
-        results["subs"] = subs
-        results["network_devices"] = network_devices
-        results["registration_date"] = registration_date
+def _request_hosts_details(scan_task: ScanTask, host_params):
+    """Request detailed data about several hosts in a single round trip.
 
+    :param scan_task: The current scan task
+    :param host_params: A list of host params built by prepare_hosts for the same
+        source
+    :returns: A list of raw results, one for each host
+    """
+    request_options = host_params[0][4]
+    for host_id, host_name, *_, logging_options in host_params:
+        message = f"REQUESTING HOST DETAILS: {host_name}_{host_id}"
+        scan_task.log_message(message, logging.INFO, logging_options)
+    try:
+        session = get_session(scan_task, request_options)
+        hosts_details = session.request_hosts_details(
+            [params[0] for params in host_params]
+        )
     except xmlrpc.client.Fault as xml_error:
-        error_message = f"Satellite 5 fault error encountered: {xml_error}\n"
-        logger.error(error_message)
-        system_inspection_result = SystemInspectionResult.FAILED
+        hosts_details = [xml_error] * len(host_params)
 
-    results["host_name"] = host_name
-    results["host_id"] = host_id
-    results["last_checkin"] = last_checkin
-    results["system_inspection_result"] = system_inspection_result
+    raw_results = []
+    for (host_id, host_name, last_checkin, *_), details in zip(
+        host_params, hosts_details
+    ):
+        results = raw_facts_template()
+        if isinstance(details, xmlrpc.client.Fault):
+            error_message = f"Satellite 5 fault error encountered: {details}\n"
+            logger.error(error_message)
+            system_inspection_result = SystemInspectionResult.FAILED
+        else:
+            results.update(details)
+            system_inspection_result = SystemInspectionResult.SUCCESS
+        results["host_name"] = host_name
+        results["host_id"] = host_id
+        results["last_checkin"] = last_checkin
+        results["system_inspection_result"] = system_inspection_result
+        raw_results.append(results)
+    return raw_results
+
+
+@celery.shared_task(name="record_host_details_chunk_sat_five")
+def record_host_details_chunk(
+    scan_task_id: int, host_params_chunk, virtual_hosts, virtual_guests, physical_hosts
+):
+    """Request and record the details of a chunk of hosts as a Celery task.
 
-    return results
+    :param scan_task_id: The id of the inspect scan task
+    :param host_params_chunk: A list of host params built by prepare_hosts
+    :param virtual_hosts: A list of virtual host id and data pairs
+    :param virtual_guests: A list of guest id and virtual host id pairs
+    :param physical_hosts: A list of physical host ids
+    """
+    # JSON objects can't have integer keys, so the dicts are sent as pairs.
+    scan_task = ScanTask.objects.get(id=scan_task_id)
+    manager_interrupt = ScanJobStatusInterrupt(scan_task.job_id)
+    results = []
+    try:
+        for host_params_batch in chunked(host_params_chunk, MULTICALL_BATCH_SIZE):
+            if manager_interrupt.value != ScanJob.JOB_RUN:
+                break
+            results.extend(_request_hosts_details(scan_task, host_params_batch))
+    finally:
+        # other chunks of the scan task may still be using their own sessions
+        close_thread_session()
+    SatelliteFive(scan_task.job, scan_task).process_results(
+        results, dict(virtual_hosts), dict(virtual_guests), physical_hosts
+    )
 
 
 class SatelliteFive(SatelliteInterface):
     """Interact with Satellite 5."""
 
+    HOST_DETAILS_BATCH_SIZE = MULTICALL_BATCH_SIZE
+    close_host_sessions = staticmethod(close_sessions)
+
     def host_count(self):
         """Obtain the count of managed hosts."""
         systems_count = 0
@@ -406,7 +636,13 @@ class SatelliteFive(SatelliteInterface):
         )
 
         self._prepare_and_process_hosts(
-            hosts, request_host_details, _process_results, manager_interrupt
+            hosts,
+            request_host_details_batch,
+            _process_results,
+            manager_interrupt,
+            record_host_details_chunk.s(
+                virtual_hosts=list(virtual_hosts.items()),
+                virtual_guests=list(virtual_guests.items()),
+                physical_hosts=physical_hosts,
+            ),
         )
-
-        utils.validate_task_stats(self.inspect_scan_task)
@@ -29,8 +29,12 @@ class InspectTaskRunner(SatelliteTaskRunner):
                 f"Prerequisites scan task {conn_task.sequence_number} failed."
             )
             return error_message, ScanTask.FAILED
-        return super().execute_task(manager_interrupt)
+        message, status = super().execute_task(manager_interrupt)
+        if status == ScanTask.COMPLETED and self.celery_continuation:
+            return message, ScanTask.RUNNING
+        return message, status
 
     def handle_api_calls(self, api, manager_interrupt):
         """Handle api calls for inspection phase."""
         api.hosts_facts(manager_interrupt)
+        self.celery_continuation = api.host_details_signature
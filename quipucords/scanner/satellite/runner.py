@@ -4,9 +4,11 @@ import logging
 import socket
 from abc import ABCMeta, abstractmethod
 
+from django.conf import settings
 from requests import exceptions
 
 from api.models import ScanTask
+from compat.requests import ResponseCache
 from scanner.exceptions import ScanFailureError
 from scanner.runner import ScanTaskRunner
 from scanner.satellite import utils
@@ -27,6 +29,16 @@ class SatelliteTaskRunner(ScanTaskRunner, metaclass=ABCMeta):
         socket.gaierror,
     )
 
+    def run(self, manager_interrupt=None):
+        """Run the task, then log and evict stale responses from the response cache."""
+        try:
+            return super().run(manager_interrupt)
+        finally:
+            utils.close_response_cache(self.scan_task.id)
+            if settings.QPC_ENABLE_HTTP_RESPONSE_CACHE:
+                # eviction covers the responses of all sources and users
+                ResponseCache(str(self.scan_task.source_id)).evict()
+
     def _initialize_api_object(self):
         status_code, api_version, satellite_version = utils.status(self.scan_task)
         if status_code is None:
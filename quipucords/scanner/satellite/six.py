@@ -5,14 +5,18 @@ import itertools
 import logging
 from abc import ABCMeta, abstractmethod
 from collections.abc import Generator, Iterable
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
+from math import ceil
 
 import celery
 import requests
+from django.conf import settings
 from more_itertools import unique_everseen
 from requests.exceptions import Timeout
 
-from api.models import ScanTask, SystemInspectionResult
+from api.models import ScanJob, ScanTask, SystemInspectionResult
+from scanner.runner import ScanJobStatusInterrupt
 from scanner.satellite import utils
 from scanner.satellite.api import SatelliteException, SatelliteInterface
 from scanner.satellite.utils import raw_facts_template
@@ -25,6 +29,8 @@ PER_PAGE = "per_page"
 PAGE = "page"
 THIN = "thin"
 RESULTS = "results"
+TOTAL = "total"
+SUBTOTAL = "subtotal"
 ID = "id"
 NAME = "name"
 OS_NAME = "os_name"
@@ -82,6 +88,10 @@ HOSTS_SUBS_V2_URL = "https://{sat_host}:{port}/api/v2/hosts/{host_id}/subscripti
 
 QUERY_PARAMS_FIELDS = {"fields": "full"}
 
+# host records listed in bulk must include these fields to skip the per-host
+# fields request; subscriptions are never listed and always requested per host
+BULK_HOST_FIELDS = (FACTS, SUBSCRIPTION_FACET)
+
 FIELDS_MAPPING = {
     "uuid": "uuid",
     "hostname": "name",
@@ -133,6 +143,30 @@ ERRATA_MAPPING = {
 }
 
 
+def request_page(  # noqa: PLR0913
+    scan_task: ScanTask,
+    url_template: str,
+    query_params: dict,
+    org_id=None,
+    host_id=None,
+    options=None,
+) -> dict:
+    """Request one page for the given scan_task and url_template."""
+    response, url = utils.execute_request(
+        scan_task,
+        url=url_template,
+        org_id=org_id,
+        host_id=host_id,
+        query_params=query_params,
+        options=options,
+    )
+    if response.status_code != requests.codes.ok:
+        raise SatelliteException(
+            f"Invalid response code {response.status_code}" f" for url: {url}"
+        )
+    return response.json()
+
+
 def request_results(  # noqa: PLR0913
     scan_task: ScanTask,
     url_template: str,
@@ -149,19 +183,9 @@ def request_results(  # noqa: PLR0913
     """
     for page in itertools.count(1):
         query_params = {PAGE: page, PER_PAGE: per_page, THIN: 1}
-        response, url = utils.execute_request(
-            scan_task,
-            url=url_template,
-            org_id=org_id,
-            host_id=host_id,
-            query_params=query_params,
-            options=options,
+        response_body = request_page(
+            scan_task, url_template, query_params, org_id, host_id, options
         )
-        if response.status_code != requests.codes.ok:
-            raise SatelliteException(
-                f"Invalid response code {response.status_code}" f" for url: {url}"
-            )
-        response_body = response.json()
         results = response_body.get(RESULTS, [])
         for result in results:
             yield result
@@ -170,6 +194,46 @@ def request_results(  # noqa: PLR0913
             break
 
 
+def request_full_results(  # noqa: PLR0913
+    scan_task: ScanTask,
+    url_template: str,
+    max_concurrency: int,
+    org_id=None,
+    options=None,
+    per_page: int = 100,
+) -> Generator[dict, None, None]:
+    """
+    Request and yield full (not thin) results, fetching pages concurrently.
+
+    The first page tells how many results exist. The remaining pages are then
+    requested by up to max_concurrency threads, and their results are yielded in
+    page order.
+    """
+    _request_page = partial(
+        request_page, scan_task, url_template, org_id=org_id, options=options
+    )
+    first_page = _request_page({PAGE: 1, PER_PAGE: per_page, **QUERY_PARAMS_FIELDS})
+    yield from first_page.get(RESULTS, [])
+    total = int(first_page.get(SUBTOTAL, first_page.get(TOTAL, 0)))
+    page_count = ceil(total / per_page)
+    if page_count < 2:  # noqa: PLR2004
+        return
+    # keep a connection alive for each thread
+    utils.get_session(max_concurrency)
+    with ThreadPoolExecutor(
+        max_workers=min(max_concurrency, page_count - 1)
+    ) as executor:
+        pages = executor.map(
+            _request_page,
+            (
+                {PAGE: page, PER_PAGE: per_page, **QUERY_PARAMS_FIELDS}
+                for page in range(2, page_count + 1)
+            ),
+        )
+        for response_body in pages:
+            yield from response_body.get(RESULTS, [])
+
+
 def host_fields(api_version, response):  # noqa: PLR0912, PLR0915, C901
     """Obtain the fields for a given host id.
 
@@ -291,6 +355,16 @@ def host_subscriptions(response):
     return subs_dict
 
 
+def has_bulk_host_fields(host: dict) -> bool:
+    """Tell if a listed host has the fields to skip the per-host fields request."""
+    return all(field in host for field in BULK_HOST_FIELDS)
+
+
+def host_unique_key(host: dict):
+    """Identify a listed host regardless of how many fields were listed."""
+    return host.get(ID), host.get(NAME)
+
+
 @celery.shared_task(name="request_host_details_sat_six")
 def request_host_details(  # noqa: PLR0913
     scan_task: ScanTask | int,
@@ -300,6 +374,7 @@ def request_host_details(  # noqa: PLR0913
     fields_url,
     subs_url,
     request_options,
+    host_fields_json=None,
 ):
     """Wrap _request_host_details to call it as an async Celery task."""
     return _request_host_details(
@@ -310,6 +385,7 @@ def request_host_details(  # noqa: PLR0913
         fields_url,
         subs_url,
         request_options,
+        host_fields_json,
     )
 
 
@@ -321,6 +397,7 @@ def _request_host_details(  # noqa: PLR0913
     fields_url,
     subs_url,
     request_options,
+    host_fields_json=None,
 ):
     """Request detailed data about a specific host from the Satellite server.
 
@@ -332,6 +409,8 @@ def _request_host_details(  # noqa: PLR0913
     :param subs_url: The sat61 or sat62 subs url
     :param request_options: A dictionary containing host, port,
         ssl_cert_verify, user, and password
+    :param host_fields_json: The host fields if they were already listed in bulk,
+        otherwise they are requested from fields_url
     :returns: A dictionary containing the unique name for the host,
         the response & url for host_fields request, and the
         response & url for the host_subs request.
@@ -339,25 +418,20 @@ def _request_host_details(  # noqa: PLR0913
     if isinstance(scan_task, int):
         scan_task = ScanTask.objects.get(id=scan_task)
     unique_name = f"{host_name}_{host_id}"
+    listed_host_fields_json = host_fields_json
     host_fields_json = {}
     host_subscriptions_json = {}
     results = {}
     try:
         message = f"REQUESTING HOST DETAILS: {unique_name}"
         scan_task.log_message(message, logging.INFO, logging_options)
-        host_fields_response, host_fields_url = utils.execute_request(
-            scan_task,
-            url=fields_url,
-            org_id=None,
-            host_id=host_id,
-            query_params=QUERY_PARAMS_FIELDS,
-            options=request_options,
-        )
-
-        if host_fields_response.status_code != requests.codes.ok:
-            raise SatelliteException(
-                f"Invalid response code {host_fields_response.status_code}"
-                f" for url: {host_fields_url}"
+        if listed_host_fields_json is None:
+            listed_host_fields_json = request_page(
+                scan_task,
+                fields_url,
+                QUERY_PARAMS_FIELDS,
+                host_id=host_id,
+                options=request_options,
             )
         host_subscriptions_response, host_subscriptions_url = utils.execute_request(
             scan_task,
@@ -389,7 +463,7 @@ def _request_host_details(  # noqa: PLR0913
                 f" for url: {host_subscriptions_url}"
             )
         system_inspection_result = SystemInspectionResult.SUCCESS
-        host_fields_json = host_fields_response.json()
+        host_fields_json = listed_host_fields_json
         host_subscriptions_json = host_subscriptions_response.json()
     except SatelliteException as sat_error:
         error_message = f"Satellite 6 unknown error encountered: {sat_error}\n"
@@ -431,6 +505,28 @@ def process_results(self, results, api_version):
             )
 
 
+@celery.shared_task(name="record_host_details_chunk_sat_six")
+def record_host_details_chunk(scan_task_id: int, host_params_chunk, api_version):
+    """Request and record the details of a chunk of hosts as a Celery task.
+
+    :param scan_task_id: The id of the inspect scan task
+    :param host_params_chunk: A list of host params built by prepare_hosts
+    :param api_version: The Satellite 6 API version
+    """
+    scan_task = ScanTask.objects.get(id=scan_task_id)
+    satellite = SATELLITE_SIX_CLASSES[api_version](scan_task.job, scan_task)
+    manager_interrupt = ScanJobStatusInterrupt(scan_task.job_id)
+    results = []
+    try:
+        for host_params in host_params_chunk:
+            if manager_interrupt.value != ScanJob.JOB_RUN:
+                break
+            results.append(_request_host_details(scan_task, *host_params[1:]))
+    finally:
+        utils.close_response_cache(scan_task_id)
+    process_results(satellite, results, api_version)
+
+
 class SatelliteSix(SatelliteInterface, metaclass=ABCMeta):
     """Interact with Satellite 6."""
 
@@ -439,12 +535,15 @@ class SatelliteSix(SatelliteInterface, metaclass=ABCMeta):
     HOSTS_URL: str
     SATELLITE_API_VERSION: int
 
+    close_host_sessions = staticmethod(utils.close_response_cache)
+
     def prepare_hosts(self, hosts: Iterable[dict], ids_only=False):
         """Prepare each host with necessary information.
 
         :param hosts: an iterable of dicts that each contain information about one host
         :param ids_only: bool to determine inclusion of ids or whole ScanTask objects
-        :return: A list of tuples that contain information about each host.
+        :return: A list of tuples that contain information about each host. Hosts
+            listed in bulk with all BULK_HOST_FIELDS also include their fields.
         """
         host_params = [
             (
@@ -456,11 +555,24 @@ class SatelliteSix(SatelliteInterface, metaclass=ABCMeta):
                 self.HOSTS_SUBS_URL,
                 self._prepare_host_request_options(),
             )
+            + ((host,) if has_bulk_host_fields(host) else ())
             for host in hosts
         ]
 
         return host_params
 
+    def _request_hosts(self, org_id=None):
+        """Request the hosts, with their full fields in bulk if enabled."""
+        if not settings.QPC_ENABLE_SATELLITE_BULK_HOST_FIELDS:
+            return request_results(self.inspect_scan_task, self.HOSTS_URL, org_id)
+        return request_full_results(
+            self.inspect_scan_task,
+            self.HOSTS_URL,
+            self.max_concurrency,
+            org_id=org_id,
+            options=self._prepare_host_request_options(),
+        )
+
     def _request_and_record_hosts(self, credential, org_id=None):
         """Request and record hosts for the given credential and optional org filter."""
         hosts = []
@@ -496,11 +608,13 @@ class SatelliteSix(SatelliteInterface, metaclass=ABCMeta):
         )
 
         self._prepare_and_process_hosts(
-            hosts, request_host_details, _process_results, manager_interrupt
+            hosts,
+            request_host_details,
+            _process_results,
+            manager_interrupt,
+            record_host_details_chunk.s(api_version=self.SATELLITE_API_VERSION),
         )
 
-        utils.validate_task_stats(self.inspect_scan_task)
-
 
 class SatelliteSixV1(SatelliteSix):
     """Interact with Satellite 6, API version 1."""
@@ -573,9 +687,9 @@ class SatelliteSixV1(SatelliteSix):
         """Get an iterable of all unique hosts spanning all orgs."""
         hosts = unique_everseen(
             itertools.chain.from_iterable(
-                request_results(self.inspect_scan_task, self.HOSTS_URL, org_id)
-                for org_id in self.get_orgs()
-            )
+                self._request_hosts(org_id) for org_id in self.get_orgs()
+            ),
+            key=host_unique_key,
         )
         return hosts
 
@@ -611,4 +725,10 @@ class SatelliteSixV2(SatelliteSix):
 
     def _requests_hosts_unique(self):
         """Get an iterable of all unique hosts."""
-        return unique_everseen(request_results(self.inspect_scan_task, self.HOSTS_URL))
+        return unique_everseen(self._request_hosts(), key=host_unique_key)
+
+
+SATELLITE_SIX_CLASSES = {
+    SatelliteSixV1.SATELLITE_API_VERSION: SatelliteSixV1,
+    SatelliteSixV2.SATELLITE_API_VERSION: SatelliteSixV2,
+}
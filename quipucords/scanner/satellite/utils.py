@@ -1,14 +1,19 @@
 """Utilities used for Satellite operations."""
 
 import logging
+import os
 import ssl
+import threading
 import xmlrpc.client
+from http.cookiejar import DefaultCookiePolicy
 
 import requests
 from django.conf import settings
 from rest_framework import status as codes
 
+from api.scan.model import DEFAULT_MAX_CONCURRENCY
 from api.vault import decrypt_data_as_unicode
+from compat.requests import ResponseCache, Session
 from scanner.satellite.api import (
     SATELLITE_VERSION_5,
     SATELLITE_VERSION_6,
@@ -21,6 +26,81 @@ logger = logging.getLogger(__name__)
 # Disable warnings for satellite requests
 requests.packages.urllib3.disable_warnings()
 
+# Satellite sessions of each process, with the size of their connection pool
+_sessions = {}  # type: dict[int, tuple[Session, int]]
+_sessions_lock = threading.Lock()
+# response caches of each process and scan task, with the scan task logging them
+_response_caches = {}  # type: dict[tuple[int, int], tuple[ResponseCache, ScanTask]]
+_response_caches_lock = threading.Lock()
+
+
+def get_session(max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> Session:
+    """Get the HTTP session shared by all Satellite requests of this process.
+
+    Reusing the session keeps connections alive between requests, avoiding a new
+    TCP and TLS handshake for each of them. Connections are pooled by server, and
+    the session keeps no cookies, so sources and credentials never share anything
+    else. Connections can't be shared with forked processes, so each process gets
+    its own session.
+
+    :param max_concurrency: number of requests that may be sent to the same server
+        at the same time. The session is replaced by one with a larger connection
+        pool if its pool can't keep that many connections alive.
+    """
+    pid = os.getpid()
+    with _sessions_lock:
+        session, pool_maxsize = _sessions.get(pid, (None, 0))
+        if pool_maxsize < max_concurrency:
+            session = _create_session(max_concurrency)
+            _sessions[pid] = session, max_concurrency
+    return session
+
+
+def _create_session(pool_maxsize: int) -> Session:
+    """Create an HTTP session keeping up to pool_maxsize connections per server."""
+    # Return the last response when retries are exhausted so callers can report
+    # its status code like for any other unexpected response.
+    session = Session(raise_on_status=False, pool_maxsize=pool_maxsize)
+    # Each request sends the credential of its source, while the session is shared
+    # by all sources and credentials, so no cookie must outlive its request.
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+def get_response_cache(scan_task) -> ResponseCache | None:
+    """Get the ResponseCache of a scan task's source and credential, if enabled.
+
+    The session is shared by all sources and credentials, so the cache is passed
+    to each request instead of the session. Each process keeps one cache per scan
+    task, so its stats add up over the requests of all threads until
+    close_response_cache logs them.
+    """
+    if not settings.QPC_ENABLE_HTTP_RESPONSE_CACHE:
+        return None
+    key = os.getpid(), scan_task.id
+    with _response_caches_lock:
+        if key not in _response_caches:
+            credential = get_credential(scan_task)
+            _response_caches[key] = (
+                ResponseCache(f"{scan_task.source_id}:{credential.id}"),
+                scan_task,
+            )
+        return _response_caches[key][0]
+
+
+def close_response_cache(scan_task_id: int) -> ResponseCache | None:
+    """Log how this process used the ResponseCache of a scan task, and forget it.
+
+    :returns: the ResponseCache, or None if this process didn't use one
+    """
+    with _response_caches_lock:
+        cache, scan_task = _response_caches.pop(
+            (os.getpid(), scan_task_id), (None, None)
+        )
+    if cache is not None:
+        scan_task.log_message(cache.summary())
+    return cache
+
 
 def get_credential(scan_task):
     """Extract the credential from the scan task.
@@ -127,12 +207,13 @@ def execute_request(  # noqa: PLR0913
     connect_timeout = settings.QPC_SSH_CONNECT_TIMEOUT
     inspect_timeout = settings.QPC_SSH_INSPECT_TIMEOUT
 
-    response = requests.get(
+    response = get_session().get(
         url,
         auth=(user, password),
         timeout=(connect_timeout, inspect_timeout),
         params=query_params,
         verify=ssl_verify,
+        cache=get_response_cache(scan_task),
     )
     return response, url
 
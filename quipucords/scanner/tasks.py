@@ -2,13 +2,15 @@
 import logging
 
 import celery
+from django.conf import settings
 
+from api.reports.artifacts import precompute_report_artifacts
 from api.scanjob.model import ScanJob
 from api.scantask.model import ScanTask
 from fingerprinter.runner import FingerprintTaskRunner
 from scanner.get_scanner import get_scanner
 from scanner.job import create_details_report_for_scan_job, run_task_runner
-from scanner.runner import ScanTaskRunner
+from scanner.runner import ScanJobStatusInterrupt, ScanTaskRunner
 
 logger = logging.getLogger(__name__)
 
@@ -46,7 +48,11 @@ def _celery_run_task_runner(
     scan_task = ScanTask.objects.get(id=scan_task_id)
     runner_class = get_task_runner_class(source_type, scan_type)
     runner: ScanTaskRunner = runner_class(scan_task.job, scan_task)
-    success = (task_status := run_task_runner(runner)) == ScanTask.COMPLETED
+    task_status = run_task_runner(runner, ScanJobStatusInterrupt(scan_task.job_id))
+    if task_status == ScanTask.RUNNING:
+        # The remaining work was split into other tasks that take this one's place.
+        return task_instance.replace(runner.celery_continuation)
+    success = task_status == ScanTask.COMPLETED
     if not success:
         # If this task failed, we do not want subsequent tasks in its chain to run.
         task_instance.request.chain = None
@@ -71,6 +77,10 @@ def _fingerprint(scan_task_id: int) -> tuple[bool, int, str]:
     # It is safe to assume one will always exist at this point.
     scan_task = ScanTask.objects.get(id=scan_task_id)
     scan_job = scan_task.job
+    manager_interrupt = ScanJobStatusInterrupt(scan_job.id)
+    if manager_interrupt.value != ScanJob.JOB_RUN:
+        # Pausing or canceling the scan job already updated this task's status.
+        return False, scan_task_id, scan_task.status
 
     if not (details_report := scan_task.details_report):
         details_report, error_message = create_details_report_for_scan_job(scan_job)
@@ -87,12 +97,16 @@ def _fingerprint(scan_task_id: int) -> tuple[bool, int, str]:
     # Yes, that feels redundant, but I'm just preserving existing behavior.
 
     runner = FingerprintTaskRunner(scan_job, scan_task)
-    success = (task_status := run_task_runner(runner)) == ScanTask.COMPLETED
+    success = (
+        task_status := run_task_runner(runner, manager_interrupt)
+    ) == ScanTask.COMPLETED
     details_report.refresh_from_db()
     if success:
         scan_job.report_id = details_report.deployment_report.id
         scan_job.save()
         scan_job.log_message(f"Report {scan_job.report_id:d} created.")
+        if settings.QPC_ENABLE_REPORT_ARTIFACTS:
+            precompute_artifacts.delay(scan_job.report_id)
     else:
         scan_task.log_message(
             f"Task {scan_task.sequence_number} failed.", log_level=logging.ERROR
@@ -102,6 +116,12 @@ def _fingerprint(scan_task_id: int) -> tuple[bool, int, str]:
     return success, scan_task_id, task_status
 
 
+@celery.shared_task
+def precompute_artifacts(report_id: int) -> list[str]:
+    """Wrap precompute_report_artifacts to call it as an async Celery task."""
+    return precompute_report_artifacts(report_id)
+
+
 @celery.shared_task
 def finalize_scan(scan_job_id: int):
     """Wrap _finalize_scan to call it as an async Celery task."""
@@ -114,6 +134,9 @@ def _finalize_scan(scan_job_id: int):
     This logic follows the basic pattern established in SyncScanJobRunner.run.
     """
     scan_job = ScanJob.objects.get(id=scan_job_id)
+    if scan_job.status in (ScanTask.PAUSED, ScanTask.CANCELED):
+        # Paused or canceled scan jobs are not finished, nor failed.
+        return
     failed_tasks = (
         ScanTask.objects.filter(job_id=scan_job_id)
         .exclude(status=ScanTask.COMPLETED)
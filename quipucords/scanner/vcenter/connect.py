@@ -2,10 +2,14 @@
 import logging
 from socket import gaierror
 
+from django.conf import settings
+from django.db import transaction
+from more_itertools import chunked
 from pyVmomi import vim, vmodl
 
 from api.models import ScanTask, SystemConnectionResult
 from scanner.runner import ScanTaskRunner
+from scanner.vcenter.inspect import InspectTaskRunner
 from scanner.vcenter.utils import retrieve_properties, vcenter_connect
 
 logger = logging.getLogger(__name__)
@@ -76,16 +80,23 @@ class ConnectTaskRunner(ScanTaskRunner):
             "INITIAL VCENTER CONNECT STATS.", sys_count=len(connected)
         )
 
-        for system in connected:
-            sys_result = SystemConnectionResult(
-                name=system,
-                status=SystemConnectionResult.SUCCESS,
-                credential=credential,
-                source=source,
-                task_connection_result=self.scan_task.connection_result,
-            )
-            sys_result.save()
-            self.scan_task.increment_stats(sys_result.name, increment_sys_scanned=True)
+        for batch in chunked(connected, settings.QPC_VCENTER_SAVE_BATCH_SIZE):
+            with transaction.atomic():
+                SystemConnectionResult.objects.bulk_create(
+                    SystemConnectionResult(
+                        name=system,
+                        status=SystemConnectionResult.SUCCESS,
+                        credential=credential,
+                        source=source,
+                        task_connection_result=self.scan_task.connection_result,
+                    )
+                    for system in batch
+                )
+                self.scan_task.increment_stats(
+                    f"{len(batch)} virtual machines",
+                    increment_sys_scanned=True,
+                    amount=len(batch),
+                )
 
         self.scan_task.connection_result.save()
 
@@ -94,7 +105,7 @@ class ConnectTaskRunner(ScanTaskRunner):
         source = self.scan_task.source
         credential = self.scan_task.source.credentials.all().first()
         try:
-            connected = self.connect()
+            connected = self.connect(manager_interrupt)
             self._store_connect_data(connected, credential, source)
         except vim.fault.InvalidLogin as vm_error:
             error_message = (
@@ -110,15 +121,47 @@ class ConnectTaskRunner(ScanTaskRunner):
 
         return None, ScanTask.COMPLETED
 
-    def connect(self):
+    def connect(self, manager_interrupt=None):
         """Execute the connect scan with the initialized source.
 
+        :param manager_interrupt: Signal to indicate job is canceled
         :returns: list of connected vm credential tuples
         """
         vm_names = []
 
         vcenter = vcenter_connect(self.scan_task)
         content = vcenter.RetrieveContent()
-        vm_names = get_vm_names(content)
+        inspect_scan_task = self.get_inspect_scan_task()
+        if settings.QPC_ENABLE_VCENTER_COMBINED_SCAN and inspect_scan_task:
+            vm_names = self.inspect(content, inspect_scan_task, manager_interrupt)
+        else:
+            vm_names = get_vm_names(content)
+
+        return vm_names
+
+    def get_inspect_scan_task(self):
+        """Get the inspect scan task that depends on this one, if any."""
+        return ScanTask.objects.filter(
+            job=self.scan_task.job,
+            source=self.scan_task.source,
+            scan_type=ScanTask.SCAN_TYPE_INSPECT,
+        ).first()
+
+    def inspect(self, content, inspect_scan_task, manager_interrupt=None):
+        """Record the inspection results of the inspect scan task.
 
+        The inspect scan task then completes without connecting to the vCenter
+        again, so the vCenter is logged into and traversed only once.
+
+        :returns: list of inspected vm names
+        """
+        inspect_runner = InspectTaskRunner(self.scan_job, inspect_scan_task)
+        inspect_runner.cleanup_inspection_results()
+        inspect_runner.retrieve_properties(content, manager_interrupt)
+        vm_names = list(
+            inspect_scan_task.inspection_result.systems.values_list("name", flat=True)
+        )
+        inspect_scan_task.update_stats(
+            "INITIAL VCENTER CONNECT STATS.", sys_count=len(vm_names)
+        )
         return vm_names
@@ -1,8 +1,14 @@
 """ScanTask used for vcenter inspection task."""
+import itertools
 import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from django.conf import settings
 from django.db import transaction
+from more_itertools import chunked
 from pyVmomi import vim, vmodl
 
 from api.models import RawFact, ScanTask, SystemInspectionResult
@@ -17,6 +23,9 @@ from scanner.vcenter.utils import (
 
 logger = logging.getLogger(__name__)
 
+# seconds to wait for a page before checking if collection should stop
+PAGE_QUEUE_TIMEOUT = 1
+
 
 def get_nics(guest_net):
     """Get the network information for a VM.
@@ -46,6 +55,15 @@ class InspectTaskRunner(ScanTaskRunner):
 
     supports_partial_results = False
 
+    def cleanup_unsupported_partial_results(self):
+        """Clean partial results unless the connect task records them."""
+        if not settings.QPC_ENABLE_VCENTER_COMBINED_SCAN:
+            self.cleanup_inspection_results()
+
+    def cleanup_inspection_results(self):
+        """Clean the results of a previous inspection."""
+        super().cleanup_unsupported_partial_results()
+
     def execute_task(self, manager_interrupt):
         """Scan vcenter range and attempt scan."""
         source = self.scan_task.source
@@ -59,8 +77,21 @@ class InspectTaskRunner(ScanTaskRunner):
             )
             return error_message, ScanTask.FAILED
 
+        if settings.QPC_ENABLE_VCENTER_COMBINED_SCAN:
+            if self.has_combined_scan_results(connect_scan_task):
+                self.scan_task.log_message(
+                    "Inspection results were recorded by the connect task"
+                )
+                return None, ScanTask.COMPLETED
+            self.scan_task.log_message(
+                "Connect task did not record the inspection results,"
+                " inspecting the vCenter again",
+                log_level=logging.WARNING,
+            )
+            self.cleanup_inspection_results()
+
         try:
-            self.inspect()
+            self.inspect(manager_interrupt)
         except vim.fault.InvalidLogin as vm_error:
             error_message = (
                 f"Unable to connect to VCenter source, {source.name}, "
@@ -71,6 +102,16 @@ class InspectTaskRunner(ScanTaskRunner):
 
         return None, ScanTask.COMPLETED
 
+    def has_combined_scan_results(self, connect_scan_task):
+        """Check the connect task recorded the inspection of all its systems.
+
+        It doesn't when it ran before the combined scan was enabled, or when its
+        inspection results were cleaned after it completed.
+        """
+        inspected_count = self.scan_task.inspection_result.systems.count()
+        connected_count = connect_scan_task.connection_result.systems.count()
+        return inspected_count == connected_count
+
     def parse_parent_props(self, obj, props):
         """Parse Parent properties.
 
@@ -133,12 +174,12 @@ class InspectTaskRunner(ScanTaskRunner):
 
         return facts
 
-    @transaction.atomic
     def parse_vm_props(self, props, host_dict):  # noqa: PLR0912, C901
         """Parse Virtual Machine properties.
 
         :param props: Array of Dynamic Properties
         :param host_dict: Dictionary of host properties
+        :returns: dictionary of raw facts
         """
         now = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
 
@@ -187,49 +228,133 @@ class InspectTaskRunner(ScanTaskRunner):
                         HostRawFacts.DATACENTER
                     )
 
-        vm_name = facts[VcenterRawFacts.NAME]
+        logger.debug("system %s facts=%s", facts[VcenterRawFacts.NAME], facts)
+        return facts
 
-        logger.debug("system %s facts=%s", vm_name, facts)
+    @transaction.atomic
+    def save_vms_facts(self, vms_facts):
+        """Save the raw facts of a batch of Virtual Machines.
 
-        sys_result = SystemInspectionResult(
-            name=vm_name,
-            status=SystemInspectionResult.SUCCESS,
-            source=self.scan_task.source,
-            task_inspection_result=self.scan_task.inspection_result,
+        :param vms_facts: List of dictionaries of raw facts
+        """
+        sys_results = SystemInspectionResult.objects.bulk_create(
+            SystemInspectionResult(
+                name=facts[VcenterRawFacts.NAME],
+                status=SystemInspectionResult.SUCCESS,
+                source=self.scan_task.source,
+                task_inspection_result=self.scan_task.inspection_result,
+            )
+            for facts in vms_facts
+        )
+        RawFact.objects.bulk_create(
+            RawFact(name=key, value=val, system_inspection_result=sys_result)
+            for sys_result, facts in zip(sys_results, vms_facts)
+            for key, val in facts.items()
+            if val is not None
+        )
+        self.scan_task.increment_stats(
+            f"{len(vms_facts)} virtual machines",
+            increment_sys_scanned=True,
+            amount=len(vms_facts),
         )
-        sys_result.save()
-
-        for key, val in facts.items():
-            if val is not None:
-                stored_fact = RawFact(
-                    name=key, value=val, system_inspection_result=sys_result
-                )
-                stored_fact.save()
 
-        self.scan_task.increment_stats(vm_name, increment_sys_scanned=True)
-
-    def retrieve_properties(self, content):  # noqa: C901
-        """Retrieve properties from all VirtualMachines.
+    def retrieve_objects(
+        self, content, property_set, root=None, property_collector=None
+    ):
+        """Retrieve the objects matching property_set, one page at a time.
 
         :param content: ServiceInstanceContent from the vCenter connection
+        :param property_set: list of PropertySpec of the objects to retrieve
+        :param root: object to start the traversal from (default is the root folder)
+        :param property_collector: PropertyCollector to retrieve the objects with
+            (default is the session's PropertyCollector)
+        :returns: a generator of lists of ObjectContent
         """
-        spec_set = self._filter_set(content.rootFolder)
-        options = vmodl.query.PropertyCollector.RetrieveOptions()
+        root = root or content.rootFolder
+        property_collector = property_collector or content.propertyCollector
+        spec_set = self._filter_set(root, property_set)
+        options = vmodl.query.PropertyCollector.RetrieveOptions(
+            maxObjects=settings.QPC_VCENTER_MAX_OBJECTS_PER_PAGE
+        )
 
-        result = content.propertyCollector.RetrievePropertiesEx(
+        result = property_collector.RetrievePropertiesEx(
             specSet=spec_set, options=options
         )
+        while result is not None:
+            yield result.objects
+            if result.token is None:
+                break
+            result = property_collector.ContinueRetrievePropertiesEx(result.token)
 
-        objects = []
+    def retrieve_vm_objects(self, content, datacenters):
+        """Retrieve VirtualMachine objects, one page at a time.
 
-        while result is not None:
-            token = result.token
-            objects.extend(result.objects)
+        Each datacenter is traversed by its own thread and PropertyCollector, up to
+        QPC_VCENTER_MAX_CONCURRENT_DATACENTERS at once. Pages are handed over to the
+        calling thread, which keeps all database access to itself.
 
-            if token is None:
-                break
+        :param content: ServiceInstanceContent from the vCenter connection
+        :param datacenters: list of Datacenter to traverse
+        :returns: a generator of lists of ObjectContent
+        """
+        property_set = self._vm_property_set()
+        max_workers = min(
+            len(datacenters), settings.QPC_VCENTER_MAX_CONCURRENT_DATACENTERS
+        )
+        if max_workers <= 1:
+            yield from self.retrieve_objects(content, property_set)
+            return
+
+        pages = queue.Queue(maxsize=max_workers)
+        stop = threading.Event()
+
+        def collect(datacenter):
+            property_collector = content.propertyCollector.CreatePropertyCollector()
+            try:
+                for page in self.retrieve_objects(
+                    content, property_set, datacenter, property_collector
+                ):
+                    while not stop.is_set():
+                        try:
+                            pages.put(page, timeout=PAGE_QUEUE_TIMEOUT)
+                            break
+                        except queue.Full:
+                            continue
+                    if stop.is_set():
+                        return
+            finally:
+                property_collector.DestroyPropertyCollector()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(collect, dc) for dc in datacenters]
+            try:
+                while not (all(future.done() for future in futures) and pages.empty()):
+                    try:
+                        yield pages.get(timeout=PAGE_QUEUE_TIMEOUT)
+                    except queue.Empty:
+                        continue
+                for future in futures:
+                    future.result()
+            finally:
+                stop.set()
+
+    def retrieve_properties(self, content, manager_interrupt=None):
+        """Retrieve properties from all VirtualMachines.
 
-            result = content.propertyCollector.ContinueRetrievePropertiesEx(token)
+        The small topology of folders, datacenters, clusters and hosts is
+        retrieved first, then virtual machines are parsed and saved one page at a
+        time and saved in batches so the whole inventory is never held in memory.
+        Datacenters are traversed concurrently, and the scan job is checked for
+        interruptions between pages.
+
+        :param content: ServiceInstanceContent from the vCenter connection
+        :param manager_interrupt: Signal to indicate job is canceled
+        """
+        objects = list(
+            itertools.chain.from_iterable(
+                self.retrieve_objects(content, self._topology_property_set())
+            )
+        )
 
         parents_dict = {}
         for object_content in objects:
@@ -253,11 +378,20 @@ class InspectTaskRunner(ScanTaskRunner):
                 props = object_content.propSet
                 host_dict[str(obj)] = self.parse_host_props(props, cluster_dict)
 
-        for object_content in objects:
-            obj = object_content.obj
-            if isinstance(obj, vim.VirtualMachine):
-                props = object_content.propSet
-                self.parse_vm_props(props, host_dict)
+        datacenters = [
+            object_content.obj
+            for object_content in objects
+            if isinstance(object_content.obj, vim.Datacenter)
+        ]
+        for vm_objects in self.retrieve_vm_objects(content, datacenters):
+            self.check_for_interrupt(manager_interrupt)
+            vms_facts = (
+                self.parse_vm_props(object_content.propSet, host_dict)
+                for object_content in vm_objects
+                if isinstance(object_content.obj, vim.VirtualMachine)
+            )
+            for batch in chunked(vms_facts, settings.QPC_VCENTER_SAVE_BATCH_SIZE):
+                self.save_vms_facts(batch)
 
     def _init_stats(self):
         """Initialize the scan_task stats."""
@@ -268,8 +402,8 @@ class InspectTaskRunner(ScanTaskRunner):
             sys_count=connect_scan_task.systems_count,
         )
 
-    def _property_set(self):
-        """Define set of properties for _filter_set."""
+    def _topology_property_set(self):
+        """Define set of properties of everything but virtual machines."""
         cluster_property_spec = vmodl.query.PropertyCollector.PropertySpec(
             all=False,
             type=vim.ComputeResource,
@@ -301,6 +435,17 @@ class InspectTaskRunner(ScanTaskRunner):
             ],
         )
 
+        property_set = [
+            cluster_property_spec,
+            dc_property_spec,
+            folder_property_spec,
+            host_property_spec,
+        ]
+
+        return property_set
+
+    def _vm_property_set(self):
+        """Define set of properties of virtual machines."""
         vm_property_spec = vmodl.query.PropertyCollector.PropertySpec(
             all=False,
             type=vim.VirtualMachine,
@@ -318,20 +463,13 @@ class InspectTaskRunner(ScanTaskRunner):
             ],
         )
 
-        property_set = [
-            cluster_property_spec,
-            dc_property_spec,
-            folder_property_spec,
-            host_property_spec,
-            vm_property_spec,
-        ]
-
-        return property_set
+        return [vm_property_spec]
 
-    def _filter_set(self, root_folder):
+    def _filter_set(self, root_folder, property_set):
         """Create a filter set for the retrieve properties function.
 
         :param root_folder: root folder of the vcenter hierarchy
+        :param property_set: list of PropertySpec of the objects to retrieve
         """
         # Create traversal set
         folder_to_child_entity = vmodl.query.PropertyCollector.TraversalSpec(
@@ -382,17 +520,20 @@ class InspectTaskRunner(ScanTaskRunner):
         # Create filter set
         filter_spec = [
             vmodl.query.PropertyCollector.FilterSpec(
-                objectSet=object_set, propSet=self._property_set()
+                objectSet=object_set, propSet=property_set
             )
         ]
 
         return filter_spec
 
-    def inspect(self):
-        """Execute the inspection scan with the initialized source."""
+    def inspect(self, manager_interrupt=None):
+        """Execute the inspection scan with the initialized source.
+
+        :param manager_interrupt: Signal to indicate job is canceled
+        """
         # Save counts
         self._init_stats()
 
         vcenter = vcenter_connect(self.scan_task)
         content = vcenter.RetrieveContent()
-        self.retrieve_properties(content)
+        self.retrieve_properties(content, manager_interrupt)
@@ -1,17 +1,21 @@
 """Test the common util."""
 
+import gzip
 import io
 import json
 import tarfile
 from collections import OrderedDict
+from unittest.mock import patch
 
 from django.test import TestCase
 
+from api.common import common_report
 from api.common.common_report import (
     CSVHelper,
     create_tar_buffer,
     encode_content,
     extract_tar_gz,
+    stream_tar_gz,
 )
 
 
@@ -116,6 +120,36 @@ class CommonUtilTest(TestCase):
                 extracted_content = json.loads(file.read().decode())
                 self.assertIn(extracted_content, files_data.values())
 
+    @patch.object(common_report, "TAR_SPOOL_MAX_SIZE", 100)
+    @patch.object(common_report, "TAR_CHUNK_SIZE", 100)
+    def test_stream_tar_gz(self):
+        """Test stream_tar_gz generates each file after the previous one."""
+        generated = []
+
+        def generate_file(name, size):
+            generated.append(name)
+            yield from (b"x" * 10 for _ in range(size // 10))
+
+        files = (
+            (name, generate_file(name, size))
+            for name, size in [("big.txt", 1000), ("empty.txt", 0), ("small", 10)]
+        )
+        chunks = stream_tar_gz(files)
+        first_chunk = next(chunks)
+        self.assertEqual(generated, ["big.txt"])
+        tar_buffer = io.BytesIO(first_chunk + b"".join(chunks))
+        self.assertEqual(generated, ["big.txt", "empty.txt", "small"])
+        archive = gzip.decompress(tar_buffer.getvalue())
+        self.assertEqual(len(archive) % tarfile.RECORDSIZE, 0)
+        with tarfile.open(fileobj=tar_buffer) as tar:
+            contents = {
+                member.name: tar.extractfile(member).read()
+                for member in tar.getmembers()
+            }
+        self.assertEqual(
+            contents, {"big.txt": b"x" * 1000, "empty.txt": b"", "small": b"x" * 10}
+        )
+
     def test_bad_param_type_create_tar_buffer(self):
         """Test passing in a non-list into create_tar_buffer."""
         json_list = [
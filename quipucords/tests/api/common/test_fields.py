@@ -0,0 +1,46 @@
+"""Test the model fields shared by the api models."""
+
+import gzip
+
+import pytest
+from django.core import serializers
+from django.db import connection
+
+from api.models import DetailsReport
+from tests.factories import DetailsReportFactory
+
+
+@pytest.mark.django_db
+def test_compressed_text_field():
+    """Test text is stored compressed and loaded as text."""
+    details_report = DetailsReportFactory(cached_csv="Report ID\r\n1\r\n" * 100)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT cached_csv, cached_masked_csv FROM api_detailsreport WHERE id = %s",
+            [details_report.id],
+        )
+        stored_csv, stored_masked_csv = cursor.fetchone()
+    assert stored_masked_csv is None
+    assert len(stored_csv) < 100
+    assert gzip.decompress(stored_csv).decode() == "Report ID\r\n1\r\n" * 100
+
+    assert (
+        DetailsReport.objects.values_list("cached_csv", flat=True).get(
+            pk=details_report.pk
+        )
+        == "Report ID\r\n1\r\n" * 100
+    )
+    details_report = DetailsReport.objects.get(pk=details_report.pk)
+    assert details_report.cached_csv == "Report ID\r\n1\r\n" * 100
+    assert details_report.cached_masked_csv is None
+
+
+@pytest.mark.django_db
+def test_compressed_text_field_serialization():
+    """Test text is serialized as is and loaded back."""
+    details_report = DetailsReportFactory(cached_csv="Report ID\r\n1\r\n")
+    data = serializers.serialize("json", [details_report], fields=["cached_csv"])
+    assert '"cached_csv": "Report ID\\r\\n1\\r\\n"' in data
+
+    deserialized = next(serializers.deserialize("json", data))
+    assert deserialized.object.cached_csv == "Report ID\r\n1\r\n"
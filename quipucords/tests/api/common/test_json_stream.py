@@ -0,0 +1,35 @@
+"""Test incremental JSON encoding."""
+
+import json
+
+import pytest
+
+from api.common.json_stream import buffer_chunks, stream_json_object
+
+
+@pytest.mark.parametrize("fields", [{}, {"id": 1, "name": "x"}, '{"id": 1}', "{ }"])
+def test_stream_json_object(fields):
+    """Test streamed objects end with the array after the other fields."""
+    nested = stream_json_object({"name": "nested"}, "values", ["1", "2"])
+    chunks = stream_json_object(fields, "elements", ['{"a": 1}', nested, "[]"])
+    expected_fields = json.loads(fields) if isinstance(fields, str) else fields
+    assert json.loads("".join(chunks)) == {
+        **expected_fields,
+        "elements": [{"a": 1}, {"name": "nested", "values": [1, 2]}, []],
+    }
+
+
+def test_stream_json_object_empty_array():
+    """Test streaming an object with an empty array."""
+    assert "".join(stream_json_object({"id": 1}, "elements", [])) == (
+        '{"id": 1,"elements":[]}'
+    )
+
+
+def test_buffer_chunks():
+    """Test chunks are joined until they reach the buffer size."""
+    assert list(buffer_chunks(["ab", "c", "defg", "h"], size=3)) == [
+        b"abc",
+        b"defg",
+        b"h",
+    ]
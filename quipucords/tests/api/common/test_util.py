@@ -0,0 +1,43 @@
+"""Test the util for common operations."""
+
+import json
+
+from api.common.util import ValueMasker
+from tests.utils import patch_mask_value
+
+
+def test_value_masker():
+    """Test sensitive facts are masked in place, other facts left as is."""
+    masker = ValueMasker(["ip_addresses"], ["name", "vm_dns_name"])
+    system = {
+        "ip_addresses": ["1.2.3.4", "1.2.3.5"],
+        "name": "host",
+        "vm_dns_name": None,
+        "os_name": "RHEL",
+    }
+    with patch_mask_value({"1.2.3.4": "MASK1", "1.2.3.5": "MASK2", "host": "MASK3"}):
+        assert masker.mask_system(system) is system
+    assert system == {
+        "ip_addresses": ["MASK1", "MASK2"],
+        "name": "MASK3",
+        "vm_dns_name": None,
+        "os_name": "RHEL",
+    }
+
+
+def test_value_masker_memoized(mocker):
+    """Test each value is only masked once by a masker."""
+    mask_value = mocker.patch(
+        "api.common.util.mask_value", side_effect=lambda value: f"MASK-{value}"
+    )
+    masker = ValueMasker(["ip_addresses"], ["name"])
+    systems = [
+        json.dumps({"ip_addresses": ["1.2.3.4"], "name": "host"}),
+        json.dumps({"ip_addresses": ["1.2.3.4"], "name": "1.2.3.4"}),
+    ]
+    masked_systems = [masker.mask_system_json(system) for system in systems]
+    assert [json.loads(system) for system in masked_systems] == [
+        {"ip_addresses": ["MASK-1.2.3.4"], "name": "MASK-host"},
+        {"ip_addresses": ["MASK-1.2.3.4"], "name": "MASK-1.2.3.4"},
+    ]
+    assert mask_value.call_count == 2
@@ -4,6 +4,7 @@ import json
 import tarfile
 import uuid
 
+import pytest
 from django.core import management
 from django.test import TestCase
 from django.urls import reverse
@@ -13,11 +14,13 @@ from api.common.common_report import create_report_version
 from api.common.report_json_gzip_renderer import ReportJsonGzipRenderer
 from api.deployments_report.csv_renderer import DeploymentCSVRenderer
 from api.deployments_report.util import sanitize_row
-from api.models import Credential, ServerInformation, Source
+from api.models import Credential, DeploymentsReport, ServerInformation, Source
 from constants import DataSources
 from tests.api.details_report.test_details_report import MockRequest
+from tests.factories import DeploymentReportFactory
 from tests.mixins import LoggedUserMixin
 from tests.utils import patch_mask_value
+from tests.utils.http import response_json
 
 EXPECTED_NUMBER_OF_FINGERPRINTS = 38
 
@@ -130,7 +133,7 @@ class DeploymentReportTest(LoggedUserMixin, TestCase):
         # Query API
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        report = response.json()
+        report = response_json(response)
         self.assertIsInstance(report, dict)
         self.assertEqual(
             len(report["system_fingerprints"][0].keys()),
@@ -144,7 +147,7 @@ class DeploymentReportTest(LoggedUserMixin, TestCase):
         self.generate_fingerprints()
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        report = response.json()
+        report = response_json(response)
         self.assertIsInstance(report, dict)
         self.assertEqual(
             len(report["system_fingerprints"][0].keys()),
@@ -241,7 +244,7 @@ class DeploymentReportTest(LoggedUserMixin, TestCase):
         url = "/api/v1/reports/1/deployments/"
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        report = response.json()
+        report = response_json(response)
 
         csv_result = renderer.render(
             report, renderer_context=self.mock_renderer_context
@@ -260,9 +263,11 @@ class DeploymentReportTest(LoggedUserMixin, TestCase):
             assert expected_row.split(",") == csv_row.split(",")
         # test the masked deployments report
         url = "/api/v1/reports/1/deployments/?mask=True"
-        response = self.client.get(url)
+        with patch_mask_value({"1.2.3.4": "<MASKED>"}):
+            response = self.client.get(url)
+            # the report is masked while it's streamed
+            report = response_json(response)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        report = response.json()
 
         new_mock_req = MockRequest(mask_rep=True)
         new_mock_renderer = {"request": new_mock_req}
@@ -302,7 +307,7 @@ class DeploymentReportTest(LoggedUserMixin, TestCase):
         url = "/api/v1/reports/1/deployments/"
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        report_dict = response.json()
+        report_dict = response_json(response)
 
         # Test that the data in the subfile equals the report_dict
         tar_gz_result = renderer.render(report_dict)
@@ -311,3 +316,31 @@ class DeploymentReportTest(LoggedUserMixin, TestCase):
             tar_info = tar.extractfile(json_file)
             tar_dict_data = json.loads(tar_info.read().decode())
             self.assertEqual(tar_dict_data, report_dict)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("mask", [False, True])
+def test_deployments_streamed(django_client, mask):
+    """Test deployments are streamed from the cached fingerprints."""
+    report = DeploymentReportFactory(
+        status=DeploymentsReport.STATUS_COMPLETE,
+        cached_fingerprints=[{"name": "system-1"}, {"name": "system-2"}],
+        number_of_fingerprints=0,
+    )
+    with patch_mask_value({"system-1": "masked-1", "system-2": "masked-2"}):
+        response = django_client.get(
+            f"reports/{report.report_id}/deployments/", params={"mask": mask}
+        )
+    assert response.ok, response.text
+    assert response.json() == {
+        "report_id": report.id,
+        "status": DeploymentsReport.STATUS_COMPLETE,
+        "report_type": "deployments",
+        "report_version": report.report_version,
+        "report_platform_id": str(report.report_platform_id),
+        "system_fingerprints": (
+            [{"name": "masked-1"}, {"name": "masked-2"}]
+            if mask
+            else report.cached_fingerprints
+        ),
+    }
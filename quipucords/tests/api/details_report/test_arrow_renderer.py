@@ -0,0 +1,132 @@
+"""Test the Apache Arrow renderer of details reports."""
+
+import io
+import tarfile
+
+import pyarrow
+import pytest
+
+from api.details_report import arrow_renderer
+from api.details_report.arrow_renderer import DetailsArrowRenderer
+from constants import DataSources
+from tests.factories import DetailsReportFactory
+from tests.utils import patch_mask_value
+
+
+@pytest.fixture
+def sources():
+    """Return the sources of a details report."""
+    return [
+        {
+            "server_id": "server",
+            "source_name": "network-source",
+            "source_type": DataSources.NETWORK,
+            "facts": [
+                {"uname_hostname": "host-1", "cpu_count": 2, "ifconfig_ip": ["1.2"]},
+                {"uname_hostname": "host-2", "cpu_count": None, "virt_type": True},
+            ],
+        },
+        {
+            "server_id": "server",
+            "source_name": "vcenter-source",
+            "source_type": DataSources.VCENTER,
+            "facts": [{"vm.name": "vm-1", "vm.memory_size": 1.5}],
+        },
+        {
+            "server_id": "server",
+            "source_name": "other-network-source",
+            "source_type": DataSources.NETWORK,
+            "facts": [{"uname_hostname": "host-3", "cpu_count": 4}],
+        },
+        {
+            "server_id": "server",
+            "source_name": "satellite-source",
+            "source_type": DataSources.SATELLITE,
+            "facts": [],
+        },
+    ]
+
+
+def read_tables(tar_buffer):
+    """Read the Arrow files of a rendered tar.gz by file name."""
+    with tarfile.open(fileobj=tar_buffer) as tar_file:
+        return {
+            member.name: pyarrow.ipc.open_file(
+                io.BytesIO(tar_file.extractfile(member).read())
+            ).read_all()
+            for member in tar_file.getmembers()
+        }
+
+
+def test_render_one_table_per_source_type(mocker, sources):
+    """Test each source type gets a table with a column per fact."""
+    mocker.patch.object(arrow_renderer, "RECORD_BATCH_SIZE", 2)
+    tar_buffer = DetailsArrowRenderer().render({"report_id": 1, "sources": sources})
+    tables = read_tables(tar_buffer)
+    assert sorted(tables) == [
+        "report_id_1/details-network.arrow",
+        "report_id_1/details-vcenter.arrow",
+    ]
+
+    network_table = tables["report_id_1/details-network.arrow"]
+    assert network_table.to_pydict() == {
+        "server_id": ["server"] * 3,
+        "source_name": ["network-source", "network-source", "other-network-source"],
+        "cpu_count": [2, None, 4],
+        "ifconfig_ip": ['["1.2"]', None, None],
+        "uname_hostname": ["host-1", "host-2", "host-3"],
+        "virt_type": [None, True, None],
+    }
+    assert network_table.schema.field("cpu_count").type == pyarrow.int64()
+    assert network_table.schema.field("virt_type").type == pyarrow.bool_()
+    vcenter_table = tables["report_id_1/details-vcenter.arrow"]
+    assert vcenter_table.schema.field("vm.memory_size").type == pyarrow.float64()
+
+
+@pytest.mark.django_db
+def test_details_content_negotiation(mocker, django_client, sources):
+    """Test the details report endpoint streams Arrow files when accepted."""
+    mocker.patch.object(arrow_renderer, "RECORD_BATCH_SIZE", 2)
+    details_report = DetailsReportFactory(report_id=42, sources=sources)
+    response = django_client.get(
+        f"reports/{details_report.report_id}/details/",
+        headers={"Accept": DetailsArrowRenderer.media_type},
+    )
+    assert response.ok, response.text
+    assert response.headers["Content-Type"] == DetailsArrowRenderer.media_type
+    tables = read_tables(io.BytesIO(response.content))
+    rendered_tables = read_tables(
+        DetailsArrowRenderer().render({"report_id": 42, "sources": sources})
+    )
+    assert tables.keys() == rendered_tables.keys()
+    for name, table in tables.items():
+        assert table.equals(rendered_tables[name])
+
+    response = django_client.get(f"reports/{details_report.report_id}/details/")
+    assert response.json()["sources"] == sources
+
+
+@pytest.mark.django_db
+def test_details_arrow_masked(django_client, sources):
+    """Test masked Arrow files are streamed with the sensitive facts masked."""
+    details_report = DetailsReportFactory(report_id=42, sources=sources)
+    mask_values = {
+        "host-1": "MASK1",
+        "host-2": "MASK2",
+        "host-3": "MASK3",
+        "vm-1": "MASK4",
+    }
+    with patch_mask_value(mask_values):
+        response = django_client.get(
+            f"reports/{details_report.report_id}/details/",
+            params={"mask": True, "format": "arrow"},
+        )
+    assert response.ok, response.text
+    network_table = read_tables(io.BytesIO(response.content))[
+        "report_id_42/details-network.arrow"
+    ]
+    assert network_table.column("uname_hostname").to_pylist() == [
+        "MASK1",
+        "MASK2",
+        "MASK3",
+    ]
@@ -4,6 +4,7 @@ import copy
 import json
 import tarfile
 
+import pytest
 from django.core import management
 from django.test import TestCase
 from django.urls import reverse
@@ -12,10 +13,13 @@ from rest_framework import status
 from api.common.common_report import create_report_version
 from api.common.report_json_gzip_renderer import ReportJsonGzipRenderer
 from api.details_report.csv_renderer import DetailsCSVRenderer
+from api.details_report.util import stream_details_json
 from api.models import Credential, DetailsReport, ServerInformation, Source
 from constants import DataSources
+from tests.factories import DetailsReportFactory
 from tests.mixins import LoggedUserMixin
 from tests.utils import patch_mask_value
+from tests.utils.http import response_json
 
 
 class MockRequest:
@@ -78,9 +82,9 @@ class DetailReportTest(LoggedUserMixin, TestCase):
 
         if response.status_code != status.HTTP_200_OK:
             print("Failure cause: ")
-            print(response.json())
+            print(response_json(response))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        return response.json()
+        return response_json(response)
 
     def test_get_details_report_404(self):
         """Fail to get a report for missing collection."""
@@ -366,3 +370,24 @@ class DetailReportTest(LoggedUserMixin, TestCase):
             tar_info = tar.extractfile(json_file)
             tar_dict_data = json.loads(tar_info.read().decode())
             self.assertEqual(tar_dict_data, report_dict)
+
+
+@pytest.mark.django_db
+def test_stream_details_json_sources_once():
+    """Test the streamed details report has its sources written only once."""
+    sources = [{"source_name": "source", "facts": [{"key": "value"}]}]
+    details_report = DetailsReportFactory(
+        sources=sources, cached_csv="csv", cached_masked_csv="masked csv"
+    )
+    details_report = DetailsReport.objects.defer(
+        "sources", *DetailsReport.CACHED_FIELDS
+    ).get(pk=details_report.pk)
+    details_json = "".join(stream_details_json(details_report, mask_report=False))
+    keys = json.loads(details_json, object_pairs_hook=lambda pairs: [*pairs])
+    assert [key for key, _ in keys].count("sources") == 1
+    assert not {"cached_csv", "cached_masked_csv"} & {key for key, _ in keys}
+    assert details_report.get_deferred_fields() == {
+        "sources",
+        *DetailsReport.CACHED_FIELDS,
+    }
+    assert json.loads(details_json)["sources"] == sources
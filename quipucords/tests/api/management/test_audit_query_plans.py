@@ -0,0 +1,44 @@
+"""Test the audit_query_plans management command."""
+
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+
+from api.models import Credential
+
+
+@pytest.mark.django_db
+def test_audit_query_plans_ignores_small_tables():
+    """Sequential scans on tables smaller than --min-rows are tolerated."""
+    stdout = StringIO()
+    call_command("audit_query_plans", stdout=stdout)
+    assert "SEQUENTIAL SCAN" not in stdout.getvalue()
+    assert "Run it on a seeded database." in stdout.getvalue()
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(
+    connection.vendor != "sqlite",
+    reason="postgres prefers sequential scans on empty tables",
+)
+def test_audit_query_plans_uses_indexes():
+    """All audited queries are served by indexes."""
+    stdout = StringIO()
+    call_command("audit_query_plans", "--min-rows=0", stdout=stdout)
+    assert "SEQUENTIAL SCAN" not in stdout.getvalue()
+    assert "WARNING" not in stdout.getvalue()
+
+
+@pytest.mark.django_db
+def test_audit_query_plans_fails_on_sequential_scan(mocker):
+    """Unindexed lookups make the command fail."""
+    mocker.patch(
+        "api.management.commands.audit_query_plans.get_audited_queries",
+        return_value={"by username": Credential.objects.filter(username="")},
+    )
+    stdout = StringIO()
+    with pytest.raises(CommandError, match="by username"):
+        call_command("audit_query_plans", "--min-rows=0", stdout=stdout)
+    assert "SEQUENTIAL SCAN by username: api_credential" in stdout.getvalue()
@@ -0,0 +1,160 @@
+"""Test the report artifacts precomputed once a report is fingerprinted."""
+
+import io
+import json
+import tarfile
+
+import pytest
+
+from api.common.report_artifacts import INSIGHTS_ARTIFACT
+from api.common.util import mask_value
+from api.models import DeploymentsReport, DetailsReport, Scan, ScanJob, ScanTask
+from api.reports.artifacts import precompute_report_artifacts
+from tests.factories import DeploymentReportFactory
+
+ARTIFACTS = [
+    "details.json",
+    "deployments.json",
+    "details.csv",
+    "deployments.csv",
+    "details-masked.json",
+    "deployments-masked.json",
+    "details-masked.csv",
+    "deployments-masked.csv",
+    INSIGHTS_ARTIFACT,
+]
+
+
+@pytest.fixture(autouse=True)
+def artifacts_directory(settings, tmp_path):
+    """Enable report artifacts, written to a temporary directory."""
+    settings.QPC_ENABLE_REPORT_ARTIFACTS = True
+    settings.QPC_REPORT_ARTIFACTS_DIRECTORY = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def deployments_report():
+    """Return a complete deployments report."""
+    deployments_report = DeploymentReportFactory(
+        number_of_fingerprints=3,
+        status=DeploymentsReport.STATUS_COMPLETE,
+        cached_fingerprints=[{"name": "host-1.example.com"}],
+    )
+    DetailsReport.objects.filter(deployment_report=deployments_report).update(
+        report_id=deployments_report.report_id,
+        sources=[
+            {
+                "server_id": "server",
+                "source_name": "source",
+                "source_type": "network",
+                "facts": [{"uname_hostname": "host-1.example.com"}],
+            }
+        ],
+    )
+    return deployments_report
+
+
+def change_report(deployments_report):
+    """Change a report in the database, so served artifacts can be told apart."""
+    DeploymentsReport.objects.filter(pk=deployments_report.pk).update(
+        cached_fingerprints=[{"name": "changed"}]
+    )
+    DetailsReport.objects.filter(deployment_report=deployments_report).update(
+        sources=[]
+    )
+
+
+@pytest.mark.django_db
+def test_precompute_report_artifacts(deployments_report, artifacts_directory):
+    """Test every artifact of a report is written, compressed."""
+    assert precompute_report_artifacts(deployments_report.report_id) == ARTIFACTS
+    deployments_directory = artifacts_directory / str(
+        deployments_report.report_platform_id
+    )
+    assert sorted(path.name for path in deployments_directory.iterdir()) == [
+        "deployments-masked.csv.gz",
+        "deployments-masked.json.gz",
+        "deployments.csv.gz",
+        "deployments.json.gz",
+        INSIGHTS_ARTIFACT,
+    ]
+
+
+@pytest.mark.django_db
+def test_precompute_report_artifacts_disabled(settings, deployments_report):
+    """Test nothing is written unless report artifacts are enabled."""
+    settings.QPC_ENABLE_REPORT_ARTIFACTS = False
+    assert precompute_report_artifacts(deployments_report.report_id) == []
+
+
+@pytest.mark.django_db
+def test_precompute_report_artifacts_failure(mocker, caplog, deployments_report):
+    """Test a failure is logged without raising, keeping what was written."""
+    mocker.patch(
+        "api.reports.artifacts.InsightsGzipRenderer.render",
+        side_effect=ValueError("oops"),
+    )
+    artifacts = precompute_report_artifacts(deployments_report.report_id)
+    assert artifacts == ARTIFACTS[:-1]
+    assert "Failed to precompute the artifacts of report" in caplog.text
+
+
+@pytest.mark.django_db
+def test_delete_scan_deletes_artifacts(
+    django_client, deployments_report, artifacts_directory
+):
+    """Test deleting a scan deletes the artifacts of its reports."""
+    precompute_report_artifacts(deployments_report.report_id)
+    scan = Scan.objects.create(name="scan", scan_type=ScanTask.SCAN_TYPE_INSPECT)
+    ScanJob.objects.filter(details_report__deployment_report=deployments_report).update(
+        scan=scan, status=ScanTask.COMPLETED
+    )
+    assert len(list(artifacts_directory.iterdir())) == 2
+
+    response = django_client.delete(f"scans/{scan.id}/")
+    assert response.status_code == 204, response.text
+    assert list(artifacts_directory.iterdir()) == []
+
+
+@pytest.mark.django_db
+def test_serve_artifacts(django_client, deployments_report):
+    """Test the report views serve artifacts, compressed if the client accepts it."""
+    report_id = deployments_report.report_id
+    precompute_report_artifacts(report_id)
+    change_report(deployments_report)
+
+    response = django_client.get(f"reports/{report_id}/deployments/")
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.json()["system_fingerprints"] == [{"name": "host-1.example.com"}]
+    response = django_client.get(f"reports/{report_id}/details/?mask=true")
+    assert response.json()["sources"][0]["facts"] != []
+    response = django_client.get(f"reports/{report_id}/details/?format=csv")
+    assert response.headers["Content-Type"] == "text/csv"
+    assert "host-1.example.com" in response.text
+
+
+@pytest.mark.django_db
+def test_serve_artifacts_uncompressed(client, qpc_user, deployments_report):
+    """Test artifacts are decompressed for clients not accepting gzip."""
+    report_id = deployments_report.report_id
+    precompute_report_artifacts(report_id)
+    change_report(deployments_report)
+    client.force_login(qpc_user)
+
+    response = client.get(f"/api/v1/reports/{report_id}/deployments/?mask=true")
+    assert "Content-Encoding" not in response
+    deployments_json = json.loads(b"".join(response.streaming_content))
+    assert deployments_json["system_fingerprints"] == [
+        {"name": mask_value("host-1.example.com")}
+    ]
+
+    response = client.get(f"/api/v1/reports/{report_id}/")
+    with tarfile.open(fileobj=io.BytesIO(b"".join(response.streaming_content))) as tar:
+        details_json = json.loads(tar.extractfile(tar.getmembers()[0]).read())
+    assert details_json["sources"][0]["facts"] != []
+
+    response = client.get(f"/api/v1/reports/{report_id}/insights/?format=tar.gz")
+    assert response["Content-Type"] == "application/gzip"
+    with tarfile.open(fileobj=io.BytesIO(b"".join(response.streaming_content))) as tar:
+        assert tar.getnames()
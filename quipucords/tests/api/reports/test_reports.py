@@ -2,6 +2,7 @@
 
 import csv
 import hashlib
+import io
 import json
 import sys
 import tarfile
@@ -19,6 +20,7 @@ from constants import DataSources
 from tests.api.details_report.test_details_report import MockRequest
 from tests.mixins import LoggedUserMixin
 from tests.utils import patch_mask_value
+from tests.utils.http import response_json
 
 
 class ReportsTest(LoggedUserMixin, TestCase):
@@ -125,9 +127,9 @@ class ReportsTest(LoggedUserMixin, TestCase):
 
         if response.status_code != status.HTTP_200_OK:
             print("Failure cause: ")
-            print(response.json())
+            print(response_json(response))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        return response.json()
+        return response_json(response)
 
     def create_reports_dict(self, query_params=""):
         """Create a deployments report."""
@@ -135,7 +137,7 @@ class ReportsTest(LoggedUserMixin, TestCase):
         self.generate_fingerprints(os_versions=["7.4", "7.4", "7.5"])
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        report = response.json()
+        report = response_json(response)
         self.deployments_json = report
         self.details_json = self.retrieve_expect_200_details(1, query_params)
 
@@ -306,3 +308,55 @@ class ReportsTest(LoggedUserMixin, TestCase):
             new_hash = hashlib.sha256(file_contents).hexdigest()
             new_file2hash[hashed_filename] = new_hash
         assert new_file2hash == file2hash, "SHA256SUM content is incorrect"
+
+    def read_tarball(self, tar_gz):
+        """Read the files of a tar.gz by file name, ignoring the folder name."""
+        with tarfile.open(fileobj=tar_gz) as tar:
+            return {
+                member.name.rsplit("/", 1)[1]: tar.extractfile(member).read()
+                for member in tar.getmembers()
+            }
+
+    def check_streamed_tarball(self, query_params="", mask_rep=False):
+        """Check the streamed tarball matches the rendered one."""
+        reports_dict = self.create_reports_dict(query_params)
+        response = self.client.get(f"/api/v1/reports/1/{query_params}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        streamed = self.read_tarball(io.BytesIO(b"".join(response.streaming_content)))
+        rendered = self.read_tarball(
+            ReportsGzipRenderer().render(
+                reports_dict, renderer_context={"request": MockRequest(mask_rep)}
+            )
+        )
+
+        assert list(streamed) == [
+            "details.json",
+            "deployments.json",
+            "details.csv",
+            "deployments.csv",
+            "SHA256SUM",
+        ]
+        assert json.loads(streamed["details.json"]) == self.details_json
+        assert json.loads(streamed["deployments.json"]) == self.deployments_json
+        assert streamed["details.csv"] == rendered["details.csv"]
+        assert streamed["deployments.csv"] == rendered["deployments.csv"]
+        for line in streamed["SHA256SUM"].decode().splitlines():
+            sha256, file_name = line.split()
+            assert hashlib.sha256(streamed[file_name]).hexdigest() == sha256
+
+    def test_reports_streamed(self):
+        """Get a streamed tar.gz for report_id via API."""
+        self.check_streamed_tarball()
+
+    def test_reports_streamed_masked(self):
+        """Get a streamed tar.gz for report_id via API with masked values."""
+        with patch_mask_value({"1.2.3.4": "<MASKED>"}):
+            self.check_streamed_tarball("?mask=True", mask_rep=True)
+
+    def test_reports_streamed_masked_bad_req(self):
+        """Test a bad mask query param is refused before streaming."""
+        self.create_reports_dict()
+        response = self.client.get("/api/v1/reports/1/?mask=foo")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -674,6 +674,41 @@ class ScanJobTest(LoggedUserMixin, TestCase):
 
         self.assertEqual(json_response, expected)
 
+    def test_connection_cursor_paging(self):
+        """Test cursor paging for scanjob connection results."""
+        scan_job, scan_task = create_scan_job(self.source, ScanTask.SCAN_TYPE_CONNECT)
+        conn_result = scan_task.connection_result
+        for name in ("Foo", "Bar", "Woot"):
+            SystemConnectionResult.objects.create(
+                name=name,
+                source=self.source,
+                credential=self.cred,
+                status=SystemConnectionResult.SUCCESS,
+                task_connection_result=conn_result,
+            )
+
+        url = (
+            reverse("scanjob-detail", args=(scan_job.id,))
+            + "connection/?cursor=&page_size=2"
+        )
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        json_response = response.json()
+        self.assertNotIn("count", json_response)
+        self.assertIsNone(json_response["previous"])
+        self.assertEqual(
+            [system["name"] for system in json_response["results"]], ["Foo", "Bar"]
+        )
+
+        response = self.client.get(json_response["next"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        json_response = response.json()
+        self.assertIsNone(json_response["next"])
+        self.assertIsNotNone(json_response["previous"])
+        self.assertEqual(
+            [system["name"] for system in json_response["results"]], ["Woot"]
+        )
+
     def test_connection_results_with_none(self):
         """Test connection results with no results for one task."""
         # create a second source:
@@ -945,6 +980,42 @@ class ScanJobTest(LoggedUserMixin, TestCase):
         }
         self.assertEqual(json_response, expected)
 
+    def test_inspection_cursor_paging(self):
+        """Test cursor paging of ScanJob inspection results."""
+        scan_job, scan_task = create_scan_job(self.source, ScanTask.SCAN_TYPE_INSPECT)
+        inspection_result = scan_task.inspection_result
+        for system_status in (
+            SystemInspectionResult.SUCCESS,
+            SystemInspectionResult.FAILED,
+        ):
+            SystemInspectionResult.objects.create(
+                name=system_status,
+                status=system_status,
+                source=self.source,
+                task_inspection_result=inspection_result,
+            )
+
+        url = (
+            reverse("scanjob-detail", args=(scan_job.id,))
+            + "inspection/?cursor=&page_size=1"
+        )
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        json_response = response.json()
+        self.assertNotIn("count", json_response)
+        # cursor pagination ignores the default status ordering and uses ids
+        self.assertEqual(
+            [system["name"] for system in json_response["results"]], ["success"]
+        )
+
+        response = self.client.get(json_response["next"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        json_response = response.json()
+        self.assertIsNone(json_response["next"])
+        self.assertEqual(
+            [system["name"] for system in json_response["results"]], ["failed"]
+        )
+
     def test_inspection_ordering_by_name(self):
         """Tests inspection result ordering by name."""
         source2 = Source(name="source2", source_type="network", port=22)
@@ -0,0 +1,37 @@
+"""Test compat.db module."""
+
+import json
+
+import pytest
+
+from compat.db import iter_json_array
+from tests.factories import DetailsReportFactory
+
+
+@pytest.fixture
+def details_report():
+    """Return a DetailsReport with two sources."""
+    return DetailsReportFactory(
+        sources=[
+            {"source_name": "a", "facts": [{"index": i} for i in range(12)]},
+            {"source_name": "b", "facts": []},
+        ]
+    )
+
+
+@pytest.mark.django_db
+def test_iter_json_array(details_report):
+    """Test iterating over a JSON array, in order and in chunks."""
+    facts = iter_json_array(details_report, "sources", path=(0, "facts"), chunk_size=5)
+    assert [json.loads(fact) for fact in facts] == [{"index": i} for i in range(12)]
+    assert not list(iter_json_array(details_report, "sources", path=(1, "facts")))
+
+
+@pytest.mark.django_db
+def test_iter_json_array_without_key(details_report):
+    """Test iterating over JSON objects without one of their keys."""
+    sources = iter_json_array(details_report, "sources", without_key="facts")
+    assert [json.loads(source) for source in sources] == [
+        {"source_name": "a"},
+        {"source_name": "b"},
+    ]
@@ -1,10 +1,14 @@
 """Test compat.requests module."""
 
+import os
+import time
+from unittest.mock import Mock
+
 import httpretty
 import pytest
 from requests import Session as RequestsSession
 
-from compat.requests import Session
+from compat.requests import ResponseCache, Session
 
 
 @pytest.mark.parametrize(
@@ -49,3 +53,172 @@ def test_automatic_retry():
     qpc_resp = session.get("http://some.url/")
     assert qpc_resp.ok
     assert qpc_resp.json() == {"message": "ok"}
+
+
+@httpretty.activate
+def test_automatic_retry_without_raise_on_status():
+    """Test the last response is returned when retries are exhausted."""
+    httpretty.register_uri(
+        httpretty.GET,
+        "http://some.url/",
+        responses=[httpretty.Response("UNAVAILABLE", status=503)] * 3,
+    )
+    session = Session(max_retries=2, backoff_factor=0.001, raise_on_status=False)
+    response = session.get("http://some.url/")
+    assert response.status_code == 503
+    assert len(httpretty.latest_requests()) == 3
+
+
+def test_pool_maxsize():
+    """Test the connection pool size of the session adapters."""
+    session = Session(max_retries=0, pool_maxsize=3)
+    assert session.get_adapter("https://some.url/")._pool_maxsize == 3
+
+
+@pytest.fixture
+def response_cache(tmp_path):
+    """Return a ResponseCache in a temporary directory."""
+    return ResponseCache("source:credential", directory=tmp_path)
+
+
+def etag_responses(request, uri, response_headers):
+    """Answer 304 when the request already has the current ETag."""
+    response_headers["ETag"] = '"v1"'
+    if request.headers.get("If-None-Match") == '"v1"':
+        return [304, response_headers, ""]
+    response_headers["Content-Type"] = "application/json"
+    return [200, response_headers, '{"results": [1, 2, 3]}']
+
+
+@httpretty.activate
+def test_response_cache_conditional_get(response_cache):
+    """Test unchanged responses are revalidated instead of downloaded again."""
+    httpretty.register_uri(httpretty.GET, "http://some.url/hosts/", body=etag_responses)
+    session = Session(base_url="http://some.url", cache=response_cache)
+
+    first_response = session.get("/hosts/", params={"page": 1})
+    second_response = session.get("/hosts/", params={"page": 1})
+    assert first_response.json() == second_response.json() == {"results": [1, 2, 3]}
+    assert second_response.status_code == 200
+    assert second_response.headers["Content-Type"] == "application/json"
+    assert httpretty.latest_requests()[-1].headers["If-None-Match"] == '"v1"'
+    assert (response_cache.hits, response_cache.misses) == (1, 1)
+    assert response_cache.bytes_saved == len(first_response.content)
+    assert response_cache.summary() == (
+        "HTTP response cache: 1 hits, 1 misses, 22 bytes saved."
+    )
+
+
+@httpretty.activate
+def test_response_cache_per_url_and_namespace(tmp_path, response_cache):
+    """Test cached responses are only used for the same url and namespace."""
+    httpretty.register_uri(httpretty.GET, "http://some.url/hosts/", body=etag_responses)
+    session = Session(base_url="http://some.url", cache=response_cache)
+    session.get("/hosts/", params={"page": 1})
+    session.get("/hosts/", params={"page": 2})
+    assert "If-None-Match" not in httpretty.latest_requests()[-1].headers
+
+    other_cache = ResponseCache("source:other-credential", directory=tmp_path)
+    Session(base_url="http://some.url", cache=other_cache).get("/hosts/?page=1")
+    assert "If-None-Match" not in httpretty.latest_requests()[-1].headers
+    assert (other_cache.hits, other_cache.misses) == (0, 1)
+
+
+@httpretty.activate
+def test_response_cache_without_validators(response_cache):
+    """Test responses without ETag or Last-Modified headers aren't cached."""
+    httpretty.register_uri(httpretty.GET, "http://some.url/", body="{}")
+    session = Session(cache=response_cache)
+    session.get("http://some.url/")
+    session.get("http://some.url/")
+    assert "If-None-Match" not in httpretty.latest_requests()[-1].headers
+    assert (response_cache.hits, response_cache.misses) == (0, 2)
+
+
+@pytest.mark.parametrize(
+    "cache_control", ["no-store", "max-age=0, No-Store", "private, no-store"]
+)
+@httpretty.activate
+def test_response_cache_uncacheable(response_cache, cache_control):
+    """Test responses that must not be stored aren't cached."""
+    httpretty.register_uri(
+        httpretty.GET,
+        "http://some.url/",
+        body="{}",
+        adding_headers={"ETag": '"v1"', "Cache-Control": cache_control},
+    )
+    session = Session(cache=response_cache)
+    session.get("http://some.url/")
+    session.get("http://some.url/")
+    assert "If-None-Match" not in httpretty.latest_requests()[-1].headers
+    assert (response_cache.hits, response_cache.misses) == (0, 2)
+
+
+@httpretty.activate
+def test_response_cache_private(response_cache):
+    """Test private responses, like those of Rails servers, are cached."""
+    httpretty.register_uri(
+        httpretty.GET,
+        "http://some.url/",
+        responses=[
+            httpretty.Response(
+                body="{}",
+                etag='"v1"',
+                adding_headers={"Cache-Control": "max-age=0, private, must-revalidate"},
+            ),
+            httpretty.Response(body="", status=304),
+        ],
+    )
+    session = Session(cache=response_cache)
+    session.get("http://some.url/")
+    response = session.get("http://some.url/")
+    assert httpretty.latest_requests()[-1].headers["If-None-Match"] == '"v1"'
+    assert response.json() == {}
+    assert (response_cache.hits, response_cache.misses) == (1, 1)
+
+
+@httpretty.activate
+def test_response_cache_per_request(response_cache):
+    """Test a shared session uses the cache passed to each request."""
+    httpretty.register_uri(httpretty.GET, "http://some.url/hosts/", body=etag_responses)
+    session = Session()
+    session.get("http://some.url/hosts/")
+    session.get("http://some.url/hosts/", cache=response_cache)
+    session.get("http://some.url/hosts/", cache=response_cache)
+    assert (response_cache.hits, response_cache.misses) == (1, 1)
+    assert session.cache is None
+
+
+def cache_response(response_cache, url, size):
+    """Store a fake response of the given size."""
+    response = Mock(
+        status_code=200, headers={"ETag": '"v1"'}, encoding=None, content=b"x" * size
+    )
+    response_cache.set(url, response)
+
+
+def test_response_cache_evict(tmp_path):
+    """Test eviction of expired and least recently used responses."""
+    response_cache = ResponseCache(
+        "source:credential", directory=tmp_path, max_size=2500, max_age=60
+    )
+    for age, url in enumerate(["http://new/", "http://old/", "http://older/"]):
+        cache_response(response_cache, url, 1000)
+        metadata_path, _ = response_cache._paths(url)
+        modified = time.time() - age * 10
+        os.utime(metadata_path, (modified, modified))
+    expired_url = "http://expired/"
+    cache_response(response_cache, expired_url, 1)
+    metadata_path, _ = response_cache._paths(expired_url)
+    os.utime(metadata_path, (time.time() - 120, time.time() - 120))
+
+    assert response_cache.get(expired_url) is None
+    response_cache.evict()
+    assert response_cache.get("http://new/").content == b"x" * 1000
+    assert response_cache.get("http://old/")
+    assert response_cache.get("http://older/") is None
+    assert sorted(path.name for path in tmp_path.glob("*/*")) == sorted(
+        path.name
+        for url in ["http://new/", "http://old/"]
+        for path in response_cache._paths(url)
+    )
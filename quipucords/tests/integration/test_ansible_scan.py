@@ -103,6 +103,7 @@ def expected_facts():
             },
             "jobs": {
                 "job_ids": [1, 2],
+                "unfinished_job_ids": [],
                 "unique_hosts": ["<DELETED_HOST>", "<LISTED_HOST>"],
             },
         },
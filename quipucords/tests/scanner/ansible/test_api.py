@@ -1,5 +1,10 @@
 """Test ansible controller api client."""
 
+import json
+import threading
+import time
+from unittest.mock import Mock
+
 import httpretty
 import pytest
 
@@ -44,3 +49,59 @@ def test_get_paginated_results(paginated_results):
     client = AnsibleControllerApi(base_url="https://some.url/")
     results = client.get_paginated_results("/paginated/", max_concurrency=4)
     assert set(results) == set(range(1, 12))
+
+
+class FakePages:
+    """Fake AnsibleControllerApi.get serving pages of 2 results each."""
+
+    def __init__(self, count, delays=None, expected_requests=None):
+        """Initialize the fake."""
+        self.count = count
+        self.delays = delays or {}
+        self.requested_pages = []
+        self.expected_requests = expected_requests
+        self.all_requested = threading.Event()
+        self.lock = threading.Lock()
+
+    def __call__(self, url, params=None, **kwargs):
+        """Return one page of results."""
+        page = (params or {}).get("page", 1)
+        with self.lock:
+            self.requested_pages.append(page)
+            if len(self.requested_pages) == self.expected_requests:
+                self.all_requested.set()
+        time.sleep(self.delays.get(page, 0))
+        results = [page * 10, page * 10 + 1]
+        data = {"count": self.count, "next": page * 2 < self.count, "results": results}
+        return Mock(json=Mock(return_value=data), content=json.dumps(data).encode())
+
+
+@pytest.mark.parametrize(
+    "ordered,expected_pages", [(True, [1, 2, 3, 4]), (False, [1, 3, 4, 2])]
+)
+def test_get_paginated_results_order(mocker, ordered, expected_pages):
+    """Test results are yielded in page order only when requested."""
+    fake_pages = FakePages(count=8, delays={2: 0.2})
+    mocker.patch.object(AnsibleControllerApi, "get", side_effect=fake_pages)
+    client = AnsibleControllerApi(base_url="https://some.url/")
+    results = client.get_paginated_results(
+        "/paginated/", max_concurrency=3, ordered=ordered
+    )
+    assert [result // 10 for result in results][::2] == expected_pages
+
+
+def test_get_paginated_results_window(mocker):
+    """Test only max_concurrency pages are requested ahead of the consumer."""
+    # the first page, then a window of 4 pages
+    fake_pages = FakePages(count=200, expected_requests=5)
+    mocker.patch.object(AnsibleControllerApi, "get", side_effect=fake_pages)
+    client = AnsibleControllerApi(base_url="https://some.url/")
+    results = client.get_paginated_results("/paginated/", max_concurrency=4)
+    for _ in range(4):
+        next(results)
+    # pages of the window are requested by worker threads
+    assert fake_pages.all_requested.wait(timeout=5)
+    # while the consumer is paused, no page is added to the window
+    assert len(fake_pages.requested_pages) == 5
+    results.close()
+    assert len(fake_pages.requested_pages) == 5
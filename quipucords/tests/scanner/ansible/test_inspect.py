@@ -0,0 +1,185 @@
+"""Test the ansible controller inspect task runner."""
+
+import threading
+import time
+from unittest.mock import PropertyMock
+
+import pytest
+
+from api.models import RawFact, ScanTask, SystemInspectionResult
+from compat.requests import ResponseCache
+from constants import DataSources
+from scanner.ansible.inspect import InspectTaskRunner
+from tests.factories import ScanTaskFactory
+
+
+@pytest.fixture
+def scan_task():
+    """Return an ansible controller inspect ScanTask."""
+    return ScanTaskFactory(
+        source__source_type=DataSources.ANSIBLE,
+        source__hosts=["ansible.host"],
+        scan_type=ScanTask.SCAN_TYPE_INSPECT,
+    )
+
+
+@pytest.fixture
+def runner(mocker, scan_task):
+    """Return an InspectTaskRunner without a real controller client."""
+    mocker.patch.object(InspectTaskRunner, "get_client")
+    return InspectTaskRunner(scan_task.job, scan_task)
+
+
+class FakeControllerApi:
+    """Fake get_paginated_results of a controller with one host per job."""
+
+    def __init__(self, job_ids, delay=0.05, statuses=None, hosts=None):
+        """Initialize the fake."""
+        self.job_ids = job_ids
+        self.delay = delay
+        self.statuses = statuses or {}
+        self.hosts = hosts or {}
+        self.jobs_kwargs = None
+        self.job_events_ids = []
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def get_paginated_results(self, url, max_concurrency=1, **kwargs):
+        """Return jobs or the events of one job."""
+        if url == "/api/v2/jobs/":
+            self.jobs_kwargs = kwargs
+            return iter(
+                {"id": job_id, "status": self.statuses.get(job_id, "successful")}
+                for job_id in self.job_ids
+            )
+        return self._job_events(int(url.split("/")[3]))
+
+    def _job_events(self, job_id):
+        with self.lock:
+            self.job_events_ids.append(job_id)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.delay)
+        with self.lock:
+            self.running -= 1
+        hosts = self.hosts.get(job_id, [f"host-{job_id % 3}"])
+        return [{"host_name": host} for host in hosts] + [{"host_name": ""}]
+
+
+@pytest.mark.django_db
+def test_get_jobs_events_concurrently(mocker, runner):
+    """Test the events of several jobs are retrieved at the same time."""
+    mocker.patch.object(
+        InspectTaskRunner, "max_concurrency", new_callable=PropertyMock, return_value=3
+    )
+    runner.client = FakeControllerApi(range(1, 11))
+
+    jobs = runner.get_jobs()
+    assert jobs == {
+        "job_ids": list(range(1, 11)),
+        "unfinished_job_ids": [],
+        "unique_hosts": {"host-0", "host-1", "host-2"},
+    }
+    assert runner.client.max_running == 3
+    assert "params" not in runner.client.jobs_kwargs
+
+
+def create_previous_jobs(scan_task, jobs):
+    """Record the jobs fact of a previous successful inspection of the source."""
+    previous_task = ScanTaskFactory(
+        source=scan_task.source,
+        scan_type=ScanTask.SCAN_TYPE_INSPECT,
+        status=ScanTask.COMPLETED,
+    )
+    previous_system = SystemInspectionResult.objects.create(
+        name="ansible.host",
+        status=SystemInspectionResult.SUCCESS,
+        source=scan_task.source,
+        task_inspection_result=previous_task.inspection_result,
+    )
+    RawFact.objects.create(
+        name="jobs",
+        value={**jobs, "unique_hosts": sorted(jobs["unique_hosts"])},
+        system_inspection_result=previous_system,
+    )
+
+
+@pytest.mark.django_db
+def test_get_jobs_incremental(settings, scan_task, runner):
+    """Test only jobs newer than the last successful inspection are retrieved."""
+    settings.QPC_ENABLE_ANSIBLE_INCREMENTAL_JOBS = True
+    create_previous_jobs(scan_task, {"job_ids": [1, 2], "unique_hosts": ["old-host"]})
+    runner.client = FakeControllerApi([3, 4])
+
+    jobs = runner.get_jobs()
+    assert runner.client.jobs_kwargs["params"] == {"id__gt": 2}
+    assert jobs == {
+        "job_ids": [1, 2, 3, 4],
+        "unfinished_job_ids": [],
+        "unique_hosts": {"old-host", "host-0", "host-1"},
+    }
+
+
+@pytest.mark.django_db
+def test_get_jobs_incremental_unfinished(settings, scan_task, runner):
+    """Test jobs unfinished at the last inspection are retrieved again."""
+    settings.QPC_ENABLE_ANSIBLE_INCREMENTAL_JOBS = True
+    runner.client = FakeControllerApi([2, 3], statuses={2: "running"})
+    jobs = runner.get_jobs()
+    assert jobs == {
+        "job_ids": [2, 3],
+        "unfinished_job_ids": [2],
+        "unique_hosts": {"host-0", "host-2"},
+    }
+    create_previous_jobs(scan_task, jobs)
+
+    runner.client = FakeControllerApi([2, 3, 4], hosts={2: ["host-2", "late-host"]})
+    jobs = runner.get_jobs()
+    assert runner.client.jobs_kwargs["params"] == {"id__gt": 1}
+    assert sorted(runner.client.job_events_ids) == [2, 4]
+    assert jobs == {
+        "job_ids": [2, 3, 4],
+        "unfinished_job_ids": [],
+        "unique_hosts": {"host-0", "host-1", "host-2", "late-host"},
+    }
+
+
+@pytest.mark.django_db
+def test_get_jobs_incremental_first_scan(settings, runner):
+    """Test all jobs are retrieved when the source was never inspected."""
+    settings.QPC_ENABLE_ANSIBLE_INCREMENTAL_JOBS = True
+    runner.client = FakeControllerApi([1])
+
+    assert runner.get_jobs() == {
+        "job_ids": [1],
+        "unfinished_job_ids": [],
+        "unique_hosts": {"host-1"},
+    }
+    assert "params" not in runner.client.jobs_kwargs
+
+
+@pytest.mark.django_db
+def test_run_logs_response_cache_summary(mocker, tmp_path, runner):
+    """Test the response cache usage is reported in the scan task log."""
+    runner.client.cache = ResponseCache("source:credential", directory=tmp_path)
+    runner.client.cache.hits = 2
+    mocker.patch.object(
+        InspectTaskRunner, "execute_task", return_value=("done", ScanTask.COMPLETED)
+    )
+    log = mocker.patch.object(InspectTaskRunner, "log")
+    assert runner.run() == ("done", ScanTask.COMPLETED)
+    log.assert_called_once_with("HTTP response cache: 2 hits, 0 misses, 0 bytes saved.")
+
+
+@pytest.mark.django_db
+def test_get_response_cache(settings, scan_task):
+    """Test a response cache per source and credential is used only when enabled."""
+    assert InspectTaskRunner._get_response_cache(scan_task) is None
+    settings.QPC_ENABLE_HTTP_RESPONSE_CACHE = True
+    response_cache = InspectTaskRunner._get_response_cache(scan_task)
+    credential = scan_task.source.single_credential
+    assert (
+        response_cache.directory
+        == ResponseCache(f"{scan_task.source.id}:{credential.id}").directory
+    )
@@ -235,3 +235,37 @@ def test_run_celery_based_job_runner_inspect_one_job_multiple_sources(
     assert mock__celery_run_task_runner.call_count == 4  # 2 sources * 2 tasks
     mock__fingerprint.assert_called_once()
     mock__finalize_scan.assert_called_once()
+
+
+@override_settings(QPC_ENABLE_CELERY_SCAN_MANAGER=True)
+@pytest.mark.django_db(transaction=True)
+def test_run_celery_based_job_runner_restart_paused_job(
+    mock__celery_run_task_runner,
+    mock__fingerprint,
+    mock__finalize_scan,
+    celery_worker,
+    inspect_scan_job,
+):
+    """Test restarting a paused ScanJob only runs its incomplete tasks again."""
+    connect_task = inspect_scan_job.tasks.get(scan_type=ScanTask.SCAN_TYPE_CONNECT)
+    connect_task.status = ScanTask.COMPLETED
+    connect_task.save()
+    inspect_scan_job.status = ScanTask.RUNNING
+    inspect_scan_job.save()
+    inspect_scan_job.status_pause()
+    previous_task_ids = job.CeleryBasedScanJobRunner(
+        inspect_scan_job
+    ).get_celery_task_ids()
+
+    inspect_scan_job.status_restart()
+    job_runner = job.ScanJobRunner(inspect_scan_job)
+    async_result = job_runner.run()
+    async_result.get()
+
+    inspect_task = inspect_scan_job.tasks.get(scan_type=ScanTask.SCAN_TYPE_INSPECT)
+    mock__celery_run_task_runner.assert_called_once()
+    assert mock__celery_run_task_runner.call_args[0][1] == inspect_task.id
+    mock__fingerprint.assert_called_once()
+    mock__finalize_scan.assert_called_once()
+    assert async_result.id == job_runner.get_celery_task_id("finalize")
+    assert async_result.id not in previous_task_ids
@@ -0,0 +1,98 @@
+"""Test running the task runners of a SyncScanJobRunner."""
+import threading
+from multiprocessing import Value
+from unittest.mock import Mock
+
+import pytest
+
+from api.models import ScanJob, ScanTask
+from constants import DataSources
+from scanner import job
+from scanner.job import SyncScanJobRunner, TaskInterrupt, group_task_runners
+
+
+def fake_runner(source_type, scan_type):
+    """Return a fake task runner for a source type and scan type."""
+    runner = Mock()
+    runner.scan_task.source.source_type = source_type
+    runner.scan_task.scan_type = scan_type
+    return runner
+
+
+@pytest.fixture
+def task_runners():
+    """Return the fake task runners of a job scanning vCenter and network sources."""
+    return [
+        fake_runner(DataSources.VCENTER, ScanTask.SCAN_TYPE_CONNECT),
+        fake_runner(DataSources.VCENTER, ScanTask.SCAN_TYPE_CONNECT),
+        fake_runner(DataSources.VCENTER, ScanTask.SCAN_TYPE_CONNECT),
+        fake_runner(DataSources.NETWORK, ScanTask.SCAN_TYPE_CONNECT),
+        fake_runner(DataSources.VCENTER, ScanTask.SCAN_TYPE_INSPECT),
+        fake_runner(DataSources.VCENTER, ScanTask.SCAN_TYPE_INSPECT),
+    ]
+
+
+def test_group_task_runners_sequential_by_default(task_runners):
+    """Assert each task runner is alone in its group by default."""
+    assert group_task_runners(task_runners) == [[runner] for runner in task_runners]
+
+
+def test_group_task_runners_vcenter_sources(settings, task_runners):
+    """Assert consecutive vCenter task runners of a scan type are grouped."""
+    settings.QPC_MAX_CONCURRENT_VCENTER_SOURCES = 2
+    assert group_task_runners(task_runners) == [
+        task_runners[0:2],
+        task_runners[2:3],
+        task_runners[3:4],
+        task_runners[4:6],
+    ]
+
+
+def test_run_task_runners_concurrently(mocker):
+    """Assert a group of task runners run at the same time."""
+    runners = [Mock(), Mock()]
+    barrier = threading.Barrier(len(runners), timeout=5)
+
+    def run_task_runner(runner, manager_interrupt):
+        barrier.wait()
+        return ScanTask.FAILED if runner is runners[0] else ScanTask.COMPLETED
+
+    mocker.patch.object(job, "run_task_runner", side_effect=run_task_runner)
+    job_runner = SyncScanJobRunner(Mock())
+    assert job_runner.run_task_runners(runners) == [
+        ScanTask.FAILED,
+        ScanTask.COMPLETED,
+    ]
+
+
+def test_run_task_runners_interrupted(mocker):
+    """Assert every task runner of a group sees an interrupt of the scan job."""
+    runners = [Mock(), Mock()]
+    barrier = threading.Barrier(len(runners), timeout=5)
+    seen_interrupts = []
+
+    def run_task_runner(runner, manager_interrupt):
+        seen_interrupts.append(manager_interrupt.value)
+        # acknowledge like ScanTaskRunner.handle_interrupt_exception
+        manager_interrupt.value = ScanJob.JOB_TERMINATE_ACK
+        barrier.wait()
+        return ScanTask.CANCELED
+
+    mocker.patch.object(job, "run_task_runner", side_effect=run_task_runner)
+    manager_interrupt = Value("i", ScanJob.JOB_TERMINATE_CANCEL)
+    job_runner = SyncScanJobRunner(Mock(), manager_interrupt)
+    assert job_runner.run_task_runners(runners) == [ScanTask.CANCELED] * 2
+    assert seen_interrupts == [ScanJob.JOB_TERMINATE_CANCEL] * 2
+    assert manager_interrupt.value == ScanJob.JOB_TERMINATE_ACK
+
+
+def test_task_interrupt_keeps_acknowledgement():
+    """Assert acknowledging a TaskInterrupt leaves the shared interrupt alone."""
+    manager_interrupt = Value("i", ScanJob.JOB_RUN)
+    task_interrupt = TaskInterrupt(manager_interrupt)
+    manager_interrupt.value = ScanJob.JOB_TERMINATE_PAUSE
+    assert task_interrupt.value == ScanJob.JOB_TERMINATE_PAUSE
+
+    task_interrupt.value = ScanJob.JOB_TERMINATE_ACK
+    assert task_interrupt.value == ScanJob.JOB_TERMINATE_ACK
+    assert manager_interrupt.value == ScanJob.JOB_TERMINATE_PAUSE
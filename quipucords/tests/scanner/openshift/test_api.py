@@ -1,11 +1,13 @@
 """Abstraction for retrieving data from OpenShift/Kubernetes API."""
 
+import threading
 from pathlib import Path
 from uuid import UUID
 
 import httpretty
 import pytest
 
+from scanner.openshift import api
 from scanner.openshift.api import OpenShiftApi
 from scanner.openshift.entities import (
     ClusterOperator,
@@ -16,6 +18,7 @@ from scanner.openshift.entities import (
     OCPNode,
     OCPPod,
     OCPWorkload,
+    OCPWorkloads,
 )
 from tests.asserts import assert_elements_type
 from tests.constants import ConstantsFromEnv, VCRCassettes
@@ -133,7 +136,7 @@ def test_cluster_api(ocp_client: OpenShiftApi):
 )
 def test_cluster_operators_api(ocp_client: OpenShiftApi):
     """Test _cluster_api."""
-    cluster_operators = ocp_client._list_cluster_operators()
+    cluster_operators = list(ocp_client._paginate(ocp_client._list_cluster_operators))
     assert cluster_operators
 
 
@@ -142,14 +145,14 @@ def test_cluster_operators_api(ocp_client: OpenShiftApi):
 )
 def test_subscriptions_api(ocp_client: OpenShiftApi):
     """Test _cluster_api."""
-    subscriptions = ocp_client._list_subscriptions()
+    subscriptions = list(ocp_client._paginate(ocp_client._list_subscriptions))
     assert subscriptions
 
 
 @pytest.mark.vcr_primer(VCRCassettes.OCP_CSV, VCRCassettes.OCP_DISCOVERER_CACHE)
 def test_csv_api(ocp_client: OpenShiftApi):
     """Test _list_cluster_service_versions."""
-    csv_list = ocp_client._list_cluster_service_versions()
+    csv_list = list(ocp_client._paginate(ocp_client._list_cluster_service_versions))
     assert csv_list
 
 
@@ -168,8 +171,10 @@ def test_retrieve_cluster(ocp_client: OpenShiftApi):
     VCRCassettes.OCP_CSV,
     VCRCassettes.OCP_DISCOVERER_CACHE,
 )
-def test_retrieve_operators(ocp_client: OpenShiftApi):
+def test_retrieve_operators(ocp_client: OpenShiftApi, mocker):
     """Test retrieve operators method."""
+    # VCR can't replay the requests of concurrent threads reliably
+    mocker.patch.object(api, "MAX_CONCURRENT_RETRIEVALS", 1)
     operators = ocp_client.retrieve_operators()
     assert isinstance(operators, list)
     assert isinstance(operators[0], ClusterOperator)
@@ -196,16 +201,20 @@ def test_olm_operator_construction(ocp_client: OpenShiftApi, mocker, faker):
     csv.metadata.name = operator_csv
     csv.spec.displayName = operator_display_name
 
-    mocker.patch.object(OpenShiftApi, "_list_cluster_operators")
+    mocker.patch.object(
+        OpenShiftApi,
+        "_list_cluster_operators",
+        return_value=mocker.Mock(items=[], metadata={"continue": None}),
+    )
     mocker.patch.object(
         OpenShiftApi,
         "_list_subscriptions",
-        return_value=mocker.Mock(items=[subscription]),
+        return_value=mocker.Mock(items=[subscription], metadata={"continue": None}),
     )
     mocker.patch.object(
         OpenShiftApi,
         "_list_cluster_service_versions",
-        return_value=mocker.Mock(items=[csv]),
+        return_value=mocker.Mock(items=[csv], metadata={"continue": None}),
     )
 
     operators = ocp_client.retrieve_operators()
@@ -217,7 +226,7 @@ def test_olm_operator_construction(ocp_client: OpenShiftApi, mocker, faker):
 @pytest.mark.vcr_primer(VCRCassettes.OCP_NODE, VCRCassettes.OCP_DISCOVERER_CACHE)
 def test_node_api(ocp_client: OpenShiftApi):
     """Test _node_api."""
-    nodes = ocp_client._list_nodes()
+    nodes = list(ocp_client._paginate(ocp_client._list_nodes))
     assert nodes
 
 
@@ -280,7 +289,7 @@ def test_cannot_connect(
 @pytest.mark.vcr_primer(VCRCassettes.OCP_PODS, VCRCassettes.OCP_DISCOVERER_CACHE)
 def test_pods_api(ocp_client: OpenShiftApi):
     """Test pods api."""
-    pods = ocp_client._list_pods()
+    pods = list(ocp_client._paginate(ocp_client._list_pods))
     assert pods
 
 
@@ -300,6 +309,58 @@ def test_retrieve_workloads(ocp_client: OpenShiftApi):
     """Test retrieving workloads."""
     pods = ocp_client.retrieve_pods()
     workloads = ocp_client.retrieve_workloads()
-    assert_elements_type(workloads, OCPWorkload)
+    assert isinstance(workloads, OCPWorkloads)
+    assert_elements_type(workloads.workloads(), OCPWorkload)
     assert len(workloads) < len(pods)
-    assert {p.app_name for p in pods} == {a.name for a in workloads}
+    assert {p.app_name for p in pods} == set(workloads.names)
+    first_pods = {}
+    for pod in pods:
+        first_pods.setdefault((pod.namespace, pod.app_name), pod)
+    assert workloads.workloads() == [
+        OCPWorkload(**{**pod.dict(), "name": app_name})
+        for (_, app_name), pod in first_pods.items()
+    ]
+
+
+def test_paginate(ocp_client: OpenShiftApi, mocker, settings):
+    """Test list calls are paginated following their continue token."""
+    settings.QPC_OPENSHIFT_LIST_LIMIT = 2
+    list_method = mocker.Mock(
+        side_effect=[
+            mocker.Mock(items=[1, 2], metadata={"continue": "next-page"}),
+            mocker.Mock(items=[3], metadata={"continue": None}),
+        ]
+    )
+    items = ocp_client._paginate(list_method, timeout_seconds=10)
+    assert next(items) == 1
+    assert list_method.mock_calls == [mocker.call(limit=2, timeout_seconds=10)]
+    assert list(items) == [2, 3]
+    assert list_method.mock_calls == [
+        mocker.call(limit=2, timeout_seconds=10),
+        mocker.call(limit=2, timeout_seconds=10, _continue="next-page"),
+    ]
+
+
+def test_retrieve_concurrently(ocp_client: OpenShiftApi, mocker):
+    """Test retrieve methods run at the same time and errors are isolated."""
+    barrier = threading.Barrier(2, timeout=5)
+    error = OCPError(status=500, reason="error-reason", message="error-message")
+
+    def retrieve_nodes(**kwargs):
+        barrier.wait()
+        return ["node"]
+
+    def retrieve_operators(**kwargs):
+        barrier.wait()
+        raise error
+
+    retrieve_nodes = mocker.Mock(side_effect=retrieve_nodes)
+    results = ocp_client.retrieve_concurrently(
+        {"nodes": retrieve_nodes, "operators": retrieve_operators},
+        timeout_seconds=10,
+    )
+    assert list(results) == ["nodes", "operators"]
+    assert results["nodes"][0] == ["node"]
+    assert results["operators"][0] is error
+    assert all(elapsed >= 0 for _, elapsed in results.values())
+    retrieve_nodes.assert_called_once_with(timeout_seconds=10)
@@ -1,5 +1,6 @@
 """Test OCPEntities methods."""
 
+import json
 from copy import deepcopy
 
 import pytest
@@ -10,6 +11,8 @@ from scanner.openshift.entities import (
     OCPBaseEntity,
     OCPCluster,
     OCPError,
+    OCPWorkload,
+    OCPWorkloads,
     load_entity,
 )
 
@@ -198,3 +201,37 @@ def test_memory_validator_with_inappropriate_values(value):
     with pytest.raises(ValidationError) as exc_info:
         NodeResources(memory_in_bytes=value)
     assert "value is not a valid integer" in str(exc_info.value)
+
+
+def test_workloads_round_trip():
+    """Test OCPWorkloads stores repeated values once and expands back to workloads."""
+    workloads = [
+        {
+            "name": "app",
+            "namespace": "project",
+            "labels": {"app": "app", "tier": "web"},
+            "container_images": ["nginx", "sidecar"],
+        },
+        {
+            "name": "db",
+            "namespace": "project",
+            "labels": {"tier": "web", "app": "app"},
+            "container_images": ["postgres", "sidecar"],
+            "init_container_images": ["nginx"],
+        },
+        {"name": "job", "namespace": "other", "labels": None},
+    ]
+    compact_workloads = OCPWorkloads.from_workloads(workloads)
+    assert len(compact_workloads) == 3
+    assert compact_workloads.namespaces == ["project", "other"]
+    assert compact_workloads.images == ["nginx", "sidecar", "postgres"]
+    assert compact_workloads.label_sets == [{"app": "app", "tier": "web"}, {}]
+    assert compact_workloads.container_image_indexes == [[0, 1], [2, 1], []]
+    assert compact_workloads.init_container_image_indexes == [[], [0], []]
+
+    loaded_workloads = load_entity(json.loads(compact_workloads.json()))
+    assert loaded_workloads == compact_workloads
+    assert loaded_workloads.workloads() == [
+        OCPWorkload(**{**workload, "labels": workload["labels"] or {}})
+        for workload in workloads
+    ]
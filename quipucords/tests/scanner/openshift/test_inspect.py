@@ -1,5 +1,6 @@
 """Test OpenShift InspectTaskRunner."""
 import os
+import re
 from unittest import mock
 
 import pytest
@@ -18,7 +19,8 @@ from scanner.openshift.entities import (
     OCPCluster,
     OCPError,
     OCPNode,
-    OCPWorkload,
+    OCPWorkloads,
+    load_entity,
 )
 from tests.factories import ScanTaskFactory
 
@@ -63,9 +65,9 @@ def operators(faker):
 
 
 @pytest.fixture
-def workload():
-    """Return OCPWorkload entity."""
-    return OCPWorkload(name="workload", namespace="project")
+def workloads():
+    """Return OCPWorkloads entity."""
+    return OCPWorkloads.from_workloads([{"name": "workload", "namespace": "project"}])
 
 
 @pytest.fixture
@@ -265,14 +267,14 @@ def test_inspect_with_enabled_workloads(  # noqa: PLR0913
     scan_task: ScanTask,
     cluster,
     node_ok,
-    workload,
+    workloads,
     operators,
     workloads_enabled,
 ):
     """Test connecting to OpenShift host with enabled workloads."""
     mocker.patch.object(OpenShiftApi, "retrieve_cluster", return_value=cluster)
     mocker.patch.object(OpenShiftApi, "retrieve_nodes", return_value=[node_ok])
-    mocker.patch.object(OpenShiftApi, "retrieve_workloads", return_value=[workload])
+    mocker.patch.object(OpenShiftApi, "retrieve_workloads", return_value=workloads)
     mocker.patch.object(OpenShiftApi, "retrieve_operators", return_value=operators)
 
     runner = InspectTaskRunner(scan_task=scan_task, scan_job=scan_task.job)
@@ -280,7 +282,9 @@ def test_inspect_with_enabled_workloads(  # noqa: PLR0913
 
     raw_facts = scan_task.get_facts()
     cluster = raw_facts[-1]
-    assert "workloads" in cluster.keys()
+    assert [load_entity(workload) for workload in cluster["workloads"]] == (
+        workloads.workloads()
+    )
 
 
 @pytest.mark.django_db
@@ -292,7 +296,7 @@ def test_inspect_with_disabled_workloads(  # noqa: PLR0913
     mocker.patch.object(OpenShiftApi, "retrieve_nodes", return_value=[node_ok])
     mocker.patch.object(OpenShiftApi, "retrieve_operators", return_value=operators)
     mock_retrieve_workloads = mocker.patch.object(
-        OpenShiftApi, "retrieve_workloads", return_value=[workload]
+        OpenShiftApi, "retrieve_workloads", return_value=mocker.Mock()
     )
 
     runner = InspectTaskRunner(scan_task=scan_task, scan_job=scan_task.job)
@@ -303,3 +307,36 @@ def test_inspect_with_disabled_workloads(  # noqa: PLR0913
     cluster = raw_facts[-1]
     assert "workloads" not in cluster.keys()
     assert set(("cluster", "operators")).issubset(cluster.keys())
+
+
+@pytest.mark.django_db
+def test_inspect_logs_retrieval_times(  # noqa: PLR0913
+    mocker, scan_task: ScanTask, cluster, node_ok, error, caplog
+):
+    """Test the time spent retrieving each resource is logged."""
+    mocker.patch.object(OpenShiftApi, "retrieve_cluster", return_value=cluster)
+    mocker.patch.object(OpenShiftApi, "retrieve_nodes", return_value=[node_ok])
+    mocker.patch.object(OpenShiftApi, "retrieve_operators", side_effect=error)
+
+    runner = InspectTaskRunner(scan_task=scan_task, scan_job=scan_task.job)
+    runner.execute_task(mocker.Mock())
+
+    for message in [
+        r"Retrieved cluster facts in \d+\.\d\ds\.",
+        r"Retrieved nodes facts in \d+\.\d\ds\.",
+        r"Failed retrieving operators facts after \d+\.\d\ds\.",
+    ]:
+        assert any(re.search(message, log_message) for log_message in caplog.messages)
+    assert set(cluster.errors) == {"operators"}
+
+
+@pytest.mark.django_db
+def test_inspect_nodes_error(mocker, scan_task: ScanTask, cluster, error):
+    """Test errors retrieving nodes still stop the inspection."""
+    mocker.patch.object(OpenShiftApi, "retrieve_cluster", return_value=cluster)
+    mocker.patch.object(OpenShiftApi, "retrieve_nodes", side_effect=error)
+    mocker.patch.object(OpenShiftApi, "retrieve_operators", return_value=[])
+
+    runner = InspectTaskRunner(scan_task=scan_task, scan_job=scan_task.job)
+    with pytest.raises(OCPError):
+        runner.execute_task(mocker.Mock())
@@ -4,6 +4,7 @@ from unittest.mock import Mock, patch
 import pytest
 from django.test import override_settings
 
+from api.models import SystemInspectionResult
 from api.scantask.model import ScanTask
 from constants import DataSources
 from scanner.satellite import six
@@ -13,7 +14,7 @@ from tests.factories import ScanTaskFactory
 def fake_six_request_host_details(  # noqa: PLR0913
     scan_task,
     logging_options,
-    host,
+    host_id,
     host_name,
     fields_url,
     subs_url,
@@ -23,19 +24,20 @@ def fake_six_request_host_details(  # noqa: PLR0913
 
     This function's signature must match six._request_host_details's signature.
     """
-    # Note that `host` is normally a dict with keys other than "name",
-    # but we can simplify and assume "name" since we are mocking/patching calls.
     return {
-        "unique_name": f"{host['name']}-unique_name",
-        "system_inspection_result": f"{host['name']}-system_inspection_result",
-        "host_fields_response": f"{host['name']}-host_fields_response",
-        "host_subscriptions_response": f"{host['name']}-host_subscriptions_response",
+        "unique_name": f"{host_name}_{host_id}",
+        "system_inspection_result": SystemInspectionResult.FAILED,
+        "host_fields_response": {},
+        "host_subscriptions_response": {},
     }
 
 
 def fake_prepare_hosts(hosts, *args, **kwargs):
     """Prepare a minimally-populated object to mimic SatelliteSix.prepare_hosts."""
-    return [(None, None, name, None, None, None, {}) for name in hosts]
+    return [
+        (kwargs.get("scan_task_id"), {}, host["id"], host["name"], None, None, {})
+        for host in hosts
+    ]
 
 
 @pytest.fixture
@@ -73,8 +75,17 @@ def inspect_scan_job():
 
 @override_settings(QPC_ENABLE_CELERY_SCAN_MANAGER=True)
 @pytest.mark.django_db(transaction=True)
-def test__prepare_and_process_hosts_using_celery(
-    mock_prepare_hosts, mock__request_host_details, celery_worker, inspect_scan_job
+@pytest.mark.parametrize(
+    "systems_count,expected_status",
+    [(3, ScanTask.COMPLETED), (4, ScanTask.FAILED)],
+)
+def test__prepare_and_process_hosts_using_celery(  # noqa: PLR0913
+    mock_prepare_hosts,
+    mock__request_host_details,
+    celery_worker,
+    inspect_scan_job,
+    systems_count,
+    expected_status,
 ):
     """Test SatelliteInterface._prepare_and_process_hosts Celery task interaction.
 
@@ -84,26 +95,41 @@ def test__prepare_and_process_hosts_using_celery(
 
     We use the celery_worker fixture here to embed a live worker because we are
     interested specifically in verifying that the Celery tasks are invoked as expected.
-    We patch out their inner implementations, though, because they would normally make
+    We patch out the host details requests, though, because they would normally make
     external API calls.
     """
     inspect_scan_task = inspect_scan_job.tasks.first()
+    inspect_scan_task.update_stats("TEST", sys_count=systems_count)
     satellite = six.SatelliteSixV2(inspect_scan_job, inspect_scan_task)
+    satellite.max_concurrency = 2
 
-    hosts = [{"name": "host_a"}, {"name": "host_b"}, {"name": "host_c"}]
-
-    expected_prepare_host_return = [
-        # All these Nones are just to fill out the function signature.
-        # Since we are patching, we do not need to supply real values for everything.
-        fake_six_request_host_details(None, None, host, None, None, None, None)
-        for host in hosts
+    hosts = [
+        {"id": 1, "name": "host_a"},
+        {"id": 2, "name": "host_b"},
+        {"id": 3, "name": "host_c"},
     ]
-
-    mock_process_results = Mock()
     satellite._prepare_and_process_hosts(
-        hosts, six.request_host_details, mock_process_results, None
+        hosts,
+        six.request_host_details,
+        Mock(),
+        None,
+        six.record_host_details_chunk.s(api_version=2),
     )
 
     mock_prepare_hosts.assert_called_once()
+    mock__request_host_details.assert_not_called()
+    chord = satellite.host_details_signature
+    assert [len(chunk.args[1]) for chunk in chord.tasks] == [2, 1]
+
+    success, scan_task_id, status = chord.apply_async().get()
+    assert (success, scan_task_id, status) == (
+        expected_status == ScanTask.COMPLETED,
+        inspect_scan_task.id,
+        expected_status,
+    )
     assert mock__request_host_details.call_count == len(hosts)
-    mock_process_results.assert_called_once_with(results=expected_prepare_host_return)
+    inspect_scan_task.refresh_from_db()
+    assert inspect_scan_task.status == expected_status
+    assert sorted(
+        inspect_scan_task.inspection_result.systems.values_list("name", flat=True)
+    ) == ["host_a_1", "host_b_2", "host_c_3"]
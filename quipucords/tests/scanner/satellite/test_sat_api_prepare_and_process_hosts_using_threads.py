@@ -0,0 +1,113 @@
+"""Test SatelliteInterface._prepare_and_process_hosts with the threaded inspector."""
+import threading
+import time
+from multiprocessing import Value
+from unittest.mock import Mock, patch
+
+import pytest
+from django.test import override_settings
+
+from api.models import ScanJob, ScanTask
+from constants import DataSources
+from scanner.satellite import api, six
+from scanner.satellite.api import SatelliteCancelException
+from tests.factories import ScanTaskFactory
+
+
+class FakeRequestHostDetails:
+    """Fake request_host_details that tracks how many requests run at once."""
+
+    def __init__(self, delay=0.01):
+        """Initialize the fake."""
+        self.delay = delay
+        self.calls = 0
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, host_name):
+        """Pretend to request the details of one host."""
+        self.calls += 1
+        if host_name == "broken":
+            raise ConnectionError(host_name)
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.delay)
+        with self.lock:
+            self.running -= 1
+        return {"unique_name": host_name}
+
+
+@pytest.fixture
+def satellite():
+    """Return a SatelliteSixV2 with simplified host preparation."""
+    inspect_task = ScanTaskFactory(
+        source__source_type=DataSources.SATELLITE,
+        scan_type=ScanTask.SCAN_TYPE_INSPECT,
+    )
+    satellite = six.SatelliteSixV2(inspect_task.job, inspect_task)
+    satellite.max_concurrency = 3
+    with patch.object(
+        six.SatelliteSixV2,
+        "prepare_hosts",
+        side_effect=lambda hosts: [(host["name"],) for host in hosts],
+    ):
+        yield satellite
+
+
+@pytest.mark.django_db
+@override_settings(QPC_ENABLE_SATELLITE_THREADED_INSPECTOR=True)
+@patch.object(api, "RESULTS_BATCH_SIZE", 4)
+@patch.object(api.utils, "validate_task_stats")
+def test_threaded_inspector_records_batches(mock_validate_task_stats, satellite):
+    """Test all hosts are requested concurrently and recorded in batches."""
+    hosts = [{"name": f"host_{number}"} for number in range(10)]
+    request_host_details = FakeRequestHostDetails()
+    process_results = Mock()
+
+    satellite._prepare_and_process_hosts(
+        hosts, request_host_details, process_results, Value("i", ScanJob.JOB_RUN)
+    )
+
+    assert request_host_details.max_running == satellite.max_concurrency
+    batches = [call.kwargs["results"] for call in process_results.call_args_list]
+    assert all(len(batch) <= 4 for batch in batches)  # noqa: PLR2004
+    assert sorted(result["unique_name"] for batch in batches for result in batch) == (
+        sorted(host["name"] for host in hosts)
+    )
+    mock_validate_task_stats.assert_called_once_with(satellite.inspect_scan_task)
+
+
+@pytest.mark.django_db
+def test_threaded_inspector_interrupted(satellite):
+    """Test the threaded inspector stops when the scan job is canceled."""
+    hosts = [{"name": f"host_{number}"} for number in range(100)]
+    request_host_details = FakeRequestHostDetails(delay=0.05)
+    process_results = Mock()
+
+    with pytest.raises(SatelliteCancelException):
+        satellite._prepare_and_process_hosts_using_threads(
+            hosts,
+            request_host_details,
+            process_results,
+            Value("i", ScanJob.JOB_TERMINATE_CANCEL),
+        )
+    process_results.assert_not_called()
+    assert request_host_details.running == 0
+
+
+@pytest.mark.django_db
+def test_threaded_inspector_request_error(satellite):
+    """Test unexpected request errors stop the threaded inspector."""
+    hosts = [{"name": "host_a"}, {"name": "broken"}] + [
+        {"name": f"host_{number}"} for number in range(100)
+    ]
+    request_host_details = FakeRequestHostDetails()
+
+    with pytest.raises(ConnectionError, match="broken"):
+        satellite._prepare_and_process_hosts_using_threads(
+            hosts, request_host_details, Mock(), Value("i", ScanJob.JOB_RUN)
+        )
+    assert request_host_details.calls < len(hosts)
+    assert request_host_details.running == 0
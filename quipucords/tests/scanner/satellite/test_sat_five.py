@@ -1,9 +1,10 @@
 """Test the satellite five interface."""
+import threading
 import xmlrpc.client
-from multiprocessing import Value
+from multiprocessing import Pool, SimpleQueue, Value
 from unittest.mock import ANY, patch
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from api.models import (
     Credential,
@@ -16,8 +17,14 @@ from api.models import (
     TaskConnectionResult,
 )
 from constants import DataSources
-from scanner.satellite.api import SatelliteException
-from scanner.satellite.five import SatelliteFive, request_host_details
+from scanner.satellite import five
+from scanner.satellite.api import SatelliteException, close_sessions_at_exit
+from scanner.satellite.five import (
+    SatelliteFive,
+    record_host_details_chunk,
+    request_host_details,
+    request_host_details_batch,
+)
 from tests.scanner.test_util import create_scan_job
 
 
@@ -71,6 +78,7 @@ class SatelliteFiveTest(TestCase):
 
     def tearDown(self):
         """Cleanup test case setup."""
+        five.close_sessions(self.scan_task.id)
 
     @patch("xmlrpc.client.ServerProxy")
     def test_host_count(self, mock_serverproxy):
@@ -139,19 +147,20 @@ class SatelliteFiveTest(TestCase):
         }
         client = mock_serverproxy.return_value
         client.auth.login.return_value = "key"
-        client.auth.logout.return_value = "key"
-        client.system.get_uuid.return_value = ""
         cpu = {"arch": "x86", "count": 2, "socket_count": 2}
-        client.system.get_cpu.return_value = cpu
         system_details = {"hostname": "sys1_hostname", "release": "7server"}
-        client.system.get_details.return_value = system_details
-        client.system.get_running_kernel.return_value = "kernel"
-        client.system.get_entitlements.return_value = ["ent1"]
         net_devices = [
             {"interface": "eth0", "ip": "1.2.3.4", "hardware_address": "1:a:2:b:3:c"}
         ]
-        client.system.get_network_devices.return_value = net_devices
-        client.system.get_registration_date.return_value = "datetime"
+        client.system.multicall.return_value = [
+            [""],
+            [cpu],
+            [system_details],
+            ["kernel"],
+            [["ent1"]],
+            [net_devices],
+            ["datetime"],
+        ]
         virt = {1: {"id": 1, "num_virtual_guests": 3}}
 
         logging_options = {
@@ -202,7 +211,9 @@ class SatelliteFiveTest(TestCase):
         }
         client = mock_serverproxy.return_value
         client.auth.login.return_value = "key"
-        client.auth.logout.return_value = "key"
+        client.system.multicall.side_effect = xmlrpc.client.Fault(
+            faultCode=-1, faultString="no such method"
+        )
         client.system.get_uuid.return_value = ""
         cpu = {"arch": "x86", "count": 2, "socket_count": 2}
         client.system.get_cpu.return_value = cpu
@@ -371,19 +382,21 @@ class SatelliteFiveTest(TestCase):
     @patch(
         "multiprocessing.pool.Pool.starmap",
         return_value=[
-            {
-                "host_name": "sys10",
-                "last_checkin": "",
-                "host_id": 1,
-                "cpu": {},
-                "uuid": 1,
-                "system_details": {},
-                "kernel": "",
-                "subs": [],
-                "network_devices": [],
-                "registration_date": "",
-                "system_inspection_result": SystemInspectionResult.SUCCESS,
-            }
+            [
+                {
+                    "host_name": "sys10",
+                    "last_checkin": "",
+                    "host_id": 1,
+                    "cpu": {},
+                    "uuid": 1,
+                    "system_details": {},
+                    "kernel": "",
+                    "subs": [],
+                    "network_devices": [],
+                    "registration_date": "",
+                    "system_inspection_result": SystemInspectionResult.SUCCESS,
+                }
+            ]
         ],
     )
     @patch("xmlrpc.client.ServerProxy")
@@ -404,5 +417,180 @@ class SatelliteFiveTest(TestCase):
                 self.api.hosts_facts(Value("i", ScanJob.JOB_RUN))
                 inspect_result = self.scan_task.inspection_result
                 self.assertEqual(len(inspect_result.systems.all()), 1)
+                request_details, batches = mock_pool.call_args.args
+                self.assertIs(request_details, request_host_details_batch)
+                self.assertEqual([len(batch) for batch in batches], [1])
                 mock_vhosts.assert_called_once_with()
                 mock_physical.assert_called_once_with()
+
+    @patch("xmlrpc.client.ServerProxy")
+    def test_record_host_details_chunk_batches_hosts(self, mock_serverproxy):
+        """Test a chunk of hosts shares one session and batches calls per host."""
+        client = mock_serverproxy.return_value
+        client.auth.login.return_value = "key"
+        host_count = five.MULTICALL_BATCH_SIZE + 1
+        details = [[""], [{}], [{}], ["kernel"], [[]], [[]], ["datetime"]]
+        faulty_details = [
+            {"faultCode": 2950, "faultString": "Could not find session"}
+        ] + details[1:]
+        client.system.multicall.side_effect = [
+            details * five.MULTICALL_BATCH_SIZE,
+            faulty_details,
+            faulty_details,
+        ]
+        for host_id in range(2, host_count + 1):
+            SystemConnectionResult.objects.create(
+                name=f"sys{host_id}_{host_id}",
+                status=SystemInspectionResult.SUCCESS,
+                task_connection_result=self.api.connect_scan_task.connection_result,
+            )
+        host_params = self.api.prepare_hosts(
+            (
+                {"id": host_id, "name": f"sys{host_id}"}
+                for host_id in range(1, host_count + 1)
+            ),
+            ids_only=True,
+        )
+
+        record_host_details_chunk(
+            self.scan_task.id,
+            host_params,
+            virtual_hosts=[],
+            virtual_guests=[],
+            physical_hosts=[],
+        )
+
+        # the second batch failed with a reused key, so it's retried after a login
+        self.assertEqual(client.auth.login.call_count, 2)
+        self.assertEqual(client.system.multicall.call_count, 3)
+        first_batch = client.system.multicall.call_args_list[0].args[0]
+        self.assertEqual(
+            len(first_batch),
+            five.MULTICALL_BATCH_SIZE * len(five.HOST_DETAILS_METHODS),
+        )
+        # the expired key is logged out, then the new one once the chunk is done
+        self.assertEqual(client.auth.logout.call_count, 2)
+        statuses = dict(
+            self.scan_task.inspection_result.systems.values_list("name", "status")
+        )
+        self.assertEqual(len(statuses), host_count)
+        self.assertEqual(
+            statuses.pop(f"sys{host_count}_{host_count}"),
+            SystemInspectionResult.FAILED,
+        )
+        self.assertEqual(set(statuses.values()), {SystemInspectionResult.SUCCESS})
+
+    @patch("xmlrpc.client.ServerProxy")
+    def test_request_hosts_details_retries_only_session_faults(self, mock_serverproxy):
+        """Test hosts failing for another reason than the session aren't retried."""
+        client = mock_serverproxy.return_value
+        client.auth.login.return_value = "key"
+        details = [[""], [{}], [{}], ["kernel"], [[]], [[]], ["datetime"]]
+        client.system.multicall.return_value = [
+            {"faultCode": 1, "faultString": "no such system"}
+        ] + details[1:]
+        session = five.get_session(self.scan_task)
+        session.login()
+
+        (result,) = session.request_hosts_details([1])
+
+        self.assertIsInstance(result, xmlrpc.client.Fault)
+        self.assertEqual(client.auth.login.call_count, 1)
+        self.assertEqual(client.system.multicall.call_count, 1)
+
+    @patch("xmlrpc.client.ServerProxy")
+    def test_hosts_facts_threaded_batches_hosts(self, mock_serverproxy):
+        """Test the threaded inspector requests several hosts per multicall."""
+        client = mock_serverproxy.return_value
+        client.auth.login.return_value = "key"
+        client.system.list_user_systems.return_value = [
+            {"id": host_id, "name": f"sys{host_id}"}
+            for host_id in range(1, five.MULTICALL_BATCH_SIZE + 2)
+        ]
+        for host_id in range(2, five.MULTICALL_BATCH_SIZE + 2):
+            SystemConnectionResult.objects.create(
+                name=f"sys{host_id}_{host_id}",
+                status=SystemInspectionResult.SUCCESS,
+                task_connection_result=self.api.connect_scan_task.connection_result,
+            )
+        details = [[""], [{}], [{}], ["kernel"], [[]], [[]], ["datetime"]]
+        # batches run in threads, so each multicall is answered by its size
+        client.system.multicall.side_effect = lambda calls: details * (
+            len(calls) // len(five.HOST_DETAILS_METHODS)
+        )
+        with patch.object(
+            SatelliteFive, "virtual_hosts", return_value=({}, {})
+        ), patch.object(
+            SatelliteFive, "physical_hosts", return_value=[]
+        ), override_settings(
+            QPC_ENABLE_SATELLITE_THREADED_INSPECTOR=True
+        ):
+            self.api.hosts_facts(Value("i", ScanJob.JOB_RUN))
+
+        self.assertEqual(
+            sorted(
+                len(call.args[0]) for call in client.system.multicall.call_args_list
+            ),
+            [
+                len(five.HOST_DETAILS_METHODS),
+                five.MULTICALL_BATCH_SIZE * len(five.HOST_DETAILS_METHODS),
+            ],
+        )
+        self.assertEqual(
+            self.scan_task.inspection_result.systems.count(),
+            five.MULTICALL_BATCH_SIZE + 1,
+        )
+
+    @patch("xmlrpc.client.ServerProxy")
+    def test_get_session_logs_out_replaced_session(self, mock_serverproxy):
+        """Test a session left by another scan task is logged out and replaced."""
+        client = mock_serverproxy.return_value
+        client.auth.login.return_value = "key"
+        session = five.get_session(self.scan_task)
+        session.login()
+        _, other_scan_task = create_scan_job(
+            self.source, ScanTask.SCAN_TYPE_INSPECT, scan_name="other"
+        )
+
+        other_session = five.get_session(other_scan_task)
+
+        self.assertIsNot(other_session, session)
+        client.auth.logout.assert_called_once_with("key")
+        five.close_sessions(other_scan_task.id)
+
+    @patch("xmlrpc.client.ServerProxy")
+    def test_close_sessions_of_worker_threads(self, mock_serverproxy):
+        """Test sessions opened by worker threads are closed with their scan task."""
+        client = mock_serverproxy.return_value
+        client.auth.login.return_value = "key"
+        request_options = self.api._prepare_host_request_options()
+        sessions = []
+
+        def request_hosts():
+            session = five.get_session(self.scan_task, request_options)
+            session.login()
+            sessions.append(session)
+
+        worker = threading.Thread(target=request_hosts)
+        worker.start()
+        worker.join()
+        five.close_sessions(self.scan_task.id)
+        client.auth.logout.assert_called_once_with("key")
+
+        # a worker thread reused for the same scan task opens a new session
+        session = five.get_session(self.scan_task)
+        self.assertIsNot(session, sessions[0])
+        five.close_sessions(self.scan_task.id)
+        self.assertEqual(client.auth.logout.call_count, 1)
+
+    def test_close_sessions_at_exit(self):
+        """Test pool workers close the sessions of the scan task when they exit."""
+        closed = SimpleQueue()
+        with Pool(
+            processes=1,
+            initializer=close_sessions_at_exit,
+            initargs=(closed.put, self.scan_task.id),
+        ) as pool:
+            pool.close()
+            pool.join()
+        self.assertEqual(closed.get(), self.scan_task.id)
@@ -3,7 +3,7 @@ from multiprocessing import Value
 from unittest.mock import ANY, patch
 
 import requests_mock
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from faker import Faker
 
 from api.models import (
@@ -25,6 +25,7 @@ from scanner.satellite.six import (
     host_fields,
     host_subscriptions,
     process_results,
+    request_full_results,
     request_host_details,
 )
 from scanner.satellite.utils import construct_url
@@ -1093,3 +1094,107 @@ class SatelliteSixV2Test(TestCase):
             api.hosts_facts(Value("i", ScanJob.JOB_RUN))
             inspect_result = scan_task.inspection_result
             self.assertEqual(len(inspect_result.systems.all()), 1)
+
+    def test_request_full_results(self):
+        """Test full results are requested concurrently and yielded in order."""
+        hosts_url = "https://{sat_host}:{port}/api/v2/hosts"
+        url = construct_url(url=hosts_url, sat_host="1.2.3.4")
+        hosts = [{"id": host_id, "name": f"sys{host_id}"} for host_id in range(5)]
+
+        def hosts_page(request, context):
+            page = int(request.qs["page"][0])
+            return {
+                "total": len(hosts),
+                "subtotal": len(hosts),
+                "page": page,
+                "per_page": 2,
+                "results": hosts[(page - 1) * 2 : page * 2],
+            }
+
+        with requests_mock.Mocker() as mocker:
+            mocker.get(url, status_code=200, json=hosts_page)
+            results = list(
+                request_full_results(
+                    self.scan_task,
+                    hosts_url,
+                    max_concurrency=2,
+                    options=self.api._prepare_host_request_options(),
+                    per_page=2,
+                )
+            )
+            self.assertEqual(results, hosts)
+            self.assertEqual(
+                sorted(request.qs["page"] for request in mocker.request_history),
+                [["1"], ["2"], ["3"]],
+            )
+            for request in mocker.request_history:
+                self.assertEqual(request.qs["fields"], ["full"])
+                self.assertNotIn("thin", request.qs)
+
+    @override_settings(
+        QPC_ENABLE_SATELLITE_BULK_HOST_FIELDS=True,
+        QPC_ENABLE_SATELLITE_THREADED_INSPECTOR=True,
+    )
+    def test_hosts_facts_bulk_host_fields(self):
+        """Test hosts listed with full fields skip the per-host fields request."""
+        hosts_url = "https://{sat_host}:{port}/api/v2/hosts"
+        fields_url = "https://{sat_host}:{port}/api/v2/hosts/{host_id}"
+        subs_url = "https://{sat_host}:{port}/api/v2/hosts/{host_id}/subscriptions"
+        full_host = {
+            "id": 10,
+            "name": "sys10",
+            "facts": {"cpu::cpu_socket(s)": "2"},
+            "subscription_facet_attributes": {"uuid": "uuid10"},
+        }
+        thin_host = {"id": 11, "name": "sys11"}
+        SystemConnectionResult.objects.create(
+            name="sys2_2",
+            status=SystemInspectionResult.SUCCESS,
+            task_connection_result=self.api.connect_scan_task.connection_result,
+        )
+        with requests_mock.Mocker() as mocker:
+            mocker.get(
+                construct_url(url=hosts_url, sat_host="1.2.3.4"),
+                status_code=200,
+                json={
+                    "total": 2,
+                    "subtotal": 2,
+                    "page": 1,
+                    "per_page": 100,
+                    "results": [full_host, thin_host],
+                },
+            )
+            full_host_fields = mocker.get(
+                construct_url(url=fields_url, sat_host="1.2.3.4", host_id=10),
+                status_code=200,
+                json=full_host,
+            )
+            thin_host_fields = mocker.get(
+                construct_url(url=fields_url, sat_host="1.2.3.4", host_id=11),
+                status_code=200,
+                json={**thin_host, "subscription_facet_attributes": {"uuid": "u11"}},
+            )
+            subscriptions = [
+                mocker.get(
+                    construct_url(url=subs_url, sat_host="1.2.3.4", host_id=host_id),
+                    status_code=200,
+                    json={"results": []},
+                )
+                for host_id in (10, 11)
+            ]
+            self.api.hosts_facts(Value("i", ScanJob.JOB_RUN))
+
+            self.assertFalse(full_host_fields.called)
+            self.assertTrue(thin_host_fields.called)
+            self.assertTrue(all(subs.called for subs in subscriptions))
+        systems = self.scan_task.inspection_result.systems.all()
+        self.assertEqual(
+            {system.name: system.status for system in systems},
+            {
+                "sys10_10": SystemInspectionResult.SUCCESS,
+                "sys11_11": SystemInspectionResult.SUCCESS,
+            },
+        )
+        facts = dict(systems.get(name="sys10_10").facts.values_list("name", "value"))
+        self.assertEqual(facts["uuid"], "uuid10")
+        self.assertEqual(facts["num_sockets"], "2")
@@ -1,11 +1,16 @@
 """Test the satellite utils."""
 import xmlrpc.client
+from pathlib import Path
+from tempfile import TemporaryDirectory
 from unittest.mock import ANY, patch
 
+import httpretty
 import requests_mock
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from api.models import Credential, ScanTask, Source, SourceOptions
+from api.scan.model import DEFAULT_MAX_CONCURRENCY
+from compat.requests import ResponseCache
 from constants import DataSources
 from scanner.satellite.api import (
     SATELLITE_VERSION_5,
@@ -15,12 +20,15 @@ from scanner.satellite.api import (
 )
 from scanner.satellite.utils import (
     _status5,
+    close_response_cache,
     construct_url,
     data_map,
     execute_request,
     get_connect_data,
     get_credential,
+    get_response_cache,
     get_sat5_client,
+    get_session,
     status,
     validate_task_stats,
 )
@@ -96,6 +104,75 @@ class SatelliteUtilsTest(TestCase):
             self.assertEqual(response.status_code, 200)
             self.assertEqual(response.json(), jsonresult)
 
+    def test_execute_request_reuses_session(self):
+        """Test requests of one process share the same HTTP session."""
+        status_url = "https://{sat_host}:{port}/api/status"
+        session = get_session()
+        self.assertIs(session, get_session())
+        with patch.object(session, "get") as mock_get:
+            execute_request(self.scan_task, status_url)
+            execute_request(self.scan_task, status_url)
+        self.assertEqual(mock_get.call_count, 2)
+        with patch("scanner.satellite.utils.os.getpid", return_value=-1):
+            self.assertIsNot(get_session(), session)
+
+    @patch("scanner.satellite.utils._sessions", {})
+    def test_get_session_grows_connection_pool(self):
+        """Test the session is replaced when more concurrent requests are sent."""
+        session = get_session(2)
+        self.assertIs(get_session(1), session)
+        larger_session = get_session(DEFAULT_MAX_CONCURRENCY + 1)
+        self.assertIsNot(larger_session, session)
+        self.assertIs(get_session(), larger_session)
+        adapter = larger_session.get_adapter("https://1.2.3.4")
+        self.assertEqual(adapter._pool_maxsize, DEFAULT_MAX_CONCURRENCY + 1)
+
+    @httpretty.activate(allow_net_connect=False)
+    def test_execute_request_keeps_no_cookies(self):
+        """Test a cookie set for a credential isn't sent with another one."""
+        status_url = "https://{sat_host}:{port}/api/status"
+        httpretty.register_uri(
+            httpretty.GET,
+            construct_url(status_url, "1.2.3.4"),
+            body="{}",
+            set_cookie="_session_id=session; Path=/",
+        )
+        execute_request(self.scan_task, status_url)
+        execute_request(self.scan_task, status_url)
+        self.assertNotIn("Cookie", httpretty.last_request().headers)
+        self.assertEqual(len(get_session().cookies), 0)
+
+    @httpretty.activate(allow_net_connect=False)
+    def test_execute_request_revalidates_cached_response(self):
+        """Test unchanged responses are served from the response cache."""
+        status_url = "https://{sat_host}:{port}/api/status"
+        httpretty.register_uri(
+            httpretty.GET,
+            construct_url(status_url, "1.2.3.4"),
+            responses=[
+                httpretty.Response(body='{"version": "6"}', etag='"v1"'),
+                httpretty.Response(body="", status=304, etag='"v1"'),
+            ],
+        )
+        with TemporaryDirectory() as cache_directory, override_settings(
+            QPC_ENABLE_HTTP_RESPONSE_CACHE=True,
+            QPC_HTTP_CACHE_DIRECTORY=Path(cache_directory),
+        ):
+            execute_request(self.scan_task, status_url)
+            response, _ = execute_request(self.scan_task, status_url)
+            cache = get_response_cache(self.scan_task)
+            credential_cache = ResponseCache(f"{self.source.id}:{self.cred.id}")
+            with patch.object(ScanTask, "log_message") as log_message:
+                self.assertIs(close_response_cache(self.scan_task.id), cache)
+        self.assertEqual(httpretty.last_request().headers["If-None-Match"], '"v1"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"version": "6"})
+        self.assertEqual(cache.directory, credential_cache.directory)
+        log_message.assert_called_once_with(
+            "HTTP response cache: 1 hits, 1 misses, 16 bytes saved."
+        )
+        self.assertIsNone(close_response_cache(self.scan_task.id))
+
     @patch(
         "scanner.satellite.utils._status6",
         return_value=(200, SATELLITE_VERSION_6, SATELLITE_VERSION_6),
@@ -5,6 +5,7 @@ from django.test import override_settings
 from api.scantask.model import ScanTask
 from constants import DataSources
 from scanner import tasks
+from scanner.runner import ScanJobStatusInterrupt
 from tests.factories import ScanTaskFactory
 
 
@@ -37,8 +38,37 @@ def test_celery_run_task_runner(mocker, runner_return_value, expect_success):
 
     mock_get_task_runner_class.assert_called_once_with(source_type, scan_type)
     mock_run_task_runner.assert_called_once_with(
-        mock_get_task_runner_class.return_value.return_value
+        mock_get_task_runner_class.return_value.return_value, mocker.ANY
     )
+    manager_interrupt = mock_run_task_runner.call_args.args[1]
+    assert isinstance(manager_interrupt, ScanJobStatusInterrupt)
+    assert manager_interrupt.scan_job_id == scan_task.job_id
     assert success is expect_success
     assert scan_task_id == scan_task.id
     assert task_status == runner_return_value
+
+
+@pytest.mark.django_db(transaction=True)
+def test_celery_run_task_runner_replaced_by_continuation(mocker, celery_worker):
+    """Test celery_run_task_runner is replaced by the runner's celery_continuation.
+
+    This uses the celery_worker fixture because Celery can't replace eager tasks.
+    """
+    scan_type = ScanTask.SCAN_TYPE_INSPECT
+    source_type = DataSources.SATELLITE
+    scan_task = ScanTaskFactory(source__source_type=source_type, scan_type=scan_type)
+
+    mock_get_task_runner_class = mocker.patch.object(tasks, "get_task_runner_class")
+    runner = mock_get_task_runner_class.return_value.return_value
+    runner.celery_continuation = tasks.finalize_scan.si(scan_task.job.id)
+    mocker.patch.object(tasks, "run_task_runner", return_value=ScanTask.RUNNING)
+    mock_finalize_scan = mocker.patch.object(
+        tasks, "_finalize_scan", return_value="finalized"
+    )
+
+    result = tasks.celery_run_task_runner.delay(
+        scan_task.id, source_type, scan_type
+    ).get()
+
+    mock_finalize_scan.assert_called_once_with(scan_task.job.id)
+    assert result == "finalized"
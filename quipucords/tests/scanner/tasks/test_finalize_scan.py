@@ -46,3 +46,19 @@ def test_finalize_scan_some_failed(caplog):
     scan_job.refresh_from_db()
     assert scan_job.status == ScanTask.FAILED
     assert f"The following tasks failed: [{running_task.id}]" in caplog.messages[0]
+
+
+@override_settings(CELERY_TASK_ALWAYS_EAGER=True)
+@pytest.mark.django_db
+@pytest.mark.parametrize("status", (ScanTask.PAUSED, ScanTask.CANCELED))
+def test_finalize_scan_interrupted(status):
+    """Test finalize_scan leaves paused and canceled jobs as they are."""
+    scan_job = ScanJobFactory(status=status)
+    scan_job.tasks.add(
+        ScanTaskFactory(scan_type=ScanTask.SCAN_TYPE_CONNECT, status=status)
+    )
+
+    tasks.finalize_scan.delay(scan_job.id).get()
+
+    scan_job.refresh_from_db()
+    assert scan_job.status == status
@@ -44,7 +44,7 @@ def test_fingerprint_happy_path_details_report_already_exists(mocker):
     assert mock_fingerprint_runner_class.call_args[0][0].id == scan_job.id
     assert mock_fingerprint_runner_class.call_args[0][1].id == scan_task.id
     mock_fingerprint_runner = mock_fingerprint_runner_class.return_value
-    mock_run_task_runner.assert_called_with(mock_fingerprint_runner)
+    mock_run_task_runner.assert_called_with(mock_fingerprint_runner, mocker.ANY)
     mock_create_details_report.assert_not_called()
 
 
@@ -80,7 +80,7 @@ def test_fingerprint_happy_path_creates_details_report(mocker):
     assert mock_fingerprint_runner_class.call_args[0][0].id == scan_job.id
     assert mock_fingerprint_runner_class.call_args[0][1].id == scan_task.id
     mock_fingerprint_runner = mock_fingerprint_runner_class.return_value
-    mock_run_task_runner.assert_called_with(mock_fingerprint_runner)
+    mock_run_task_runner.assert_called_with(mock_fingerprint_runner, mocker.ANY)
 
 
 @override_settings(CELERY_TASK_ALWAYS_EAGER=True)
@@ -109,3 +109,25 @@ def test_fingerprint_fails_when_create_details_report_fails(mocker):
     assert scan_job.report_id is None
     mock_run_task_runner.assert_not_called()
     mock_fingerprint_runner_class.assert_not_called()
+
+
+@override_settings(CELERY_TASK_ALWAYS_EAGER=True, QPC_ENABLE_REPORT_ARTIFACTS=True)
+@pytest.mark.django_db
+def test_fingerprint_precomputes_report_artifacts(mocker):
+    """Test fingerprint queues the report artifacts once the report is created."""
+    scan_job = ScanJobFactory(status=ScanTask.RUNNING, report_id=None)
+    details_report = DetailsReportFactory(scanjob=None)
+    scan_task = ScanTaskFactory(
+        scan_type=ScanTask.SCAN_TYPE_FINGERPRINT,
+        status=ScanTask.PENDING,
+        details_report=details_report,
+        job=scan_job,
+    )
+    mocker.patch("scanner.tasks.run_task_runner", return_value=ScanTask.COMPLETED)
+    mocker.patch.object(tasks, "FingerprintTaskRunner")
+    mock_precompute = mocker.patch.object(tasks, "precompute_artifacts")
+
+    success, _, _ = tasks.fingerprint.delay(scan_task.id).get()
+
+    assert success
+    mock_precompute.delay.assert_called_once_with(details_report.deployment_report.id)
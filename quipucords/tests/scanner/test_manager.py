@@ -0,0 +1,166 @@
+"""Test the threaded scan job Manager."""
+
+from datetime import datetime
+from multiprocessing import Value
+from unittest.mock import Mock
+
+import pytest
+
+from api.models import ScanJob, ScanTask
+from scanner import manager
+from scanner.job import ProcessBasedScanJobRunner
+from scanner.manager import CeleryScanManager, Manager
+from tests.factories import ScanJobFactory, ScanTaskFactory
+
+
+@pytest.fixture
+def job_runner_factory():
+    """Return a factory of fake ProcessBasedScanJobRunners."""
+    job_ids = iter(range(1, 1000))
+
+    def _create_runner(scan_id):
+        job_id = next(job_ids)
+        runner = Mock(spec=ProcessBasedScanJobRunner)
+        runner.identifier = job_id
+        runner.scan_job = Mock(id=job_id, scan_id=scan_id, status=ScanTask.PENDING)
+        runner.manager_interrupt = Value("i", ScanJob.JOB_RUN)
+        runner.is_alive.return_value = True
+        return runner
+
+    return _create_runner
+
+
+@pytest.mark.django_db
+def test_manager_runs_jobs_up_to_slot_count(settings, job_runner_factory):
+    """Assert the manager only starts as many jobs as it has slots."""
+    settings.QPC_MAX_CONCURRENT_SCAN_JOBS = 2
+    scan_manager = Manager()
+    runners = [job_runner_factory(scan_id) for scan_id in (1, 2, 3)]
+    for runner in runners:
+        scan_manager.put(runner)
+
+    scan_manager.work()
+    assert list(scan_manager.current_job_runners) == [1, 2]
+    assert scan_manager.queued_job_runners == [runners[2]]
+    runners[0].start.assert_called_once()
+    runners[2].start.assert_not_called()
+
+    runners[0].is_alive.return_value = False
+    scan_manager.check_current_job_runners()
+    scan_manager.work()
+    assert list(scan_manager.current_job_runners) == [2, 3]
+    assert scan_manager.queued_job_runners == []
+
+
+def test_manager_queue_is_fair_across_scans(settings, job_runner_factory):
+    """Assert jobs from a busy scan don't delay jobs from other scans."""
+    settings.QPC_MAX_CONCURRENT_SCAN_JOBS = 1
+    scan_manager = Manager()
+    first_scan_runners = [job_runner_factory(1) for _ in range(3)]
+    second_scan_runner = job_runner_factory(2)
+    for runner in first_scan_runners + [second_scan_runner]:
+        scan_manager.put(runner)
+
+    assert scan_manager.queued_job_runners == [
+        first_scan_runners[0],
+        second_scan_runner,
+        first_scan_runners[1],
+        first_scan_runners[2],
+    ]
+
+
+@pytest.mark.django_db
+def test_manager_queue_priority_follows_running_jobs(settings, job_runner_factory):
+    """Assert queued jobs are prioritized by the jobs running when they start."""
+    settings.QPC_MAX_CONCURRENT_SCAN_JOBS = 2
+    scan_manager = Manager()
+    first_scan_runners = [job_runner_factory(1) for _ in range(3)]
+    for runner in first_scan_runners:
+        scan_manager.put(runner)
+    scan_manager.work()
+    second_scan_runners = [job_runner_factory(2) for _ in range(3)]
+    for runner in second_scan_runners:
+        scan_manager.put(runner)
+    assert scan_manager.queued_job_runners[0] == second_scan_runners[0]
+
+    for runner in first_scan_runners[:2]:
+        runner.is_alive.return_value = False
+    scan_manager.check_current_job_runners()
+    assert scan_manager.queued_job_runners == [
+        first_scan_runners[2],
+        second_scan_runners[0],
+        second_scan_runners[1],
+        second_scan_runners[2],
+    ]
+    scan_manager.work()
+    assert list(scan_manager.current_job_runners) == [3, 4]
+
+
+@pytest.mark.parametrize(
+    "command,interrupt",
+    [("pause", ScanJob.JOB_TERMINATE_PAUSE), ("cancel", ScanJob.JOB_TERMINATE_CANCEL)],
+)
+def test_manager_kill_running_job(settings, job_runner_factory, command, interrupt):
+    """Assert killing one running job keeps its slot until the process ends."""
+    settings.QPC_MAX_CONCURRENT_SCAN_JOBS = 2
+    scan_manager = Manager()
+    runners = [job_runner_factory(scan_id) for scan_id in (1, 2, 3)]
+    for runner in runners:
+        scan_manager.put(runner)
+    scan_manager.work()
+
+    scan_manager.kill(runners[1].scan_job, command)
+    assert runners[1].manager_interrupt.value == interrupt
+    assert list(scan_manager.current_job_runners) == [1]
+    assert list(scan_manager.terminated_job_runners) == [2]
+
+    scan_manager.check_terminated_job_runners()
+    scan_manager.work()
+    runners[2].start.assert_not_called()
+
+    runners[1].is_alive.return_value = False
+    scan_manager.check_terminated_job_runners()
+    scan_manager.work()
+    assert list(scan_manager.current_job_runners) == [1, 3]
+    assert scan_manager.terminated_job_runners == {}
+
+
+def test_manager_kill_queued_job(settings, job_runner_factory):
+    """Assert killing a queued job removes it from the queue."""
+    settings.QPC_MAX_CONCURRENT_SCAN_JOBS = 1
+    scan_manager = Manager()
+    runners = [job_runner_factory(scan_id) for scan_id in (1, 2, 3)]
+    for runner in runners:
+        scan_manager.put(runner)
+
+    assert scan_manager.kill(runners[1].scan_job, "cancel")
+    assert scan_manager.queued_job_runners == [runners[0], runners[2]]
+    assert not scan_manager.kill(Mock(id=100), "cancel")
+
+
+@pytest.mark.django_db
+def test_celery_manager_kill_revokes_incomplete_tasks(mocker):
+    """Assert the Celery manager revokes the tasks of the job it kills."""
+    mock_revoke = mocker.patch.object(manager.celery_app.control, "revoke")
+    scan_job = ScanJobFactory(status=ScanTask.RUNNING, start_time=datetime(2023, 1, 1))
+    ScanTaskFactory(job=scan_job, status=ScanTask.COMPLETED)
+    running_task = ScanTaskFactory(job=scan_job, status=ScanTask.RUNNING)
+
+    assert CeleryScanManager().kill(scan_job, "pause")
+    run_id = "20230101000000000000"
+    mock_revoke.assert_called_once_with(
+        [
+            f"scanjob-{scan_job.id}-{run_id}-{running_task.id}",
+            f"scanjob-{scan_job.id}-{run_id}-finalize",
+        ]
+    )
+
+
+@pytest.mark.django_db
+def test_celery_manager_kill_not_started_job(mocker):
+    """Assert the Celery manager has nothing to revoke for jobs that never ran."""
+    mock_revoke = mocker.patch.object(manager.celery_app.control, "revoke")
+    scan_job = ScanJobFactory(status=ScanTask.PENDING, start_time=None)
+
+    assert not CeleryScanManager().kill(scan_job, "cancel")
+    mock_revoke.assert_not_called()
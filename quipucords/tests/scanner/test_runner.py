@@ -0,0 +1,41 @@
+"""Test the scanner.runner module."""
+
+import pytest
+
+from api.models import ScanJob, ScanTask
+from scanner.runner import ScanJobStatusInterrupt
+from tests.factories import ScanJobFactory
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "status,expected_value",
+    (
+        (ScanTask.RUNNING, ScanJob.JOB_RUN),
+        (ScanTask.PAUSED, ScanJob.JOB_TERMINATE_PAUSE),
+        (ScanTask.CANCELED, ScanJob.JOB_TERMINATE_CANCEL),
+    ),
+)
+def test_scan_job_status_interrupt(status, expected_value):
+    """Test ScanJobStatusInterrupt translates the scan job status."""
+    scan_job = ScanJobFactory(status=status)
+    assert ScanJobStatusInterrupt(scan_job.id).value == expected_value
+
+
+@pytest.mark.django_db
+def test_scan_job_status_interrupt_polling(mocker, django_assert_num_queries):
+    """Test ScanJobStatusInterrupt polls at most once per interval until set."""
+    scan_job = ScanJobFactory(status=ScanTask.RUNNING)
+    mock_monotonic = mocker.patch("scanner.runner.monotonic", return_value=100)
+    manager_interrupt = ScanJobStatusInterrupt(scan_job.id)
+    with django_assert_num_queries(1):
+        assert manager_interrupt.value == ScanJob.JOB_RUN
+        assert manager_interrupt.value == ScanJob.JOB_RUN
+
+    scan_job.status_pause()
+    mock_monotonic.return_value += manager_interrupt.poll_interval
+    assert manager_interrupt.value == ScanJob.JOB_TERMINATE_PAUSE
+
+    manager_interrupt.value = ScanJob.JOB_TERMINATE_ACK
+    with django_assert_num_queries(0):
+        assert manager_interrupt.value == ScanJob.JOB_TERMINATE_ACK
@@ -3,20 +3,21 @@ from multiprocessing import Value
 from socket import gaierror
 from unittest.mock import ANY, Mock, patch
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from pyVmomi import vim
 
 from api.models import Credential, ScanJob, ScanTask, Source
 from scanner.vcenter.connect import ConnectTaskRunner, get_vm_names
+from scanner.vcenter.inspect import InspectTaskRunner
 from tests.scanner.test_util import create_scan_job
 
 
-def invalid_login():
+def invalid_login(*args):
     """Mock with invalid login exception."""
     raise vim.fault.InvalidLogin()
 
 
-def unreachable_host():
+def unreachable_host(*args):
     """Mock with gaierror."""
     raise gaierror("Unreachable")
 
@@ -61,6 +62,25 @@ class ConnectTaskRunnerTest(TestCase):
         self.runner._store_connect_data(vm_names, self.cred, self.source)
         self.assertEqual(len(self.scan_job.connection_results.task_results.all()), 1)
 
+    @override_settings(QPC_VCENTER_SAVE_BATCH_SIZE=2)
+    def test_store_connect_data_in_batches(self):
+        """Test connection results are saved in batches."""
+        vm_names = ["vm1", "vm2", "vm3"]
+
+        with patch.object(
+            self.scan_task, "increment_stats", wraps=self.scan_task.increment_stats
+        ) as mock_increment_stats:
+            self.runner._store_connect_data(vm_names, self.cred, self.source)
+        self.assertEqual(mock_increment_stats.call_count, 2)
+        self.scan_task.refresh_from_db()
+        self.assertEqual(self.scan_task.systems_scanned, 3)
+        self.assertEqual(
+            sorted(
+                self.scan_task.connection_result.systems.values_list("name", flat=True)
+            ),
+            vm_names,
+        )
+
     def test_get_vm_names(self):
         """Test the get vm names method."""
         objects = [
@@ -97,6 +117,48 @@ class ConnectTaskRunnerTest(TestCase):
                 mock_vcenter_connect.assert_called_once_with(ANY)
                 mock_names.assert_called_once_with(ANY)
 
+    @override_settings(QPC_ENABLE_VCENTER_COMBINED_SCAN=True)
+    def test_connect_combined_scan(self):
+        """Test the connect task records the inspection in combined scans."""
+        scan_job, inspect_task = create_scan_job(
+            self.source, ScanTask.SCAN_TYPE_INSPECT, scan_name="combined"
+        )
+        connect_task = scan_job.tasks.get(scan_type=ScanTask.SCAN_TYPE_CONNECT)
+        runner = ConnectTaskRunner(scan_job=scan_job, scan_task=connect_task)
+
+        def retrieve_properties(inspect_runner, content, manager_interrupt):
+            inspect_runner.save_vms_facts([{"vm.name": "vm1"}, {"vm.name": "vm2"}])
+
+        with patch(
+            "scanner.vcenter.connect.vcenter_connect", return_value=Mock()
+        ) as mock_vcenter_connect, patch(
+            "scanner.vcenter.connect.get_vm_names"
+        ) as mock_names, patch.object(
+            InspectTaskRunner, "retrieve_properties", retrieve_properties
+        ):
+            status = runner.run(Value("i", ScanJob.JOB_RUN))
+        self.assertEqual(ScanTask.COMPLETED, status[1])
+        mock_vcenter_connect.assert_called_once_with(connect_task)
+        mock_names.assert_not_called()
+        self.assertEqual(
+            sorted(
+                connect_task.connection_result.systems.values_list("name", flat=True)
+            ),
+            ["vm1", "vm2"],
+        )
+        inspect_task.refresh_from_db()
+        self.assertEqual(inspect_task.systems_count, 2)
+        self.assertEqual(inspect_task.systems_scanned, 2)
+
+        # the inspect task keeps the results and doesn't connect again
+        connect_task.status_complete()
+        inspect_runner = InspectTaskRunner(scan_job=scan_job, scan_task=inspect_task)
+        with patch("scanner.vcenter.inspect.vcenter_connect") as mock_connect:
+            status = inspect_runner.run(Value("i", ScanJob.JOB_RUN))
+        self.assertEqual(ScanTask.COMPLETED, status[1])
+        mock_connect.assert_not_called()
+        self.assertEqual(inspect_task.inspection_result.systems.count(), 2)
+
     def test_get_result_none(self):
         """Test get result method when no results exist."""
         results = self.scan_task.get_result().systems.first()
@@ -113,27 +175,30 @@ class ConnectTaskRunnerTest(TestCase):
         with patch.object(
             ConnectTaskRunner, "connect", side_effect=invalid_login
         ) as mock_connect:
-            status = self.runner.run(Value("i", ScanJob.JOB_RUN))
+            manager_interrupt = Value("i", ScanJob.JOB_RUN)
+            status = self.runner.run(manager_interrupt)
             self.assertEqual(ScanTask.FAILED, status[1])
-            mock_connect.assert_called_once_with()
+            mock_connect.assert_called_once_with(manager_interrupt)
 
     def test_unreachable_run(self):
         """Test the run method with unreachable."""
         with patch.object(
             ConnectTaskRunner, "connect", side_effect=unreachable_host
         ) as mock_connect:
-            status = self.runner.run(Value("i", ScanJob.JOB_RUN))
+            manager_interrupt = Value("i", ScanJob.JOB_RUN)
+            status = self.runner.run(manager_interrupt)
             self.assertEqual(ScanTask.FAILED, status[1])
-            mock_connect.assert_called_once_with()
+            mock_connect.assert_called_once_with(manager_interrupt)
 
     def test_run(self):
         """Test the run method."""
         with patch.object(
             ConnectTaskRunner, "connect", return_value=["vm1", "vm2"]
         ) as mock_connect:
-            status = self.runner.run(Value("i", ScanJob.JOB_RUN))
+            manager_interrupt = Value("i", ScanJob.JOB_RUN)
+            status = self.runner.run(manager_interrupt)
             self.assertEqual(ScanTask.COMPLETED, status[1])
-            mock_connect.assert_called_once_with()
+            mock_connect.assert_called_once_with(manager_interrupt)
 
     def test_cancel(self):
         """Test the run method with cancel."""
@@ -2,17 +2,24 @@
 
 from datetime import datetime
 from multiprocessing import Value
-from unittest.mock import ANY, Mock, patch
-
-from django.test import TestCase
-from pyVmomi import vim
-
-from api.models import Credential, ScanJob, ScanTask, Source
+from unittest.mock import ANY, Mock, call, patch
+
+from django.test import TestCase, override_settings
+from pyVmomi import vim, vmodl
+
+from api.models import (
+    Credential,
+    ScanJob,
+    ScanTask,
+    Source,
+    SystemConnectionResult,
+)
+from scanner.exceptions import ScanCancelException
 from scanner.vcenter.inspect import InspectTaskRunner, get_nics
 from tests.scanner.test_util import create_scan_job
 
 
-def invalid_login():
+def invalid_login(*args):
     """Mock with invalid login exception."""
     raise vim.fault.InvalidLogin()
 
@@ -209,7 +216,7 @@ class InspectTaskRunnerTest(TestCase):
             "scanner.vcenter.inspect.get_nics",
             return_value=(mac_addresses, ip_addresses),
         ):
-            self.runner.parse_vm_props(props, host_dict)
+            self.runner.save_vms_facts([self.runner.parse_vm_props(props, host_dict)])
 
             inspect_result = self.scan_task.inspection_result
             sys_results = inspect_result.systems.all()
@@ -240,35 +247,34 @@ class InspectTaskRunnerTest(TestCase):
             self.assertEqual("vm1", sys_results.first().name)
             self.assertEqual(expected_facts, sys_fact)
 
+    @override_settings(QPC_VCENTER_MAX_OBJECTS_PER_PAGE=2)
     def test_retrieve_properties(self):
         """Test the retrieve_properties method."""
         content = Mock()
         content.rootFolder = vim.Folder("group-d1")
 
-        objects_first_page = [
-            vim.ObjectContent(
-                obj=vim.Folder("group-d1"),
-            ),
-            vim.ObjectContent(
-                obj=vim.ClusterComputeResource("domain-c1"),
-            ),
+        topology_pages = [
+            [
+                vim.ObjectContent(obj=vim.Folder("group-d1")),
+                vim.ObjectContent(obj=vim.ClusterComputeResource("domain-c1")),
+            ],
+            [vim.ObjectContent(obj=vim.HostSystem("host-1"))],
         ]
-
-        objects_second_page = [
-            vim.ObjectContent(
-                obj=vim.HostSystem("host-1"),
-            ),
-            vim.ObjectContent(
-                obj=vim.VirtualMachine("vm-1"),
-            ),
+        vm_pages = [
+            [
+                vim.ObjectContent(obj=vim.VirtualMachine("vm-1")),
+                vim.ObjectContent(obj=vim.VirtualMachine("vm-2")),
+            ],
+            [vim.ObjectContent(obj=vim.VirtualMachine("vm-3"))],
+        ]
+        content.propertyCollector.RetrievePropertiesEx.side_effect = [
+            Mock(token="topology", objects=topology_pages[0]),
+            Mock(token="vms", objects=vm_pages[0]),
+        ]
+        content.propertyCollector.ContinueRetrievePropertiesEx.side_effect = [
+            Mock(token=None, objects=topology_pages[1]),
+            Mock(token=None, objects=vm_pages[1]),
         ]
-
-        content.propertyCollector.RetrievePropertiesEx(ANY).token = "1"
-        content.propertyCollector.RetrievePropertiesEx(ANY).objects = objects_first_page
-        content.propertyCollector.ContinueRetrievePropertiesEx(ANY).token = None
-        content.propertyCollector.ContinueRetrievePropertiesEx(
-            ANY
-        ).objects = objects_second_page
 
         with patch.object(
             InspectTaskRunner, "parse_parent_props"
@@ -278,13 +284,156 @@ class InspectTaskRunnerTest(TestCase):
             InspectTaskRunner, "parse_host_props"
         ) as mock_parse_host_props, patch.object(
             InspectTaskRunner, "parse_vm_props"
-        ) as mock_parse_vm_props:
+        ) as mock_parse_vm_props, patch.object(
+            InspectTaskRunner, "save_vms_facts"
+        ):
+            self.runner.retrieve_properties(content)
+            mock_parse_parent_props.assert_called_once_with(ANY, ANY)
+            mock_parse_cluster_props.assert_called_once_with(ANY, ANY)
+            mock_parse_host_props.assert_called_once_with(ANY, ANY)
+            self.assertEqual(mock_parse_vm_props.call_count, 3)
+
+        retrieve_calls = content.propertyCollector.RetrievePropertiesEx.call_args_list
+        topology_types = {
+            prop_spec.type
+            for prop_spec in retrieve_calls[0].kwargs["specSet"][0].propSet
+        }
+        self.assertNotIn(vim.VirtualMachine, topology_types)
+        vm_types = {
+            prop_spec.type
+            for prop_spec in retrieve_calls[1].kwargs["specSet"][0].propSet
+        }
+        self.assertEqual(vm_types, {vim.VirtualMachine})
+        for retrieve_call in retrieve_calls:
+            self.assertEqual(retrieve_call.kwargs["options"].maxObjects, 2)
+        content.propertyCollector.ContinueRetrievePropertiesEx.assert_has_calls(
+            [call("topology"), call("vms")]
+        )
+
+    @override_settings(QPC_VCENTER_SAVE_BATCH_SIZE=2)
+    def test_retrieve_properties_saves_vms_in_batches(self):
+        """Test virtual machines are saved in batches with one stats update each."""
+        content = Mock()
+        content.rootFolder = vim.Folder("group-d1")
+        vms = [
+            vim.ObjectContent(
+                obj=vim.VirtualMachine(f"vm-{number}"),
+                propSet=[vmodl.DynamicProperty(name="name", val=f"vm{number}")],
+            )
+            for number in range(5)
+        ]
+        content.propertyCollector.RetrievePropertiesEx.side_effect = [
+            Mock(token=None, objects=[]),
+            Mock(token=None, objects=vms),
+        ]
 
+        with patch.object(
+            self.scan_task, "increment_stats", wraps=self.scan_task.increment_stats
+        ) as mock_increment_stats:
             self.runner.retrieve_properties(content)
-            mock_parse_parent_props.assert_called_with(ANY, ANY)
-            mock_parse_cluster_props.assert_called_with(ANY, ANY)
-            mock_parse_host_props.assert_called_with(ANY, ANY)
-            mock_parse_vm_props.assert_called_with(ANY, ANY)
+        self.assertEqual(
+            [call.kwargs["amount"] for call in mock_increment_stats.call_args_list],
+            [2, 2, 1],
+        )
+        self.scan_task.refresh_from_db()
+        self.assertEqual(self.scan_task.systems_scanned, 5)
+        sys_results = self.scan_task.inspection_result.systems.all()
+        self.assertEqual(
+            sorted(sys_results.values_list("name", flat=True)),
+            [f"vm{number}" for number in range(5)],
+        )
+        for sys_result in sys_results:
+            self.assertEqual(
+                sys_result.facts.get(name="vm.name").value, sys_result.name
+            )
+
+    @override_settings(QPC_VCENTER_MAX_CONCURRENT_DATACENTERS=2)
+    def test_retrieve_properties_datacenters_concurrently(self):
+        """Test each datacenter is traversed with its own PropertyCollector."""
+        content = Mock()
+        content.rootFolder = vim.Folder("group-d1")
+        datacenters = [vim.Datacenter(f"datacenter-{number}") for number in range(3)]
+        content.propertyCollector.RetrievePropertiesEx.return_value = Mock(
+            token=None,
+            objects=[vim.ObjectContent(obj=datacenter) for datacenter in datacenters],
+        )
+        property_collectors = {}
+
+        def create_property_collector():
+            property_collector = Mock()
+
+            def retrieve_vms(specSet, options):  # noqa: N803
+                datacenter = specSet[0].objectSet[0].obj
+                property_collectors[datacenter] = property_collector
+                return Mock(
+                    token=None,
+                    objects=[
+                        vim.ObjectContent(
+                            obj=vim.VirtualMachine(f"vm-{datacenter._moId}"),
+                            propSet=[
+                                vmodl.DynamicProperty(
+                                    name="name", val=f"vm-{datacenter._moId}"
+                                )
+                            ],
+                        )
+                    ],
+                )
+
+            property_collector.RetrievePropertiesEx.side_effect = retrieve_vms
+            return property_collector
+
+        content.propertyCollector.CreatePropertyCollector.side_effect = (
+            create_property_collector
+        )
+
+        self.runner.retrieve_properties(content, Value("i", ScanJob.JOB_RUN))
+        self.assertEqual(set(property_collectors), set(datacenters))
+        self.assertEqual(
+            len({id(collector) for collector in property_collectors.values()}), 3
+        )
+        for property_collector in property_collectors.values():
+            property_collector.DestroyPropertyCollector.assert_called_once_with()
+        content.propertyCollector.RetrievePropertiesEx.assert_called_once()
+        self.assertEqual(
+            sorted(
+                self.scan_task.inspection_result.systems.values_list("name", flat=True)
+            ),
+            [f"vm-{datacenter._moId}" for datacenter in datacenters],
+        )
+
+    @override_settings(QPC_VCENTER_MAX_CONCURRENT_DATACENTERS=2)
+    def test_retrieve_properties_interrupted_between_pages(self):
+        """Test the scan job is checked for interruptions between pages."""
+        content = Mock()
+        content.rootFolder = vim.Folder("group-d1")
+        content.propertyCollector.RetrievePropertiesEx.return_value = Mock(
+            token=None,
+            objects=[
+                vim.ObjectContent(obj=vim.Datacenter(f"datacenter-{number}"))
+                for number in range(2)
+            ],
+        )
+        # each datacenter has endless pages of virtual machines
+        property_collector = content.propertyCollector.CreatePropertyCollector()
+        property_collector.RetrievePropertiesEx.return_value = Mock(
+            token="more", objects=[vim.ObjectContent(obj=vim.VirtualMachine("vm-1"))]
+        )
+        property_collector.ContinueRetrievePropertiesEx.return_value = (
+            property_collector.RetrievePropertiesEx.return_value
+        )
+        manager_interrupt = Value("i", ScanJob.JOB_RUN)
+
+        def save_vms_facts(vms_facts):
+            manager_interrupt.value = ScanJob.JOB_TERMINATE_CANCEL
+
+        with patch.object(InspectTaskRunner, "parse_vm_props"), patch.object(
+            InspectTaskRunner, "save_vms_facts", side_effect=save_vms_facts
+        ) as mock_save_vms_facts:
+            with self.assertRaises(ScanCancelException):
+                self.runner.retrieve_properties(content, manager_interrupt)
+        mock_save_vms_facts.assert_called_once()
+        # the datacenter threads stopped and released their PropertyCollectors
+        self.assertEqual(property_collector.DestroyPropertyCollector.call_count, 2)
 
     def test_inspect(self):
         """Test the inspect method."""
@@ -297,16 +446,17 @@ class InspectTaskRunnerTest(TestCase):
                 self.runner.connect_scan_task = self.connect_scan_task
                 self.runner.inspect()
                 mock_vcenter_connect.assert_called_once_with(ANY)
-                mock_retrieve_props.assert_called_once_with(ANY)
+                mock_retrieve_props.assert_called_once_with(ANY, None)
 
     def test_failed_run(self):
         """Test the run method."""
         with patch.object(
             InspectTaskRunner, "inspect", side_effect=invalid_login
         ) as mock_connect:
-            status = self.runner.run(Value("i", ScanJob.JOB_RUN))
+            manager_interrupt = Value("i", ScanJob.JOB_RUN)
+            status = self.runner.run(manager_interrupt)
             self.assertEqual(ScanTask.FAILED, status[1])
-            mock_connect.assert_called_once_with()
+            mock_connect.assert_called_once_with(manager_interrupt)
 
     def test_prereq_failed(self):
         """Test the run method."""
@@ -318,9 +468,41 @@ class InspectTaskRunnerTest(TestCase):
     def test_run(self):
         """Test the run method."""
         with patch.object(InspectTaskRunner, "inspect") as mock_connect:
-            status = self.runner.run(Value("i", ScanJob.JOB_RUN))
+            manager_interrupt = Value("i", ScanJob.JOB_RUN)
+            status = self.runner.run(manager_interrupt)
             self.assertEqual(ScanTask.COMPLETED, status[1])
-            mock_connect.assert_called_once_with()
+            mock_connect.assert_called_once_with(manager_interrupt)
+
+    @override_settings(QPC_ENABLE_VCENTER_COMBINED_SCAN=True)
+    def test_run_combined_scan(self):
+        """Test the run method keeps the results recorded by the connect task."""
+        SystemConnectionResult.objects.create(
+            name="vm1",
+            status=SystemConnectionResult.SUCCESS,
+            source=self.scan_task.source,
+            task_connection_result=self.connect_scan_task.connection_result,
+        )
+        self.runner.save_vms_facts([{"vm.name": "vm1"}])
+        with patch.object(InspectTaskRunner, "inspect") as mock_inspect:
+            status = self.runner.run(Value("i", ScanJob.JOB_RUN))
+        self.assertEqual(ScanTask.COMPLETED, status[1])
+        mock_inspect.assert_not_called()
+        self.assertEqual(self.scan_task.inspection_result.systems.count(), 1)
+
+    @override_settings(QPC_ENABLE_VCENTER_COMBINED_SCAN=True)
+    def test_run_combined_scan_without_results(self):
+        """Test the run method inspects when the connect task recorded nothing."""
+        SystemConnectionResult.objects.create(
+            name="vm1",
+            status=SystemConnectionResult.SUCCESS,
+            source=self.scan_task.source,
+            task_connection_result=self.connect_scan_task.connection_result,
+        )
+        manager_interrupt = Value("i", ScanJob.JOB_RUN)
+        with patch.object(InspectTaskRunner, "inspect") as mock_inspect:
+            status = self.runner.run(manager_interrupt)
+        self.assertEqual(ScanTask.COMPLETED, status[1])
+        mock_inspect.assert_called_once_with(manager_interrupt)
 
     def test_cancel(self):
         """Test the cancel method."""
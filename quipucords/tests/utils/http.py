@@ -1,5 +1,6 @@
 """Http utils for quipucords testing."""
 
+import json
 from functools import cached_property
 
 import requests
@@ -29,3 +30,10 @@ class QPCAuth(requests.auth.AuthBase):
         )
         assert auth_response.ok, auth_response.text
         return auth_response.json()["token"]
+
+
+def response_json(response):
+    """Return the JSON content of a Django test client response, streamed or not."""
+    if response.streaming:
+        return json.loads(b"".join(response.streaming_content))
+    return response.json()
@@ -0,0 +1,114 @@
+"""Compare ways of retrieving OpenShift workload facts on a synthetic cluster."""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+from kubernetes.dynamic.resource import ResourceField
+
+
+def fake_pods(pod_count, namespace_count, replicas):
+    """Generate pods like the ones returned by the ocp/k8s api."""
+    rng = random.Random(0)
+    images = [f"registry.example.com/team-{i}/image-{i}:1.{i % 7}" for i in range(500)]
+    sidecars = [f"registry.example.com/mesh/proxy:2.{i}" for i in range(3)]
+    for pod_index in range(pod_count):
+        app_index = pod_index // replicas
+        namespace = f"namespace-{app_index % namespace_count}"
+        app = f"app-{app_index}"
+        yield ResourceField(
+            {
+                "metadata": ResourceField(
+                    {
+                        "name": f"{app}-{pod_index % replicas}",
+                        "namespace": namespace,
+                        "labels": ResourceField(
+                            {"app": app, "tier": rng.choice(["web", "db", "worker"])}
+                        ),
+                    }
+                ),
+                "spec": ResourceField(
+                    {
+                        "containers": [
+                            {"image": rng.choice(images)},
+                            {"image": rng.choice(sidecars)},
+                        ],
+                        "initContainers": [{"image": rng.choice(images)}],
+                    }
+                ),
+            }
+        )
+
+
+def benchmark(pod_count, namespace_count, replicas):
+    """Retrieve, serialize and load the workloads fact both ways."""
+    sys.path.insert(0, str(Path(__file__).parent.parent / "quipucords"))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "quipucords.settings")
+    import django  # pylint: disable=import-outside-toplevel
+
+    django.setup()
+    # pylint: disable=import-outside-toplevel
+    from api.inspectresult.model import RawFactEncoder
+    from scanner.openshift.api import OpenShiftApi
+    from scanner.openshift.entities import OCPPod, OCPWorkload, load_entity
+
+    def retrieve_workload_list(pods):
+        """Build OCPWorkloads from OCPPod entities, like before the compact columns."""
+        app_names = set()
+        workload_list = []
+        for pod in map(OCPPod.from_api_object, pods):
+            pod_id = (pod.namespace, pod.app_name)
+            if pod_id in app_names:
+                continue
+            app_names.add(pod_id)
+            data = pod.dict()
+            data["name"] = pod.app_name
+            workload_list.append(OCPWorkload(**data))
+        return workload_list
+
+    def retrieve_compact_workloads(pods):
+        client = OpenShiftApi.__new__(OpenShiftApi)
+        client._paginate = lambda *args, **kwargs: pods
+        return client.retrieve_workloads()
+
+    pods = list(fake_pods(pod_count, namespace_count, replicas))
+    for strategy, retrieve, load in [
+        (
+            "pod entities",
+            retrieve_workload_list,
+            lambda value: list(map(load_entity, value)),
+        ),
+        (
+            "compact columns",
+            lambda pods: retrieve_compact_workloads(pods).workloads(),
+            lambda value: list(map(load_entity, value)),
+        ),
+    ]:
+        start = time.perf_counter()
+        workloads = retrieve(pods)
+        retrieved = time.perf_counter()
+        value = json.dumps(workloads, cls=RawFactEncoder)
+        serialized = time.perf_counter()
+        load(json.loads(value))
+        loaded = time.perf_counter()
+        print(
+            f"{strategy}: {len(workloads)} workloads from {pod_count} pods,"
+            f" {len(value) / 2**20:.1f} MiB JSON,"
+            f" retrieve {retrieved - start:.2f}s,"
+            f" serialize {serialized - retrieved:.2f}s,"
+            f" load {loaded - serialized:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pods", type=int, default=100_000, help="Number of pods")
+    parser.add_argument(
+        "--namespaces", type=int, default=200, help="Number of namespaces"
+    )
+    parser.add_argument("--replicas", type=int, default=1, help="Pods per workload")
+    args = parser.parse_args()
+    benchmark(args.pods, args.namespaces, args.replicas)
@@ -0,0 +1,180 @@
+"""Mock Ansible Controller to benchmark paginated requests."""
+import argparse
+import itertools
+import json
+import os
+import socket
+import sys
+import time
+import tracemalloc
+from concurrent import futures
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Event, Thread
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_PAGE_SIZE = 200
+
+
+class MockControllerHandler(BaseHTTPRequestHandler):
+    """Answer Ansible Controller hosts requests with fake hosts."""
+
+    protocol_version = "HTTP/1.1"
+    host_count = 0
+    latency = 0.0
+
+    def setup(self):
+        """Disable Nagle's algorithm so keep-alive responses aren't delayed."""
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self):  # noqa: N802
+        """Handle GET requests."""
+        next(self.request_counter)
+        time.sleep(self.latency)
+        url = urlparse(self.path)
+        if url.path == "/api/v2/hosts/":
+            self.send_json(self.hosts_page(parse_qs(url.query)))
+        else:
+            self.send_json({"detail": "Not found."}, status=404)
+
+    def hosts_page(self, query):
+        """Return one page of hosts."""
+        page = int(query.get("page", ["1"])[0])
+        page_size = int(query.get("page_size", [DEFAULT_PAGE_SIZE])[0])
+        host_ids = range((page - 1) * page_size, min(page * page_size, self.host_count))
+        return {
+            "count": self.host_count,
+            "next": host_ids.stop < self.host_count or None,
+            "previous": None,
+            "results": [
+                {
+                    "id": host_id,
+                    "type": "host",
+                    "name": f"host-{host_id}.example.com",
+                    "created": "2023-01-01T00:00:00Z",
+                    "modified": "2023-01-01T00:00:00Z",
+                    "last_job": None,
+                }
+                for host_id in host_ids
+            ],
+        }
+
+    def send_json(self, data, status=200):
+        """Send data as a JSON response."""
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        """Don't log each request."""
+
+
+def start_server(host_count, latency, port=0):
+    """Start a mock Ansible Controller server in a background thread."""
+    handler = type(
+        "Handler",
+        (MockControllerHandler,),
+        {
+            "host_count": host_count,
+            "latency": latency,
+            "request_counter": itertools.count(),
+        },
+    )
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def benchmark(host_count, latency, max_concurrency, consumer_delay):
+    """Compare pagination strategies on a mock server."""
+    sys.path.insert(0, str(Path(__file__).parent.parent / "quipucords"))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "quipucords.settings")
+    import django  # pylint: disable=import-outside-toplevel
+
+    django.setup()
+    # pylint: disable=import-outside-toplevel
+    from scanner.ansible.api import AnsibleControllerApi
+
+    class SubmitAllControllerApi(AnsibleControllerApi):
+        """Request every page at once, like before the sliding window."""
+
+        def _get_pages_in_parallel(self, url, max_concurrency, page_kwargs, *args):
+            with futures.ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+                future_to_page = {
+                    executor.submit(self.get, url, **kwargs) for kwargs in page_kwargs
+                }
+                for future_page in futures.as_completed(future_to_page):
+                    yield from future_page.result().json()["results"]
+
+    server = start_server(host_count, latency)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    strategies = [
+        ("submit all pages", SubmitAllControllerApi, {}),
+        ("sliding window", AnsibleControllerApi, {}),
+        ("sliding window, ordered", AnsibleControllerApi, {"ordered": True}),
+    ]
+    for strategy, client_class, kwargs in strategies:
+        client = client_class(base_url=base_url)
+        tracemalloc.start()
+        start = time.perf_counter()
+        count = 0
+        for _ in client.get_paginated_results(
+            "/api/v2/hosts/",
+            max_concurrency=max_concurrency,
+            params={"page_size": DEFAULT_PAGE_SIZE},
+            **kwargs,
+        ):
+            count += 1
+            if consumer_delay:
+                time.sleep(consumer_delay)
+        elapsed = time.perf_counter() - start
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert count == host_count, f"{strategy} got {count} hosts"
+        report(strategy, server, host_count, elapsed, peak_memory)
+    server.shutdown()
+
+
+def report(strategy, server, host_count, elapsed, peak_memory):
+    """Print the throughput, peak memory and request count of one strategy."""
+    request_count = next(server.RequestHandlerClass.request_counter)
+    server.RequestHandlerClass.request_counter = itertools.count()
+    print(f"{strategy}: {host_count} hosts in {elapsed:.1f}s,", end=" ")
+    print(f"{host_count / elapsed:.0f} hosts/s,", end=" ")
+    print(f"peak memory {peak_memory / 2**20:.0f} MiB, {request_count} requests")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "command", choices=["serve", "benchmark"], help="Command to execute"
+    )
+    parser.add_argument("--hosts", type=int, default=1_000_000, help="Number of hosts")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds to wait per request"
+    )
+    parser.add_argument("--port", type=int, default=8080, help="Port to serve on")
+    parser.add_argument(
+        "--max-concurrency", type=int, default=50, help="Concurrent requests"
+    )
+    parser.add_argument(
+        "--consumer-delay",
+        type=float,
+        default=0.0,
+        help="Seconds the consumer spends on each host",
+    )
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        mock_server = start_server(args.hosts, args.latency, args.port)
+        print(f"Serving {args.hosts} hosts on http://127.0.0.1:{args.port}")
+        try:
+            Event().wait()
+        except KeyboardInterrupt:
+            mock_server.shutdown()
+    elif args.command == "benchmark":
+        benchmark(args.hosts, args.latency, args.max_concurrency, args.consumer_delay)
@@ -0,0 +1,323 @@
+"""Mock Satellite 6 server to benchmark Satellite inspection strategies."""
+import argparse
+import datetime
+import itertools
+import json
+import os
+import re
+import socket
+import ssl
+import sys
+import tempfile
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import Pool
+from pathlib import Path
+from threading import Event, Thread
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+HOST_URL = re.compile(
+    r"^/api/v2/hosts/(?P<host_id>\d+)(?P<subscriptions>/subscriptions)?$"
+)
+DEFAULT_PER_PAGE = 100
+
+
+def host_fields(host_id):
+    """Return the fields of a fake host like Satellite 6 would."""
+    return {
+        "id": host_id,
+        "name": f"host-{host_id}.example.com",
+        "uuid": f"00000000-0000-0000-0000-{host_id:012d}",
+        "operatingsystem_name": "RedHat 8.8",
+        "facts": {
+            "cpu::cpu(s)": 2,
+            "cpu::cpu_socket(s)": 1,
+            "net::interface::eth0::ipv4_address": "10.0.0.1",
+            "net::interface::eth0::mac_address": "00:00:00:00:00:01",
+        },
+        "subscription_facet_attributes": {"uuid": f"sub-{host_id}"},
+        "content_facet_attributes": {"errata_counts": {"total": 0}},
+    }
+
+
+class MockSatelliteHandler(BaseHTTPRequestHandler):
+    """Answer Satellite 6 API requests with fake hosts."""
+
+    protocol_version = "HTTP/1.1"
+    host_count = 0
+    latency = 0.0
+
+    def setup(self):
+        """Disable Nagle's algorithm so keep-alive responses aren't delayed."""
+        next(self.connection_counter)
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self):  # noqa: N802
+        """Handle GET requests."""
+        next(self.request_counter)
+        time.sleep(self.latency)
+        url = urlparse(self.path)
+        if url.path == "/api/status":
+            self.send_json({"api_version": 2})
+        elif url.path == "/api/v2/hosts":
+            self.send_json(self.hosts_page(parse_qs(url.query)))
+        elif (match := HOST_URL.match(url.path)) and int(
+            match.group("host_id")
+        ) < self.host_count:
+            if match.group("subscriptions"):
+                self.send_json({"results": []})
+            else:
+                self.send_json(host_fields(int(match.group("host_id"))))
+        else:
+            self.send_json({"error": "not found"}, status=404)
+
+    def hosts_page(self, query):
+        """Return one page of the hosts index."""
+        page = int(query.get("page", ["1"])[0])
+        per_page = int(query.get("per_page", [DEFAULT_PER_PAGE])[0])
+        host_ids = range((page - 1) * per_page, min(page * per_page, self.host_count))
+        return {
+            "total": self.host_count,
+            "subtotal": self.host_count,
+            "page": page,
+            "per_page": per_page,
+            "results": [
+                {"id": host_id, "name": f"host-{host_id}.example.com"}
+                if "thin" in query
+                else host_fields(host_id)
+                for host_id in host_ids
+            ],
+        }
+
+    def send_json(self, data, status=200):
+        """Send data as a JSON response."""
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        """Don't log each request."""
+
+
+def create_certificate(directory):
+    """Create a self-signed certificate for localhost in the given directory."""
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    cert_path = Path(directory) / "cert.pem"
+    key_path = Path(directory) / "key.pem"
+    cert_path.write_bytes(certificate.public_bytes(serialization.Encoding.PEM))
+    key_path.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    return cert_path, key_path
+
+
+def start_server(host_count, latency, port=0):
+    """Start a mock Satellite server over HTTPS in a background thread."""
+    handler = type(
+        "Handler",
+        (MockSatelliteHandler,),
+        {
+            "host_count": host_count,
+            "latency": latency,
+            "request_counter": itertools.count(),
+            "connection_counter": itertools.count(),
+        },
+    )
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    with tempfile.TemporaryDirectory() as directory:
+        context.load_cert_chain(*create_certificate(directory))
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class FakeScanTask:
+    """Stand-in for the ScanTask passed to request_host_details."""
+
+    def log_message(self, *args, **kwargs):
+        """Don't log each host."""
+
+
+def benchmark(host_count, latency, max_concurrency):
+    """Compare the multiprocessing and threaded strategies on a mock server."""
+    sys.path.insert(0, str(Path(__file__).parent.parent / "quipucords"))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "quipucords.settings")
+    import django  # pylint: disable=import-outside-toplevel
+
+    django.setup()
+    # pylint: disable=import-outside-toplevel
+    from more_itertools import chunked
+
+    from scanner.satellite.api import request_hosts_details
+    from scanner.satellite.six import (
+        HOSTS_FIELDS_V2_URL,
+        HOSTS_SUBS_V2_URL,
+        HOSTS_V2_URL,
+        request_full_results,
+        request_host_details,
+    )
+
+    server = start_server(host_count, latency)
+    options = {
+        "host": "127.0.0.1",
+        "port": server.server_port,
+        "user": "admin",
+        "password": "secret",
+        "ssl_cert_verify": False,
+    }
+    host_params = [
+        (
+            FakeScanTask(),
+            {},
+            host_id,
+            f"host-{host_id}",
+            HOSTS_FIELDS_V2_URL,
+            HOSTS_SUBS_V2_URL,
+            options,
+        )
+        for host_id in range(host_count)
+    ]
+
+    start = time.perf_counter()
+    with Pool(processes=max_concurrency) as pool:
+        for chunk in chunked(host_params, max_concurrency):
+            pool.starmap(request_host_details, chunk)
+    report("multiprocessing", server, host_count, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in request_hosts_details(request_host_details, host_params, max_concurrency):
+        pass
+    report("threads", server, host_count, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    bulk_host_params = [
+        params + (host,)
+        for params, host in zip(
+            host_params,
+            request_full_results(
+                FakeScanTask(), HOSTS_V2_URL, max_concurrency, options=options
+            ),
+        )
+    ]
+    for _ in request_hosts_details(
+        request_host_details, bulk_host_params, max_concurrency
+    ):
+        pass
+    report(
+        "threads with bulk host fields", server, host_count, time.perf_counter() - start
+    )
+    server.shutdown()
+
+
+def benchmark_sessions(host_count, latency):
+    """Compare bare requests with the shared Satellite session, in one process."""
+    sys.path.insert(0, str(Path(__file__).parent.parent / "quipucords"))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "quipucords.settings")
+    import django  # pylint: disable=import-outside-toplevel
+
+    django.setup()
+    # pylint: disable=import-outside-toplevel
+    import requests
+
+    from scanner.satellite import utils
+    from scanner.satellite.six import (
+        HOSTS_FIELDS_V2_URL,
+        HOSTS_SUBS_V2_URL,
+        request_host_details,
+    )
+
+    server = start_server(host_count, latency)
+    options = {
+        "host": "127.0.0.1",
+        "port": server.server_port,
+        "user": "admin",
+        "password": "secret",
+        "ssl_cert_verify": False,
+    }
+    for strategy, get_session in [
+        ("bare requests", lambda: requests),
+        ("shared session", utils.get_session),
+    ]:
+        with patch.object(utils, "get_session", get_session):
+            start = time.perf_counter()
+            for host_id in range(host_count):
+                request_host_details(
+                    FakeScanTask(),
+                    {},
+                    host_id,
+                    f"host-{host_id}",
+                    HOSTS_FIELDS_V2_URL,
+                    HOSTS_SUBS_V2_URL,
+                    options,
+                )
+            report(strategy, server, host_count, time.perf_counter() - start)
+    server.shutdown()
+
+
+def report(strategy, server, host_count, elapsed):
+    """Print the throughput, request and connection counts of one strategy."""
+    handler = server.RequestHandlerClass
+    request_count = next(handler.request_counter)
+    connection_count = next(handler.connection_counter)
+    handler.request_counter = itertools.count()
+    handler.connection_counter = itertools.count()
+    print(f"{strategy}: {host_count} hosts in {elapsed:.1f}s,", end=" ")
+    print(f"{host_count / elapsed:.0f} hosts/s, {request_count} requests,", end=" ")
+    print(f"{connection_count} connections")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "command",
+        choices=["serve", "benchmark", "benchmark-sessions"],
+        help="Command to execute",
+    )
+    parser.add_argument("--hosts", type=int, default=1000, help="Number of hosts")
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="Seconds to wait per request"
+    )
+    parser.add_argument("--port", type=int, default=8443, help="Port to serve on")
+    parser.add_argument(
+        "--max-concurrency", type=int, default=25, help="Concurrent requests"
+    )
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        mock_server = start_server(args.hosts, args.latency, args.port)
+        print(f"Serving {args.hosts} hosts on https://127.0.0.1:{args.port}")
+        try:
+            Event().wait()
+        except KeyboardInterrupt:
+            mock_server.shutdown()
+    elif args.command == "benchmark":
+        benchmark(args.hosts, args.latency, args.max_concurrency)
+    elif args.command == "benchmark-sessions":
+        benchmark_sessions(args.hosts, args.latency)